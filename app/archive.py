@@ -0,0 +1,134 @@
+# app/archive.py
+"""
+Calculation Archive Job
+
+Moves calculations older than ``CALCULATION_ARCHIVE_AFTER_DAYS`` from
+``calculations`` into the compressed ``calculations_archive`` table (see
+``app.models.calculation_archive``). Most requests read recent history, so
+keeping only that in the hot table keeps it and its indexes small enough to
+stay in memory. Reads fall back to the archive, so nothing disappears from
+the API.
+
+Each batch is archived in one transaction: the rows are inserted into the
+archive with one multi-row INSERT, their dependency edges are removed, and
+they are deleted from ``calculations``. The job can be stopped and
+restarted at any point. The report rollup is left alone, since it already
+counts the archived calculations.
+
+The DELETE leaves dead tuples behind for autovacuum. With month
+partitioning, schedule the job with an age just short of
+``CALCULATION_RETENTION_MONTHS``, so the months that ``app.partitions``
+later drops are already empty.
+
+Usage:
+    python -m app.archive --older-than-days 90 --batch-size 5000
+    python -m app.archive --dry-run
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, or_, select
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.calculation import Calculation
+from app.models.calculation_archive import ArchivedCalculation
+from app.models.calculation_dependency import CalculationDependency
+from app.models.user import User  # noqa: F401 - configures the Calculation.user relationship
+
+
+def archive_calculations(
+    older_than_days: Optional[int] = None,
+    batch_size: int = 5000,
+    dry_run: bool = False,
+    session_factory: Callable = SessionLocal,
+    report: Callable[[str], None] = print,
+    now: Optional[datetime] = None,
+) -> Dict[str, float]:
+    """
+    Move old calculations into the archive.
+
+    Args:
+        older_than_days: Minimum age in days; defaults to ``CALCULATION_ARCHIVE_AFTER_DAYS``
+        batch_size: Calculations moved per transaction
+        dry_run: Count the calculations that would move without moving them
+        session_factory: Creates the database session
+        report: Receives a progress line after every batch
+        now: Current time used for the cutoff (defaults to utcnow)
+
+    Returns:
+        dict: Totals for ``archived`` and ``seconds``
+
+    Raises:
+        ValueError: If the age is not at least one day
+    """
+    older_than_days = settings.CALCULATION_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    if older_than_days < 1:
+        raise ValueError("Calculations must be at least one day old to be archived.")
+    cutoff = (now or datetime.utcnow()) - timedelta(days=older_than_days)
+
+    totals = {"archived": 0, "seconds": 0.0}
+    started = time.monotonic()
+    with session_factory() as db:
+        if dry_run:
+            totals["archived"] = db.scalar(
+                select(func.count(Calculation.id)).where(Calculation.created_at < cutoff)
+            )
+            report(f"would archive {totals['archived']} calculations created before {cutoff.isoformat()}")
+        while not dry_run:
+            batch = db.scalars(
+                select(Calculation)
+                .options(*Calculation.payload_loading())
+                .where(Calculation.created_at < cutoff)
+                .order_by(Calculation.created_at, Calculation.id)
+                .limit(batch_size)
+            ).all()
+            if not batch:
+                break
+            ids = [calculation.id for calculation in batch]
+            db.execute(insert(ArchivedCalculation), [ArchivedCalculation.from_calculation(c) for c in batch])
+            db.execute(delete(CalculationDependency).where(
+                or_(CalculationDependency.calculation_id.in_(ids), CalculationDependency.source_id.in_(ids))
+            ))
+            db.execute(
+                delete(Calculation).where(Calculation.id.in_(ids)),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+            db.expunge_all()
+
+            totals["archived"] += len(batch)
+            elapsed = time.monotonic() - started
+            report(f"archived={totals['archived']} rate={totals['archived'] / max(elapsed, 1e-9):.0f} rows/s")
+
+    totals["seconds"] = time.monotonic() - started
+    return totals
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Move old calculations into the compressed archive.")
+    parser.add_argument("--older-than-days", type=int, default=settings.CALCULATION_ARCHIVE_AFTER_DAYS,
+                        help="Minimum age in days (default: CALCULATION_ARCHIVE_AFTER_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Calculations per transaction (default: 5000)")
+    parser.add_argument("--dry-run", action="store_true", help="Count calculations without moving them")
+    args = parser.parse_args(argv)
+
+    try:
+        totals = archive_calculations(
+            older_than_days=args.older_than_days, batch_size=args.batch_size, dry_run=args.dry_run
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    print(
+        f"Done: {totals['archived']} calculations "
+        f"{'to archive (dry run)' if args.dry_run else 'archived'} in {totals['seconds']:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())  # pragma: no cover
@@ -0,0 +1,150 @@
+# app/core/cache.py
+"""
+Calculation result memoization.
+
+Many users submit the same ``(type, inputs)`` pairs over and over. This
+module provides a small, bounded LRU cache with a time-to-live that sits in
+front of ``Calculation.get_result``. It is shared by all FastAPI threadpool
+workers, so every operation takes a lock.
+"""
+
+import hashlib
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+# Inputs longer than this are keyed by a digest instead of their packed bytes,
+# so a cached statistic over a million readings does not pin 8 MB of key
+INLINE_KEY_OPERANDS = 64
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and hit/miss counters.
+
+    Args:
+        max_entries: Maximum number of cached results; 0 disables the cache
+        ttl_seconds: How long an entry stays valid after it was stored
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything; callers skip lookups when it does not."""
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(calculation_type: str, inputs, *extra: Hashable) -> Optional[Hashable]:
+        """
+        Build a cache key from a calculation type and its inputs.
+
+        Inputs are packed as float64 bytes, which is compact and keeps -0.0
+        and 0.0 distinct; long inputs are reduced to a 128-bit BLAKE2b digest
+        of those bytes. ``extra`` holds any other values the result depends
+        on, such as an expression's text. Returns None for inputs that cannot
+        be packed, in which case the caller should bypass the cache.
+        """
+        if not isinstance(calculation_type, str):
+            return None
+        if isinstance(inputs, np.ndarray) and inputs.ndim == 1 and inputs.dtype.kind == "f":
+            # e.g. the view of stored packed inputs: same bytes, no conversion
+            packed = inputs.astype(np.float64, copy=False).tobytes()
+        elif not isinstance(inputs, list):
+            return None
+        else:
+            try:
+                packed = array('d', inputs).tobytes()
+            except (TypeError, OverflowError):
+                return None
+        if len(inputs) > INLINE_KEY_OPERANDS:
+            packed = hashlib.blake2b(packed, digest_size=16).digest()
+        return (calculation_type.lower(), packed) + extra
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+
+        A disabled cache answers every lookup with a miss without counting it.
+
+        Returns:
+            tuple: ``(True, value)`` on a hit, ``(False, None)`` on a miss
+        """
+        if not self.enabled:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the current hit/miss counters and size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+# Shared cache for calculation results
+result_cache = ResultCache(
+    max_entries=settings.CALCULATION_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CALCULATION_CACHE_TTL_SECONDS,
+)
+
+
+def memoize_result(get_result: Callable) -> Callable:
+    """
+    Decorator for ``get_result`` methods that consults ``result_cache`` first.
+
+    Only successful results are cached; validation errors are raised again
+    on every call. The calculation's guards (``check()``) run before the
+    lookup, so limits changed at runtime apply to cached results too.
+    """
+    @wraps(get_result)
+    def wrapper(self):
+        self.check()
+        key = self.cache_key() if result_cache.enabled else None
+        if key is None:
+            return get_result(self)
+        hit, value = result_cache.get(key)
+        if hit:
+            return value
+        value = get_result(self)
+        result_cache.put(key, value)
+        return value
+    return wrapper
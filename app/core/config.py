@@ -18,6 +18,33 @@ class Settings(BaseSettings):
     BCRYPT_ROUNDS: int = 12
     CORS_ORIGINS: List[str] = ["*"]
     
+    # Calculations
+    CALCULATION_BATCH_MAX_ITEMS: int = 5000
+    CALCULATION_INGEST_CHUNK_SIZE: int = 5000        # Rows per commit for NDJSON uploads
+    CALCULATION_INGEST_MAX_LINE_BYTES: int = 1048576  # Longer NDJSON lines are rejected
+    CALCULATION_INGEST_MAX_ERRORS: int = 100          # Errors echoed back in the summary
+    CALCULATION_CACHE_MAX_ENTRIES: int = 10000        # Memoized results; 0 disables the cache
+    CALCULATION_CACHE_TTL_SECONDS: float = 3600.0
+    CALCULATION_EXECUTOR: str = "inline"              # "inline" or "process"
+    CALCULATION_PROCESS_WORKERS: int = 2
+    CALCULATION_PROCESS_MIN_COST: int = 10000         # Estimated cost that triggers offloading
+    CALCULATION_PROCESS_TIMEOUT_SECONDS: float = 5.0
+    CALCULATION_MAX_OPERANDS: int = 100000            # Longer operand chains are rejected
+    CALCULATION_STATISTICS_MAX_OPERANDS: int = 1000000  # Cap for mean, median, percentile, ...
+    CALCULATION_ARRAY_MAX_ELEMENTS: int = 1000000     # Numbers across vector/matrix operands
+    CALCULATION_EXPRESSION_MAX_LENGTH: int = 1000     # Characters in an expression calculation
+    CALCULATION_EXPRESSION_PLAN_CACHE_SIZE: int = 1024  # Compiled expressions kept in memory
+    CALCULATION_SWEEP_MAX_POINTS: int = 100000        # Values of the varying operand in a sweep
+    CALCULATION_SCAN_CHUNK_SIZE: int = 10000          # Running values per streamed chunk
+    CALCULATION_GRAPH_MAX_NODES: int = 1000           # Calculations per POST /calculations/graph
+    CALCULATION_INPUTS_STORAGE: str = "json"          # "json", "array" (float8[]) or "packed" (bytea)
+    CALCULATION_PARTITIONING: str = "none"            # "none", "month" (range on created_at) or "hash" (user_id)
+    CALCULATION_HASH_PARTITIONS: int = 16             # Partitions created in "hash" mode
+    CALCULATION_PARTITION_MONTHS_AHEAD: int = 3       # Future monthly partitions kept ready
+    CALCULATION_RETENTION_MONTHS: int = 0             # Whole months kept before the current one; 0 keeps all
+    CALCULATION_ARCHIVE_AFTER_DAYS: int = 90          # Age at which python -m app.archive moves calculations
+    CALCULATION_CONTENT_ADDRESSED: bool = False       # Store inputs and results once per distinct content
+
     # Redis (optional, for token blacklisting)
     REDIS_URL: Optional[str] = "redis://localhost:6379/0"
     
@@ -0,0 +1,129 @@
+# app/core/evaluation.py
+"""
+Calculation evaluation dispatch.
+
+Request handlers call ``evaluate()`` instead of ``get_result()`` directly.
+Cheap calculations are evaluated inline on the request thread. When
+``CALCULATION_EXECUTOR`` is ``"process"``, calculations whose estimated cost
+reaches ``CALCULATION_PROCESS_MIN_COST`` are sent to a shared
+``ProcessPoolExecutor`` instead, so long operand chains do not hold the GIL
+and stall other requests in the same worker.
+
+A running job cannot be cancelled, so when one times out the whole pool is
+recycled: its worker processes are terminated and the next offload starts
+a fresh pool. Jobs of other requests that were killed with it are retried
+once on the new pool.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import result_cache
+from app.core.config import settings
+from app.models.calculation import Calculation
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class EvaluationTimeoutError(Exception):
+    """Raised when an offloaded evaluation does not finish within its timeout."""
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the web server process is multi-threaded
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.CALCULATION_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _recycle_pool(pool: ProcessPoolExecutor) -> None:
+    """Terminate the workers of a pool, unless it was already replaced."""
+    global _pool
+    with _pool_lock:
+        if _pool is not pool:
+            return
+        _pool = None
+    # Workers busy with a runaway job never pick up a shutdown request
+    if hasattr(pool, "terminate_workers"):  # Python 3.14+
+        pool.terminate_workers()
+        return
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def shutdown_executor() -> None:
+    """Stop the worker processes, if any were started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _evaluate_in_worker(calculation_type: str, inputs: List[float], attributes: Dict[str, Any]) -> float:
+    """Runs in a worker process: rebuild the calculation and evaluate it."""
+    from app.models.user import User  # noqa: F401 - configures the Calculation mappers
+    return Calculation.create(calculation_type, None, inputs, **attributes).get_result()
+
+
+def should_offload(calculation: Calculation) -> bool:
+    """Whether a calculation is expensive enough to leave the request thread."""
+    return (
+        settings.CALCULATION_EXECUTOR == "process"
+        and calculation.estimated_cost() >= settings.CALCULATION_PROCESS_MIN_COST
+    )
+
+
+def evaluate(calculation: Calculation) -> float:
+    """
+    Compute a calculation's result inline or in the process pool.
+
+    Raises:
+        ValueError: If the calculation fails business validation
+        EvaluationTimeoutError: If an offloaded evaluation takes longer than
+            ``CALCULATION_PROCESS_TIMEOUT_SECONDS``
+    """
+    if not should_offload(calculation):
+        return calculation.get_result()
+    # Reject invalid, oversized or overflowing calculations before the cache
+    # lookup and before paying for a round trip
+    calculation.check()
+
+    key = calculation.cache_key() if result_cache.enabled else None
+    if key is not None:
+        hit, value = result_cache.get(key)
+        if hit:
+            return value
+
+    attributes = {name: getattr(calculation, name) for name in calculation.result_attributes}
+    deadline = time.monotonic() + settings.CALCULATION_PROCESS_TIMEOUT_SECONDS
+    for attempt in range(2):
+        pool = _get_pool()
+        future = pool.submit(_evaluate_in_worker, calculation.type, list(calculation.inputs), attributes)
+        try:
+            value = future.result(timeout=max(deadline - time.monotonic(), 0))
+            break
+        except FutureTimeoutError:
+            _recycle_pool(pool)
+            raise EvaluationTimeoutError("Calculation took too long to evaluate.")
+        except BrokenProcessPool:
+            # Killed along with another request's runaway job
+            _recycle_pool(pool)
+            if attempt:
+                raise EvaluationTimeoutError("Calculation took too long to evaluate.")
+
+    if key is not None:
+        result_cache.put(key, value)
+    return value
@@ -0,0 +1,77 @@
+# app/core/packed.py
+"""
+Packed operand encoding.
+
+Long operand lists can be sent as little-endian float64 values instead of a
+JSON array: base64-encoded in the ``inputs`` field of a JSON body, or as the
+raw bytes of an ``application/octet-stream`` body. Decoding views the bytes
+as a NumPy array without copying or parsing each number. The view can be
+evaluated as is by the functions and batch kernels of
+``app.operations.catalog``; ``unpack_floats`` converts it in one C-level
+pass into the list of floats that request schemas and JSON responses carry.
+"""
+
+import base64
+import binascii
+from typing import List, Sequence
+
+import numpy as np
+
+# Wire format of packed operands
+PACKED_DTYPE = np.dtype("<f8")
+
+
+def unpack_array(data: bytes) -> np.ndarray:
+    """
+    View packed little-endian float64 bytes as an array, without copying.
+
+    Args:
+        data: The packed bytes (bytes, bytearray or memoryview)
+
+    Returns:
+        np.ndarray: A float64 view of ``data``, read-only for ``bytes``
+
+    Raises:
+        ValueError: If the length is not a multiple of 8 bytes or a value
+            is NaN or infinite
+    """
+    if len(data) % PACKED_DTYPE.itemsize:
+        raise ValueError("Packed inputs must be a whole number of 8-byte float64 values")
+    values = np.frombuffer(data, dtype=PACKED_DTYPE)
+    if not np.isfinite(values).all():
+        raise ValueError("Packed inputs must be finite numbers")
+    return values
+
+
+def unpack_floats(data: bytes) -> List[float]:
+    """
+    Decode packed little-endian float64 bytes into a list.
+
+    Raises:
+        ValueError: As ``unpack_array``
+    """
+    return unpack_array(data).tolist()
+
+
+def decode_base64_floats(text: str) -> List[float]:
+    """
+    Decode base64-encoded packed float64 values.
+
+    Raises:
+        ValueError: If the text is not valid base64 or not valid packed values
+    """
+    try:
+        data = base64.b64decode(text, validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError("Input should be a valid list or a base64 string of packed float64 values")
+    return unpack_floats(data)
+
+
+def pack_floats(values: Sequence[float]) -> bytes:
+    """Encode numbers as packed little-endian float64 bytes."""
+    return np.asarray(values, dtype=PACKED_DTYPE).tobytes()
+
+
+def encode_base64_floats(values: Sequence[float]) -> str:
+    """Encode numbers as base64 packed float64, the form accepted in JSON ``inputs``."""
+    return base64.b64encode(pack_floats(values)).decode("ascii")
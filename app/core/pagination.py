@@ -0,0 +1,51 @@
+# app/core/pagination.py
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe tokens that encode the sort key of the last row
+on a page: ``(created_at, id)``. The next page is fetched by seeking past that
+key instead of using OFFSET, so page latency does not grow with history size.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """
+    Encode a ``(created_at, id)`` sort key into an opaque cursor string.
+
+    Args:
+        created_at: Creation timestamp of the last row on the page
+        row_id: UUID of the last row on the page
+
+    Returns:
+        str: URL-safe base64 cursor
+    """
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: The opaque cursor string sent by the client
+
+    Returns:
+        tuple: ``(created_at, id)`` of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor.")
@@ -1,11 +1,45 @@
+from typing import List
+
+from sqlalchemy import Table, inspect, text
+
+from app.core.config import settings
 from app.database import engine
 from app.models.user import Base
+from app.models.calculation_stats import UserCalculationStats  # noqa: F401 - register the table
+from app.models.calculation_dependency import CalculationDependency  # noqa: F401 - register the table
+from app.models.calculation_archive import ArchivedCalculation  # noqa: F401 - register the table
+from app.models.calculation_payload import CalculationPayload  # noqa: F401 - register the table
+from app.partitions import create_partitioned_table
 
 def init_db():
+    if settings.CALCULATION_PARTITIONING != "none":
+        create_partitioned_table(engine)
     Base.metadata.create_all(bind=engine)
 
 def drop_db():
     Base.metadata.drop_all(bind=engine)
 
+def add_missing_columns(table: Table, bind=engine) -> List[str]:
+    """
+    Add nullable columns that are defined on a model but missing from its
+    existing table, and drop NOT NULL from columns the model now declares
+    nullable. ``create_all`` only creates missing tables, so this keeps
+    databases created by older versions of the app usable.
+
+    Returns:
+        list: Names of the columns that were added
+    """
+    existing = {column["name"]: column for column in inspect(bind).get_columns(table.name)}
+    added = []
+    with bind.begin() as conn:
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+                added.append(column.name)
+            elif column.name in existing and column.nullable and not existing[column.name]["nullable"]:
+                conn.execute(text(f'ALTER TABLE {table.name} ALTER COLUMN "{column.name}" DROP NOT NULL'))
+    return added
+
 if __name__ == "__main__":
-    init_db() # pragma: no cover
\ No newline at end of file
+    init_db() # pragma: no cover
@@ -0,0 +1,347 @@
+# app/index_audit.py
+"""
+Index Audit
+
+Compares the indexes that exist in the database with the queries the app
+actually runs, and reports the ones that only cost insert time:
+
+- duplicate: another index on the same table starts with the same key
+  columns, so it can serve every lookup this one can. Unique indexes are
+  only duplicates of an index with exactly the same columns that also
+  enforces uniqueness.
+- unused: no query in ``query_set()`` is planned with it. Primary keys and
+  unique indexes are never reported as unused, since they enforce
+  constraints.
+- missing: declared on a model but absent from the database, which happens
+  when a model gains an index after its table was created.
+
+``query_set()`` mirrors the lookups of the request handlers, the report
+rollup and the dependency graph. Each one is planned with ``EXPLAIN`` and
+sequential scans disabled, so the planner reports the index it would use on
+a large table even when the audited tables are small. On empty tables two
+indexes that serve a lookup equally well cost the same, and PostgreSQL
+picks the one created last; audit a populated database to rule that out. On a partitioned
+table the plans name the indexes of the partitions; each is credited to the
+parent index it was created from. The cumulative scan
+counts from ``pg_stat_user_indexes`` are shown alongside as a check against
+the live workload.
+
+The ``--sql`` statements build and drop indexes CONCURRENTLY, except on a
+partitioned table, where PostgreSQL does not allow it: there they are plain
+DROP INDEX and CREATE INDEX statements, which lock the table until they
+finish and are best run in a quiet period.
+
+Usage:
+    python -m app.index_audit
+    python -m app.index_audit --sql    # print DROP/CREATE statements for the findings
+
+The exit status is 1 when there are findings.
+"""
+
+import argparse
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Index, and_, func, literal_column, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+
+from app.database import Base, engine as default_engine
+from app.models.calculation import Calculation
+from app.models.calculation_archive import ArchivedCalculation
+from app.models.calculation_dependency import CalculationDependency
+from app.models.calculation_stats import UserCalculationStats
+from app.models.user import User
+
+
+def query_set() -> Dict[str, object]:
+    """Representative statements for every indexed lookup the app makes."""
+    user_id, calc_id = uuid.uuid4(), uuid.uuid4()
+    return {
+        "login / register: user by username or email": select(User).where(
+            or_(User.username == "name", User.email == "name@example.com")
+        ),
+        "authentication: user by id": select(User).where(User.id == user_id),
+        "get/update/delete calculation: by id and owner": select(Calculation).where(
+            Calculation.id == calc_id, Calculation.user_id == user_id
+        ),
+        "calculation references: ids of one owner": select(Calculation).where(
+            Calculation.id.in_([calc_id, uuid.uuid4()]), Calculation.user_id == user_id
+        ),
+        "list calculations: first page": select(Calculation)
+        .where(Calculation.user_id == user_id)
+        .order_by(Calculation.created_at.desc(), Calculation.id.asc())
+        .limit(51),
+        "list calculations: next page": select(Calculation)
+        .where(
+            Calculation.user_id == user_id,
+            or_(
+                Calculation.created_at < datetime(2024, 1, 1),
+                and_(Calculation.created_at == datetime(2024, 1, 1), Calculation.id > calc_id),
+            ),
+        )
+        .order_by(Calculation.created_at.desc(), Calculation.id.asc())
+        .limit(51),
+        "archive: by id and owner": select(ArchivedCalculation).where(
+            ArchivedCalculation.id == calc_id, ArchivedCalculation.user_id == user_id
+        ),
+        "archive: list calculations": select(ArchivedCalculation)
+        .where(ArchivedCalculation.user_id == user_id)
+        .order_by(ArchivedCalculation.created_at.desc(), ArchivedCalculation.id.asc())
+        .limit(51),
+        "payloads: references of one payload": select(Calculation.id)
+        .where(Calculation.payload_hash == func.sha256(literal_column("''::bytea")))
+        .limit(1),
+        "report: last calculation time": select(func.max(Calculation.created_at)).where(
+            Calculation.user_id == user_id
+        ),
+        "report: stats row": select(UserCalculationStats).where(UserCalculationStats.user_id == user_id),
+        "user delete cascade: calculations of a user": select(Calculation.id).where(
+            Calculation.user_id == user_id
+        ),
+        "dependency graph: downstream calculations": select(Calculation).where(
+            Calculation.id.in_([calc_id, uuid.uuid4()])
+        ),
+        "dependency graph: edges of a calculation": select(CalculationDependency).where(
+            CalculationDependency.calculation_id == calc_id
+        ),
+        "dependency graph: downstream edges": select(CalculationDependency).where(
+            CalculationDependency.source_id == calc_id
+        ),
+    }
+
+_INDEXES_SQL = text("""
+    SELECT c.relname AS table_name,
+           i.relname AS index_name,
+           x.indisprimary AS is_primary,
+           x.indisunique AS is_unique,
+           ARRAY(
+               SELECT pg_get_indexdef(x.indexrelid, k, true)
+                      || CASE WHEN x.indoption[k - 1] & 1 = 1 THEN ' DESC' ELSE '' END
+               FROM generate_series(1, x.indnkeyatts) AS k
+               ORDER BY k
+           ) AS columns,
+           pg_get_expr(x.indpred, x.indrelid) AS predicate,
+           pg_relation_size(x.indexrelid) AS size_bytes,
+           COALESCE(s.idx_scan, 0) AS scans
+    FROM pg_index x
+    JOIN pg_class c ON c.oid = x.indrelid
+    JOIN pg_class i ON i.oid = x.indexrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = x.indexrelid
+    WHERE n.nspname = current_schema() AND c.relname = ANY(:tables)
+    ORDER BY c.relname, i.relname
+""")
+
+_PARTITIONED_TABLES_SQL = text("""
+    SELECT c.relname
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema() AND c.relkind = 'p' AND c.relname = ANY(:tables)
+""")
+
+# Partition index -> the partitioned table's index it belongs to
+_PARTITION_INDEXES_SQL = text("""
+    SELECT child.relname AS child, parent.relname AS parent
+    FROM pg_inherits h
+    JOIN pg_class child ON child.oid = h.inhrelid
+    JOIN pg_class parent ON parent.oid = h.inhparent
+    WHERE parent.relkind = 'I'
+""")
+
+
+@dataclass
+class IndexInfo:
+    """One index as it exists in the database, plus what the audit found."""
+    table: str
+    name: str
+    columns: Tuple[str, ...]
+    is_primary: bool = False
+    is_unique: bool = False
+    predicate: Optional[str] = None
+    size_bytes: int = 0
+    scans: int = 0
+    used_by: List[str] = field(default_factory=list)
+    duplicate_of: Optional[str] = None
+
+    @property
+    def enforces_constraint(self) -> bool:
+        return self.is_primary or self.is_unique
+
+    @property
+    def unused(self) -> bool:
+        return not self.enforces_constraint and not self.used_by
+
+
+def _covers(other: IndexInfo, index: IndexInfo) -> bool:
+    """Whether ``other`` serves every lookup, and enforces every constraint, of ``index``."""
+    if other.table != index.table or other.predicate != index.predicate:
+        return False
+    if other.columns[:len(index.columns)] != index.columns:
+        return False
+    if index.enforces_constraint:
+        return other.enforces_constraint and other.columns == index.columns
+    return True
+
+
+def _keep_first(index: IndexInfo) -> tuple:
+    # Of two identical indexes, keep the primary key, then a constraint, then the first name
+    return (not index.is_primary, not index.enforces_constraint, index.name)
+
+
+def find_duplicates(indexes: Sequence[IndexInfo]) -> Dict[str, str]:
+    """
+    Map each redundant index to an index that covers it.
+
+    An index is covered by another on the same table with the same predicate
+    whose key columns start with all of its own. A unique index is only
+    covered by a unique index with exactly the same columns. Primary keys
+    are never redundant.
+    """
+    duplicates = {}
+    for index in indexes:
+        if index.is_primary:
+            continue
+        for other in indexes:
+            if other is index or other.name in duplicates or not _covers(other, index):
+                continue
+            if _covers(index, other) and _keep_first(index) < _keep_first(other):
+                continue
+            duplicates[index.name] = other.name
+            break
+    return duplicates
+
+
+def plan_index_names(plan) -> Set[str]:
+    """Names of all indexes referenced anywhere in an ``EXPLAIN (FORMAT JSON)`` plan."""
+    names = set()
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if "Index Name" in node:
+                names.add(node["Index Name"])
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return names
+
+
+def _model_indexes(tables: Sequence[str]) -> Iterator[Tuple[str, Index]]:
+    for table in Base.metadata.sorted_tables:
+        if table.name in tables:
+            for index in table.indexes:
+                yield table.name, index
+
+
+def audit_indexes(bind: Engine = default_engine, tables: Optional[Sequence[str]] = None) -> dict:
+    """
+    Audit the indexes of the app's tables.
+
+    Args:
+        bind: Engine of the database to inspect
+        tables: Tables to audit; defaults to every table of the models
+
+    Returns:
+        dict: ``indexes`` (every IndexInfo, with ``used_by`` and
+        ``duplicate_of`` filled in), ``missing`` (model indexes absent from
+        the database), ``queries`` (query name -> indexes its plan uses) and
+        ``partitioned_tables`` (the audited tables that are partitioned)
+    """
+    tables = list(tables or Base.metadata.tables)
+    with bind.connect() as conn, conn.begin():
+        indexes = [
+            IndexInfo(
+                table=row.table_name, name=row.index_name, columns=tuple(row.columns),
+                is_primary=row.is_primary, is_unique=row.is_unique, predicate=row.predicate,
+                size_bytes=row.size_bytes, scans=row.scans,
+            )
+            for row in conn.execute(_INDEXES_SQL, {"tables": tables})
+        ]
+        parents = dict(conn.execute(_PARTITION_INDEXES_SQL).all())
+        partitioned_tables = set(conn.scalars(_PARTITIONED_TABLES_SQL, {"tables": tables}))
+
+        # Plan as if the tables were large; SET LOCAL ends with the transaction
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        queries = {}
+        for name, statement in query_set().items():
+            compiled = statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+            queries[name] = {parents.get(index, index) for index in plan_index_names(plan)}
+
+    by_name = {index.name: index for index in indexes}
+    for query, names in queries.items():
+        for name in names:
+            if name in by_name:
+                by_name[name].used_by.append(query)
+    for name, covering in find_duplicates(indexes).items():
+        by_name[name].duplicate_of = covering
+
+    missing = [index for _, index in _model_indexes(tables) if index.name not in by_name]
+    return {"indexes": indexes, "missing": missing, "queries": queries, "partitioned_tables": partitioned_tables}
+
+
+def findings_sql(report: dict, bind: Engine = default_engine) -> List[str]:
+    """
+    Statements that bring the database to the audited minimal index set.
+
+    Indexes of partitioned tables are dropped and created without
+    CONCURRENTLY, which PostgreSQL rejects for them.
+    """
+    partitioned = report["partitioned_tables"]
+    statements = [
+        f"DROP INDEX {'' if index.table in partitioned else 'CONCURRENTLY '}IF EXISTS {index.name};"
+        for index in report["indexes"]
+        if (index.duplicate_of or index.unused) and not index.is_primary
+    ]
+    for index in report["missing"]:
+        ddl = str(CreateIndex(index).compile(dialect=bind.dialect)).strip()
+        if index.table.name not in partitioned:
+            ddl = ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+        statements.append(ddl + ";")
+    return statements
+
+
+def format_report(report: dict) -> List[str]:
+    """Human-readable lines: one per index, then the missing ones."""
+    lines = []
+    for index in report["indexes"]:
+        if index.duplicate_of:
+            verdict = f"DUPLICATE of {index.duplicate_of}"
+        elif index.unused:
+            verdict = "UNUSED by the query set"
+        elif index.used_by:
+            verdict = f"used by {len(index.used_by)} queries"
+        else:
+            verdict = "constraint"
+        lines.append(
+            f"{index.table}.{index.name} ({', '.join(index.columns)}) "
+            f"size={index.size_bytes} scans={index.scans}: {verdict}"
+        )
+    for index in report["missing"]:
+        lines.append(f"{index.table.name}.{index.name}: MISSING from the database")
+    return lines
+
+
+def has_findings(report: dict) -> bool:
+    return bool(report["missing"]) or any(index.duplicate_of or index.unused for index in report["indexes"])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report duplicate, unused and missing indexes.")
+    parser.add_argument("--sql", action="store_true", help="Also print statements that fix the findings")
+    args = parser.parse_args(argv)
+
+    report = audit_indexes()
+    for line in format_report(report):
+        print(line)
+    if args.sql:
+        for statement in findings_sql(report):
+            print(statement)
+    return 1 if has_findings(report) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())  # pragma: no cover
@@ -16,17 +16,22 @@ The application follows a RESTful API design with proper separation of concerns:
 """
 
 from contextlib import asynccontextmanager  # Used for startup/shutdown events
+import json
 from datetime import datetime, timezone, timedelta
 from uuid import UUID  # For type validation of UUIDs in path parameters
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 
 # FastAPI imports
-from fastapi import Body, FastAPI, Depends, HTTPException, status, Request, Form
+from fastapi import Body, FastAPI, Depends, HTTPException, status, Request, Response, Form, Query
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles  # For serving static files (CSS, JS)
 from fastapi.templating import Jinja2Templates  # For HTML templates
+from starlette.concurrency import run_in_threadpool  # Run blocking DB work off the event loop
+from pydantic import ValidationError
 
+from sqlalchemy import and_, insert, inspect, or_
 from sqlalchemy.orm import Session  # SQLAlchemy database session
 
 import uvicorn  # ASGI server for running FastAPI apps
@@ -34,11 +39,34 @@ import uvicorn  # ASGI server for running FastAPI apps
 # Application imports
 from app.auth.dependencies import get_current_active_user  # Authentication dependency
 from app.models.calculation import Calculation  # Database model for calculations
+from app.models.calculation_archive import ArchivedCalculation  # Compressed cold tier
+from app.models.calculation_dependency import CalculationDependency, topological_order  # Linked calculations
+from app.models.calculation_payload import CalculationPayload  # Content-addressed storage
+from app.models.calculation_stats import UserCalculationStats  # Per-user report rollup
 from app.models.user import User  # Database model for users
-from app.schemas.calculation import CalculationBase, CalculationResponse, CalculationUpdate  # API request/response schemas
+from app.operations.registry import operation_registry
+from app.schemas.calculation import (  # API request/response schemas
+    CalculationBase,
+    CalculationBatchItemResult,
+    CalculationBatchResponse,
+    CalculationGraphRequest,
+    CalculationGraphResponse,
+    CalculationIngestError,
+    CalculationIngestSummary,
+    CalculationReference,
+    CalculationResponse,
+    CalculationSweepRequest,
+    CalculationSweepResponse,
+    CalculationUpdate,
+)
 from app.schemas.token import TokenResponse  # API token schema
 from app.schemas.user import UserCreate, UserResponse, UserLogin  # User schemas
-from app.database import Base, get_db, engine  # Database connection
+from app.core.config import settings
+from app.core.evaluation import EvaluationTimeoutError, evaluate, shutdown_executor
+from app.core.pagination import decode_cursor, encode_cursor  # Keyset pagination cursors
+from app.database import Base, SessionLocal, get_db, engine  # Database connection
+from app.database_init import add_missing_columns
+from app.partitions import create_partitioned_table
 from app.routes.user import router as user_router
 
 
@@ -58,10 +86,25 @@ async def lifespan(app: FastAPI):
         app: FastAPI application instance
     """
     print("Creating tables...")
+    stats_table_existed = inspect(engine).has_table(UserCalculationStats.__tablename__)
+    calculations_table_existed = inspect(engine).has_table(Calculation.__tablename__)
+    if settings.CALCULATION_PARTITIONING != "none" and create_partitioned_table(engine):
+        print(f"Created calculations partitioned by {settings.CALCULATION_PARTITIONING}.")
     Base.metadata.create_all(bind=engine)
     print("Tables created successfully!")
+    if calculations_table_existed:
+        added = add_missing_columns(Calculation.__table__)
+        if added:
+            print(f"Added calculation columns: {', '.join(added)}")
+    if not stats_table_existed:
+        # Backfill the report rollup from existing calculations
+        with SessionLocal() as db:
+            users = UserCalculationStats.rebuild(db)
+            db.commit()
+        print(f"Backfilled calculation stats for {users} users.")
     yield  # This is where application runs
-    # Cleanup code would go here (after yield), but we don't need any
+    # Stop evaluation worker processes, if any were started
+    shutdown_executor()
 
 # Initialize the FastAPI application with metadata and lifespan
 app = FastAPI(
@@ -73,6 +116,12 @@ app = FastAPI(
 
 app.include_router(user_router)
 
+
+@app.exception_handler(EvaluationTimeoutError)
+def evaluation_timeout_handler(request: Request, exc: EvaluationTimeoutError):
+    """Report offloaded evaluations that exceeded their timeout as 503."""
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"detail": str(exc)})
+
 # ------------------------------------------------------------------------------
 # Static Files and Templates Configuration
 # ------------------------------------------------------------------------------
@@ -290,10 +339,14 @@ def create_calculation(
             calculation_type=calculation_data.type,
             user_id=current_user.id,
             inputs=calculation_data.inputs,
+            expression=calculation_data.expression,
+            operation=calculation_data.operation,
         )
-        new_calculation.result = new_calculation.get_result()
+        new_calculation.set_result(_evaluate_stored(db, new_calculation))
 
         db.add(new_calculation)
+        db.flush()
+        UserCalculationStats.record_create(db, new_calculation)
         db.commit()
         db.refresh(new_calculation)
         return new_calculation
@@ -306,8 +359,534 @@ def create_calculation(
         )
 
 
+# Create a Calculation from Packed Binary Inputs
+PACKED_MEDIA_TYPE = "application/octet-stream"
+
+@app.post(
+    "/calculations/packed",
+    response_model=CalculationResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["calculations"],
+)
+async def create_calculation_packed(
+    request: Request,
+    calculation_type: str = Query(..., alias="type", description="Type of calculation"),
+    expression: Optional[str] = Query(None, description="Arithmetic expression; only for the expression type"),
+    operation: Optional[str] = Query(None, description="Swept calculation type; only for the sweep type"),
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create a calculation whose inputs are the raw request body: little-endian
+    float64 values sent as ``application/octet-stream``.
+
+    The body is read up to the type's operand limit and decoded in one step,
+    skipping JSON parsing and per-number validation. Otherwise this behaves
+    exactly like POST /calculations.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type != PACKED_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be {PACKED_MEDIA_TYPE}",
+        )
+
+    calculation_class = operation_registry.get(calculation_type)
+    limit = calculation_class.operand_limit() if calculation_class else settings.CALCULATION_MAX_OPERANDS
+    body = bytearray()
+    async for data in request.stream():
+        body += data
+        if len(body) > 8 * limit:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {limit} numbers are allowed",
+            )
+
+    try:
+        calculation_data = CalculationBase(
+            type=calculation_type, inputs=body, expression=expression, operation=operation
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_input=False))
+    return await run_in_threadpool(create_calculation, calculation_data, current_user, db)
+
+
+def _evaluate_stored(db: Session, calculation: Calculation):
+    """
+    Evaluate a calculation, or reuse the result of its stored payload.
+
+    In the content-addressed storage mode an identical calculation that was
+    stored before already holds the result, so evaluation is skipped.
+    """
+    if settings.CALCULATION_CONTENT_ADDRESSED:
+        key = CalculationPayload.key_of(calculation)
+        stored = CalculationPayload.stored_results(db, [key])
+        if key in stored:
+            return stored[key]
+    return evaluate(calculation)
+
+
+def _evaluate_calculations(items: List[CalculationBase], user_id, db: Optional[Session] = None) -> List[Union[dict, ValueError]]:
+    """
+    Evaluate submitted calculations with the vectorized batch engine.
+
+    In the content-addressed storage mode, calculations whose payload is
+    already stored take its result, found with one query, and only the
+    rest are evaluated.
+
+    Returns a list aligned with ``items`` holding either the row to insert
+    or the ValueError that rejected the item.
+    """
+    calculations = [
+        Calculation.create(
+            calculation_type=item.type, user_id=user_id, inputs=item.inputs,
+            expression=item.expression, operation=item.operation,
+        )
+        for item in items
+    ]
+    results: List = [None] * len(calculations)
+    pending = list(range(len(calculations)))
+    if db is not None and settings.CALCULATION_CONTENT_ADDRESSED:
+        keys = [CalculationPayload.key_of(calculation) for calculation in calculations]
+        stored = CalculationPayload.stored_results(db, keys)
+        pending = [position for position, key in enumerate(keys) if key not in stored]
+        for position, key in enumerate(keys):
+            if key in stored:
+                results[position] = stored[key]
+    evaluated = Calculation.evaluate_batch([calculations[position] for position in pending])
+    for position, result in zip(pending, evaluated):
+        results[position] = result
+
+    outcomes = []
+    for calculation, result in zip(calculations, results):
+        if isinstance(result, ValueError):
+            outcomes.append(result)
+        else:
+            outcomes.append({
+                "user_id": user_id,
+                "type": calculation.type,
+                **Calculation.input_columns(calculation.inputs),
+                "expression": calculation.expression,
+                "operation": calculation.operation,
+                **Calculation.result_columns(result),
+            })
+    return outcomes
+
+
+def _insert_calculations(db: Session, user_id, rows: List[dict]) -> List[Calculation]:
+    """
+    Store evaluated rows with one multi-row INSERT ... RETURNING and update
+    the owner's stats rollup. In the content-addressed storage mode the
+    rows reference payloads stored just before. The caller is responsible
+    for committing.
+    """
+    contents = None
+    if settings.CALCULATION_CONTENT_ADDRESSED:
+        rows, contents = CalculationPayload.split_rows(db, rows)
+    created = db.scalars(
+        insert(Calculation).returning(Calculation, sort_by_parameter_order=True),
+        rows,
+    ).all()
+    for calculation, content in zip(created, contents or []):
+        CalculationPayload.fill_values(calculation, content)
+    UserCalculationStats.record_many(db, user_id, created)
+    return created
+
+
+# Batch Create Calculations
+@app.post(
+    "/calculations/batch",
+    response_model=CalculationBatchResponse,
+    tags=["calculations"],
+)
+def create_calculations_batch(
+    calculations_data: List[CalculationBase] = Body(..., max_length=settings.CALCULATION_BATCH_MAX_ITEMS),
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many calculations for the authenticated user in one request.
+
+    Items are built with the ``Calculation.create`` factory and evaluated
+    together by the vectorized batch engine. Items that fail business
+    validation (e.g. division by zero) are reported per item and skipped;
+    the rest are stored with a single multi-row ``INSERT ... RETURNING`` and
+    one commit.
+    """
+    results: List[CalculationBatchItemResult] = []
+    rows = []
+    row_indexes = []
+    for index, outcome in enumerate(_evaluate_calculations(calculations_data, current_user.id, db)):
+        if isinstance(outcome, ValueError):
+            results.append(CalculationBatchItemResult(index=index, error=str(outcome)))
+            continue
+        rows.append(outcome)
+        row_indexes.append(index)
+
+    created = []
+    if rows:
+        created = _insert_calculations(db, current_user.id, rows)
+        # Serialize before commit expires the RETURNING-loaded attributes
+        results.extend(
+            CalculationBatchItemResult(index=index, calculation=calculation)
+            for index, calculation in zip(row_indexes, created)
+        )
+        db.commit()
+
+    results.sort(key=lambda r: r.index)
+    return CalculationBatchResponse(
+        created=len(created),
+        failed=len(calculations_data) - len(created),
+        results=results,
+    )
+
+
+def _load_referenced_calculations(db: Session, user_id, operands) -> Dict[UUID, Calculation]:
+    """
+    Load the stored calculations referenced by ``calculation_id`` operands.
+
+    Raises:
+        ValueError: If a referenced calculation does not exist or belongs to
+            another user
+    """
+    ids = {
+        operand.calculation_id for operand in operands
+        if isinstance(operand, CalculationReference) and operand.calculation_id is not None
+    }
+    if not ids:
+        return {}
+    stored = {
+        calc.id: calc
+        for calc in db.query(Calculation).options(*Calculation.payload_loading())
+        .filter(Calculation.id.in_(ids), Calculation.user_id == user_id)
+    }
+    missing = ids - stored.keys()
+    if missing:
+        raise ValueError(f"Referenced calculation not found: {sorted(map(str, missing))[0]}")
+    return stored
+
+
+def _resolve_operands(operands, stored: Dict[UUID, Calculation], nodes: Optional[Dict[str, Calculation]] = None):
+    """
+    Replace references with the current results they point at.
+
+    Returns:
+        tuple: ``(inputs, sources)`` where ``inputs`` holds only numbers and
+        ``sources`` maps each linked position to the calculation it reads
+    """
+    inputs, sources = [], {}
+    for position, operand in enumerate(operands):
+        if isinstance(operand, CalculationReference):
+            source = nodes[operand.node] if operand.node is not None else stored[operand.calculation_id]
+            sources[position] = source
+            inputs.append(source.value)
+        else:
+            inputs.append(operand)
+    return inputs, sources
+
+
+# Create a Graph of Linked Calculations
+@app.post(
+    "/calculations/graph",
+    response_model=CalculationGraphResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["calculations"],
+)
+def create_calculation_graph(
+    graph: CalculationGraphRequest,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create several linked calculations in one request.
+
+    A node's inputs can reference other nodes by key or stored calculations
+    by id. Nodes are evaluated in topological order and each one exactly
+    once, so a node shared by several others is computed a single time.
+    Every reference is recorded, so later updates to an upstream calculation
+    propagate downstream. The request is all or nothing: if any node fails,
+    nothing is stored.
+    """
+    try:
+        nodes = {}
+        for node in graph.nodes:
+            if node.key in nodes:
+                raise ValueError(f"Duplicate node key: {node.key}")
+            nodes[node.key] = node
+
+        dependencies = {}
+        for key, node in nodes.items():
+            parents = [op.node for op in node.inputs if isinstance(op, CalculationReference) and op.node is not None]
+            for parent in parents:
+                if parent not in nodes:
+                    raise ValueError(f"Node '{key}' references unknown node '{parent}'.")
+            dependencies[key] = parents
+        order = topological_order(dependencies)
+        stored = _load_referenced_calculations(
+            db, current_user.id, [op for node in graph.nodes for op in node.inputs]
+        )
+
+        created: Dict[str, Calculation] = {}
+        links = {}
+        for key in order:
+            node = nodes[key]
+            inputs, links[key] = _resolve_operands(node.inputs, stored, created)
+            calculation = Calculation.create(
+                calculation_type=node.type,
+                user_id=current_user.id,
+                inputs=inputs,
+                expression=node.expression,
+                operation=node.operation,
+            )
+            try:
+                calculation.set_result(evaluate(calculation))
+            except ValueError as e:
+                raise ValueError(f"Node '{key}': {e}")
+            created[key] = calculation
+
+        db.add_all(created.values())
+        db.flush()
+        for key, sources in links.items():
+            CalculationDependency.link(
+                db, created[key], {position: source.id for position, source in sources.items()}, replace=False
+            )
+        UserCalculationStats.record_many(db, current_user.id, list(created.values()))
+        # Serialize before commit expires the rows
+        response = CalculationGraphResponse(calculations={
+            key: CalculationResponse.model_validate(created[key]) for key in nodes
+        })
+        db.commit()
+        return response
+
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+# Parameter Sweep
+@app.post(
+    "/calculations/sweep",
+    response_model=CalculationSweepResponse,
+    tags=["calculations"],
+)
+def sweep_calculation(
+    sweep_data: CalculationSweepRequest,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Evaluate one operation at every value of a varying operand.
+
+    All points are evaluated together as a single ``sweep`` calculation,
+    with the same semantics and error messages as creating one calculation
+    per point; the first failing point rejects the request. Nothing is
+    stored unless ``save`` is set, in which case the whole sweep becomes
+    one calculation whose ``result_array`` holds the results.
+    """
+    try:
+        sweep = Calculation.create(
+            calculation_type="sweep",
+            user_id=current_user.id,
+            inputs=sweep_data.sweep_inputs(),
+            expression=sweep_data.expression,
+            operation=sweep_data.type,
+        )
+        results = evaluate(sweep)
+        response = CalculationSweepResponse(
+            type=sweep_data.type,
+            values=sweep.inputs[sweep.varying_position()],
+            results=results,
+        )
+        if sweep_data.save:
+            sweep.set_result(results)
+            db.add(sweep)
+            db.flush()
+            UserCalculationStats.record_create(db, sweep)
+            response.calculation_id = sweep.id
+            db.commit()
+        return response
+
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+# Running Values (Scan)
+def _stream_scan(calculation: Calculation) -> StreamingResponse:
+    """
+    Compute a calculation's running values and stream them as one JSON object.
+
+    The values are computed up front, so any error is still a 400, and then
+    serialized ``CALCULATION_SCAN_CHUNK_SIZE`` at a time, so a long chain is
+    never turned into one giant list of Python floats.
+
+    Raises:
+        ValueError: If the calculation has no scan or is invalid
+    """
+    running = calculation.scan()
+    chunk_size = settings.CALCULATION_SCAN_CHUNK_SIZE
+
+    def chunks():
+        yield f'{{"type": {json.dumps(calculation.type)}, "count": {len(running)}, "values": ['
+        for start in range(0, len(running), chunk_size):
+            values = json.dumps(running[start:start + chunk_size].tolist())[1:-1]
+            yield values if start == 0 else "," + values
+        yield "]}"
+
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+@app.post("/calculations/scan", tags=["calculations"])
+def scan_calculation(
+    calculation_data: CalculationBase,
+    current_user = Depends(get_current_active_user),
+):
+    """
+    Return the running value after every operand of a chained calculation
+    (addition, subtraction, multiplication or division), without storing it.
+
+    The response is ``{"type", "count", "values"}``, streamed in chunks; the
+    last value is the calculation's result.
+    """
+    try:
+        calculation = Calculation.create(
+            calculation_type=calculation_data.type,
+            user_id=current_user.id,
+            inputs=calculation_data.inputs,
+            expression=calculation_data.expression,
+            operation=calculation_data.operation,
+        )
+        return _stream_scan(calculation)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+# Streaming NDJSON Ingestion
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+@app.post(
+    "/calculations/ingest",
+    response_model=CalculationIngestSummary,
+    tags=["calculations"],
+)
+async def ingest_calculations(
+    request: Request,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk-load calculations from a streamed ``application/x-ndjson`` body.
+
+    The body is parsed line by line as it arrives, so memory use is bounded
+    by one chunk of rows no matter how large the upload is. Every
+    ``CALCULATION_INGEST_CHUNK_SIZE`` lines the chunk is validated with
+    ``CalculationBase``, evaluated by the vectorized batch engine, inserted
+    and committed in the threadpool, so the event loop only splits lines.
+    Chunks committed before a failure stay committed.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type not in NDJSON_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Type must be application/x-ndjson",
+        )
+
+    chunk_size = settings.CALCULATION_INGEST_CHUNK_SIZE
+    max_line_bytes = settings.CALCULATION_INGEST_MAX_LINE_BYTES
+    accepted = 0
+    rejected = 0
+    errors: List[CalculationIngestError] = []
+    pending: List[Tuple[int, bytes]] = []  # (line number, raw line)
+
+    def reject(line_number: int, message: str):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < settings.CALCULATION_INGEST_MAX_ERRORS:
+            errors.append(CalculationIngestError(line=line_number, error=message))
+
+    def flush_chunk(chunk: List[Tuple[int, bytes]]) -> List[Tuple[int, str]]:
+        items, failures = [], []
+        for line_number, line in chunk:
+            try:
+                items.append((line_number, CalculationBase.model_validate_json(line)))
+            except ValidationError as e:
+                failures.append((line_number, "; ".join(err["msg"] for err in e.errors())))
+        outcomes = _evaluate_calculations([item for _, item in items], current_user.id, db) if items else []
+        rows = [outcome for outcome in outcomes if not isinstance(outcome, ValueError)]
+        if rows:
+            _insert_calculations(db, current_user.id, rows)
+            db.commit()
+            # Drop the committed objects so the identity map stays small
+            db.expunge_all()
+        failures += [
+            (line_number, str(outcome))
+            for (line_number, _), outcome in zip(items, outcomes)
+            if isinstance(outcome, ValueError)
+        ]
+        return sorted(failures)
+
+    async def flush():
+        nonlocal accepted, pending
+        chunk, pending = pending, []
+        failures = await run_in_threadpool(flush_chunk, chunk)
+        accepted += len(chunk) - len(failures)
+        for line_number, message in failures:
+            reject(line_number, message)
+
+    async def handle_line(line_number: int, line: bytes):
+        if not line.strip():
+            return
+        if len(line) > max_line_bytes:
+            reject(line_number, f"Line exceeds {max_line_bytes} bytes")
+            return
+        pending.append((line_number, line))
+        if len(pending) >= chunk_size:
+            await flush()
+
+    buffer = b""
+    line_number = 0
+    discarding = False  # Skipping the rest of an over-long line
+    async for data in request.stream():
+        if discarding:
+            # Drop the rest of the rejected line, up to its newline
+            newline = data.find(b"\n")
+            if newline < 0:
+                continue
+            data = data[newline + 1:]
+            line_number += 1
+            discarding = False
+        lines = (buffer + data).split(b"\n")
+        buffer = lines.pop()  # The trailing partial line
+        for line in lines:
+            line_number += 1
+            await handle_line(line_number, line)
+        if len(buffer) > max_line_bytes:
+            reject(line_number + 1, f"Line exceeds {max_line_bytes} bytes")
+            buffer = b""
+            discarding = True
+
+    if buffer:
+        line_number += 1
+        await handle_line(line_number, buffer)
+
+    if pending:
+        await flush()
+
+    errors.sort(key=lambda error: error.line)
+    return CalculationIngestSummary(accepted=accepted, rejected=rejected, errors=errors)
+
+
 # Report/History Endpoint - Must come before parameterized routes
-from collections import Counter
 from app.schemas.calculation import CalculationReport
 
 @app.get("/calculations/report", response_model=CalculationReport, tags=["calculations"])
@@ -318,40 +897,143 @@ def get_calculation_report(
     """
     Get usage statistics for the current user's calculations.
     Returns total calculations, average operands, most common type, and last calculation time.
+
+    The figures are read from the user's ``user_calculation_stats`` row, which
+    is maintained alongside every create, update and delete, so this is a
+    single primary-key lookup regardless of how many calculations exist.
     """
-    calculations = db.query(Calculation).filter(Calculation.user_id == current_user.id).all()
-    total = len(calculations)
-    if total == 0:
+    stats = db.get(UserCalculationStats, current_user.id)
+    if stats is None or stats.total_count == 0:
         return CalculationReport(
             total_calculations=0,
             average_operands=0.0,
             most_common_type="N/A",
             last_calculation_at=None
         )
-    avg_operands = sum(len(c.inputs) for c in calculations) / total
-    type_counts = Counter(c.type for c in calculations)
-    most_common_type = type_counts.most_common(1)[0][0]
-    last_calc = max(c.created_at for c in calculations)
     return CalculationReport(
-        total_calculations=total,
-        average_operands=avg_operands,
-        most_common_type=most_common_type,
-        last_calculation_at=last_calc
+        total_calculations=stats.total_count,
+        average_operands=stats.average_operands,
+        most_common_type=stats.most_common_type,
+        last_calculation_at=stats.last_calculation_at
     )
 
+def _history_criteria(model, user_id, min_operands, max_operands, created_after, created_before, after_key) -> list:
+    """
+    WHERE criteria of one history page, for ``Calculation`` or ``ArchivedCalculation``.
+    """
+    criteria = [model.user_id == user_id]
+    if min_operands is not None:
+        criteria.append(model.operand_count >= min_operands)
+    if max_operands is not None:
+        criteria.append(model.operand_count <= max_operands)
+    if created_after is not None:
+        criteria.append(model.created_at >= created_after)
+    if created_before is not None:
+        criteria.append(model.created_at < created_before)
+    if after_key is not None:
+        last_created_at, last_id = after_key
+        criteria.append(or_(
+            model.created_at < last_created_at,
+            and_(model.created_at == last_created_at, model.id > last_id),
+        ))
+    return criteria
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Stored timestamps are naive UTC; convert aware query parameters to match."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 # Browse / List Calculations
 @app.get("/calculations", response_model=List[CalculationResponse], tags=["calculations"])
 def list_calculations(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of calculations to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    min_operands: Optional[int] = Query(None, ge=0, description="Only calculations with at least this many operands"),
+    max_operands: Optional[int] = Query(None, ge=0, description="Only calculations with at most this many operands"),
+    created_after: Optional[datetime] = Query(None, description="Only calculations created at or after this time (UTC)"),
+    created_before: Optional[datetime] = Query(None, description="Only calculations created before this time (UTC)"),
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
-    List all calculations belonging to the current authenticated user.
+    List calculations belonging to the current authenticated user, newest first.
+
+    The body is a plain list of calculations. When more remain, the cursor
+    of the next page is returned in the ``X-Next-Cursor`` header, and the
+    ``Link`` header holds the URL of that page (``rel="next"``).
+
+    Uses keyset pagination on ``(created_at, id)`` rather than OFFSET, so every
+    page is served from the ``(user_id, created_at DESC, id)`` index and costs
+    the same regardless of how much history the user has. Operand filters
+    compare the stored ``operand_count`` and never decode inputs.
+
+    Archived calculations are older than every calculation in the hot table,
+    so the archive is only read when the hot table cannot fill the page:
+    at the end of the recent history, or for a date range that reaches
+    back past it.
     """
-    calculations = db.query(Calculation).filter(Calculation.user_id == current_user.id).all()
+    after_key = None
+    if cursor is not None:
+        try:
+            after_key = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    filters = (current_user.id, min_operands, max_operands,
+               _utc_naive(created_after), _utc_naive(created_before), after_key)
+
+    # Fetch one extra row to learn whether another page exists
+    calculations = db.query(Calculation).options(*Calculation.payload_loading()).filter(
+        *_history_criteria(Calculation, *filters)
+    ).order_by(
+        Calculation.created_at.desc(),
+        Calculation.id.asc()
+    ).limit(limit + 1).all()
+
+    if len(calculations) <= limit:
+        archived = db.query(ArchivedCalculation).filter(*_history_criteria(ArchivedCalculation, *filters)).order_by(
+            ArchivedCalculation.created_at.desc(),
+            ArchivedCalculation.id.asc()
+        ).limit(limit + 1 - len(calculations)).all()
+        calculations += [row.to_calculation() for row in archived]
+        # Restore the page order should the two tiers overlap in time
+        calculations.sort(key=lambda calculation: calculation.id)
+        calculations.sort(key=lambda calculation: calculation.created_at, reverse=True)
+
+    if len(calculations) > limit:
+        calculations = calculations[:limit]
+        last = calculations[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+
     return calculations
 
 
+def _find_archived(db: Session, calc_uuid: UUID, user_id) -> Optional[ArchivedCalculation]:
+    return db.query(ArchivedCalculation).filter(
+        ArchivedCalculation.id == calc_uuid,
+        ArchivedCalculation.user_id == user_id
+    ).first()
+
+
+def _find_readable(db: Session, calc_uuid: UUID, user_id) -> Optional[Calculation]:
+    """A user's calculation from the hot table, or else from the archive (detached)."""
+    calculation = db.query(Calculation).filter(
+        *Calculation.id_criteria(calc_uuid),
+        Calculation.user_id == user_id
+    ).first()
+    if calculation is None:
+        archived = _find_archived(db, calc_uuid, user_id)
+        if archived is not None:
+            return archived.to_calculation()
+    return calculation
+
+
 # Read / Retrieve a Specific Calculation by ID
 @app.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
 def get_calculation(
@@ -361,22 +1043,49 @@ def get_calculation(
 ):
     """
     Retrieve a single calculation by its UUID, if it belongs to the current user.
+    Calculations moved to the archive are read from there.
     """
     try:
         calc_uuid = UUID(calc_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
 
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
+    calculation = _find_readable(db, calc_uuid, current_user.id)
     if not calculation:
         raise HTTPException(status_code=404, detail="Calculation not found.")
 
     return calculation
 
 
+# Running Values of a Stored Calculation
+@app.get("/calculations/{calc_id}/scan", tags=["calculations"])
+def scan_stored_calculation(
+    calc_id: str,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the running value after every operand of a stored chained
+    calculation, in the same format as POST /calculations/scan.
+    """
+    try:
+        calc_uuid = UUID(calc_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid calculation id format.")
+
+    calculation = _find_readable(db, calc_uuid, current_user.id)
+    if not calculation:
+        raise HTTPException(status_code=404, detail="Calculation not found.")
+
+    try:
+        return _stream_scan(calculation)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 # Edit / Update a Calculation
 @app.put("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
 def update_calculation(
@@ -387,6 +1096,12 @@ def update_calculation(
 ):
     """
     Update the inputs (and thus the result) of a specific calculation.
+
+    Inputs may reference other stored calculations by ``calculation_id``;
+    the new inputs replace any previous references. Calculations that use
+    this one's result are recomputed in dependency order, skipping every
+    branch whose inputs did not change. If any of them no longer evaluates,
+    the whole update is rejected.
     """
     try:
         calc_uuid = UUID(calc_id)
@@ -394,15 +1109,35 @@ def update_calculation(
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
 
     calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
+        *Calculation.id_criteria(calc_uuid),
         Calculation.user_id == current_user.id
     ).first()
     if not calculation:
+        if _find_archived(db, calc_uuid, current_user.id) is not None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Archived calculations are read-only.")
         raise HTTPException(status_code=404, detail="Calculation not found.")
 
     if calculation_update.inputs is not None:
-        calculation.inputs = calculation_update.inputs
-        calculation.result = calculation.get_result()
+        old_operand_count = calculation.count_operands()
+        try:
+            if any(isinstance(op, CalculationReference) and op.node is not None for op in calculation_update.inputs):
+                raise ValueError("Node references can only be used in POST /calculations/graph.")
+            stored = _load_referenced_calculations(db, current_user.id, calculation_update.inputs)
+            if stored and stored.keys() & (CalculationDependency.downstream_ids(db, calculation.id) | {calculation.id}):
+                raise ValueError("A calculation cannot depend on itself or on its own dependents.")
+            calculation.inputs, sources = _resolve_operands(calculation_update.inputs, stored)
+            calculation.set_result(_evaluate_stored(db, calculation))
+            CalculationDependency.link(
+                db, calculation, {position: source.id for position, source in sources.items()}
+            )
+            CalculationDependency.propagate(db, calculation)
+        except ValueError as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        UserCalculationStats.record_update(db, calculation, old_operand_count)
 
     calculation.updated_at = datetime.utcnow()
     db.commit()
@@ -419,6 +1154,7 @@ def delete_calculation(
 ):
     """
     Delete a calculation by its UUID, if it belongs to the current user.
+    Archived calculations are deleted from the archive.
     """
     try:
         calc_uuid = UUID(calc_id)
@@ -426,13 +1162,20 @@ def delete_calculation(
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
 
     calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
+        *Calculation.id_criteria(calc_uuid),
         Calculation.user_id == current_user.id
     ).first()
-    if not calculation:
-        raise HTTPException(status_code=404, detail="Calculation not found.")
-
-    db.delete(calculation)
+    if calculation:
+        CalculationDependency.unlink(db, calculation.id)
+        db.delete(calculation)
+    else:
+        archived = _find_archived(db, calc_uuid, current_user.id)
+        if not archived:
+            raise HTTPException(status_code=404, detail="Calculation not found.")
+        calculation = archived.to_calculation()
+        db.delete(archived)
+    db.flush()
+    UserCalculationStats.record_delete(db, calculation)
     db.commit()
     return None
 
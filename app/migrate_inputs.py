@@ -0,0 +1,149 @@
+# app/migrate_inputs.py
+"""
+Inputs Storage Migration
+
+Rewrites the stored inputs of every calculation into one storage layout and
+backfills the derived ``operand_count`` column. The layouts, selected for
+new rows by ``CALCULATION_INPUTS_STORAGE``, are:
+
+- ``json``: the generic JSON column (the original layout).
+- ``array``: a native ``float8[]`` column.
+- ``packed``: a ``bytea`` of little-endian float64 values, 8 bytes per
+  operand, decoded with a single NumPy call.
+
+Only flat lists of numbers move out of the JSON column; vector, matrix and
+sweep inputs stay JSON in every layout. Reads accept all layouts at once, so
+the app keeps working while the job runs, and the job can be stopped and
+restarted: rows already in the target layout are skipped.
+Calculations stored in the content-addressed mode keep their inputs in
+``calculation_payloads`` and are skipped.
+
+Like ``app.recompute``, rows are streamed with a server-side cursor and
+written back with one bulk UPDATE and one commit per batch. PostgreSQL only
+returns the space freed by the old layout after ``VACUUM FULL calculations``.
+
+Usage:
+    python -m app.migrate_inputs --storage packed --batch-size 5000
+    python -m app.migrate_inputs --dry-run
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import or_, select, update
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.database_init import add_missing_columns
+from app.models.calculation import INPUT_STORAGE_MODES, Calculation
+from app.models.user import User  # noqa: F401 - configures the Calculation.user relationship
+
+# Stored input columns, in the order decode_inputs() takes them
+STORED_INPUTS = ("inputs_json", "inputs_array", "inputs_packed")
+# Column that holds flat numeric inputs in each layout
+TARGET_COLUMNS = {"json": "inputs_json", "array": "inputs_array", "packed": "inputs_packed"}
+
+
+def migrate_chunk(rows: List[tuple], storage: str) -> List[Dict]:
+    """
+    Re-encode one batch of rows.
+
+    Args:
+        rows: ``(id, inputs_json, inputs_array, inputs_packed, operand_count)``
+        storage: The target layout
+
+    Returns:
+        list: ``{"id", "inputs_json", "inputs_array", "inputs_packed",
+        "operand_count"}`` for every row whose stored columns change
+    """
+    updates = []
+    for calc_id, *stored, operand_count in rows:
+        columns = Calculation.input_columns(Calculation.decode_inputs(*stored), storage)
+        current = dict(zip(STORED_INPUTS, stored), operand_count=operand_count)
+        if any(_stored_value(current[name]) != _stored_value(value) for name, value in columns.items()):
+            updates.append({"id": calc_id, **columns})
+    return updates
+
+
+def _stored_value(value):
+    # bytea columns are read back as memoryview
+    return bytes(value) if isinstance(value, memoryview) else value
+
+
+def migrate_inputs(
+    storage: Optional[str] = None,
+    batch_size: int = 5000,
+    dry_run: bool = False,
+    session_factory: Callable = SessionLocal,
+    report: Callable[[str], None] = print,
+) -> Dict[str, float]:
+    """
+    Move every calculation's inputs into one storage layout.
+
+    Args:
+        storage: Target layout; defaults to ``CALCULATION_INPUTS_STORAGE``
+        batch_size: Rows fetched per server-side cursor batch and per UPDATE
+        dry_run: Count changes without writing them
+        session_factory: Creates database sessions (one reads, one writes)
+        report: Receives a progress line after every batch
+
+    Returns:
+        dict: Totals for ``processed``, ``changed`` and ``seconds``
+
+    Raises:
+        ValueError: If the storage layout is unknown
+    """
+    storage = storage or settings.CALCULATION_INPUTS_STORAGE
+    if storage not in INPUT_STORAGE_MODES:
+        raise ValueError(f"Unknown inputs storage: {storage}")
+
+    totals = {"processed": 0, "changed": 0, "seconds": 0.0}
+    started = time.monotonic()
+    if not dry_run:
+        add_missing_columns(Calculation.__table__)
+
+    target = getattr(Calculation, TARGET_COLUMNS[storage])
+    with session_factory() as reader, session_factory() as writer:
+        stream = reader.execute(
+            select(Calculation.id, *(getattr(Calculation, name) for name in STORED_INPUTS), Calculation.operand_count)
+            .where(
+                or_(target.is_(None), Calculation.operand_count.is_(None)),
+                Calculation.payload_hash.is_(None),
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in stream.partitions():
+            updates = migrate_chunk(partition, storage)
+            if updates and not dry_run:
+                writer.execute(update(Calculation), updates)
+                writer.commit()
+            totals["processed"] += len(partition)
+            totals["changed"] += len(updates)
+            elapsed = time.monotonic() - started
+            report(
+                f"processed={totals['processed']} changed={totals['changed']} "
+                f"rate={totals['processed'] / max(elapsed, 1e-9):.0f} rows/s"
+            )
+
+    totals["seconds"] = time.monotonic() - started
+    return totals
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Move stored calculation inputs into one storage layout.")
+    parser.add_argument("--storage", choices=INPUT_STORAGE_MODES, default=settings.CALCULATION_INPUTS_STORAGE,
+                        help="Target layout (default: CALCULATION_INPUTS_STORAGE)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per batch (default: 5000)")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing them")
+    args = parser.parse_args(argv)
+
+    totals = migrate_inputs(storage=args.storage, batch_size=args.batch_size, dry_run=args.dry_run)
+    print(
+        f"Done: {totals['processed']} rows in {totals['seconds']:.1f}s, "
+        f"{totals['changed']} rewritten as {args.storage}{' (dry run)' if args.dry_run else ''}"
+    )
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -0,0 +1,5 @@
+# app/models/__init__.py
+# Import every module that defines calculation types, so that they are all in
+# the operation registry before it is frozen by the first lookup, and the
+# payload model, whose events every Calculation mapper relies on.
+from app.models import calculation, calculation_payload, statistics, sweep, vectors  # noqa: F401
@@ -12,16 +12,59 @@ It demonstrates several advanced patterns:
 
 These models are designed for a calculator application that supports
 basic mathematical operations: addition, subtraction, multiplication, and division.
+
+Every concrete subclass registers itself in ``operation_registry`` under its
+polymorphic identity when the class is defined, so the factory and the
+request schemas pick it up from the registry. The arithmetic, operand-count
+rules and batch kernel of each type are defined once, in
+``app.operations.catalog``; a subclass takes them from the catalog entry of
+the same name and adds what only the API needs: cost guards, magnitude
+estimates and scan kernels.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
+import math
+import sys
 import uuid
-from typing import List
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship, declared_attr
+from typing import List, Optional, Tuple, Union
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, JSON, Float, Index, Integer, LargeBinary, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import declared_attr, joinedload, relationship
 from sqlalchemy.ext.declarative import declared_attr
+import numpy as np
+from app.core.cache import ResultCache, memoize_result, result_cache
+from app.core.config import settings
+from app.core.ids import uuid7, uuid7_time
+from app.core.packed import PACKED_DTYPE, pack_floats
 from app.database import Base
+from app.operations import batch
+from app.operations import catalog
+from app.operations.catalog import Operation, finite_result
+from app.operations.registry import operation_registry
+
+# Layouts for flat numeric inputs selected by CALCULATION_INPUTS_STORAGE
+INPUT_STORAGE_MODES = ("json", "array", "packed")
+
+# Distance allowed between the time in a version 7 id and the row's created_at
+ID_TIME_SLACK = timedelta(days=1)
+
+# log10 of the largest finite float; larger estimated magnitudes overflow
+FLOAT_MAX_LOG10 = math.log10(sys.float_info.max)
+
+
+def _log10_abs(value) -> Optional[float]:
+    """log10(|value|), or None for zero, non-finite or non-numeric values."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value == 0:
+        return None
+    try:
+        magnitude = math.log10(abs(value))
+    except (OverflowError, ValueError):
+        return None
+    return magnitude if math.isfinite(magnitude) else None
+
+def _is_flat(inputs) -> bool:
+    """Whether inputs are a list of plain numbers, storable as float64 values."""
+    return isinstance(inputs, list) and all(type(value) in (int, float) for value in inputs)
 
 class AbstractCalculation:
     """
@@ -54,11 +97,14 @@ class AbstractCalculation:
         - Hides record count
         - Allows for distributed systems
         - Improves security (not guessable)
+
+        New ids are UUIDv7, which start with their creation time, so inserts
+        append to the primary-key index instead of splitting random pages.
         """
         return Column(
             UUID(as_uuid=True), 
             primary_key=True, 
-            default=uuid.uuid4,  # Auto-generate UUIDs
+            default=uuid7,  # Auto-generate time-ordered UUIDs
             nullable=False
         )
 
@@ -69,12 +115,13 @@ class AbstractCalculation:
         
         The 'ondelete=CASCADE' means if a user is deleted, all their
         calculations will also be deleted (referential integrity).
+        Lookups by user_id are served by the composite indexes in
+        ``Calculation.__table_args__``, which both lead with it.
         """
         return Column(
             UUID(as_uuid=True), 
             ForeignKey('users.id', ondelete='CASCADE'),
-            nullable=False,
-            index=True  # Index for faster queries filtering by user_id
+            nullable=False
         )
 
     @declared_attr
@@ -83,24 +130,85 @@ class AbstractCalculation:
         Type of calculation, used for polymorphic identity.
         
         This column identifies which calculation subclass to use
-        when loading records from the database.
+        when loading records from the database. No query filters on it
+        alone, so it is not indexed.
         """
         return Column(
             String(50), 
-            nullable=False,
-            index=True  # Index for faster queries filtering by type
+            nullable=False
         )
 
     @declared_attr
-    def inputs(cls):
+    def inputs_json(cls):
         """
         JSON column storing the input values for the calculation.
         
         Using JSON type allows flexible storage of any number of inputs.
+        With the ``array`` and ``packed`` storage modes it only holds inputs
+        that are not a flat list of numbers (vectors, matrices, sweeps) and
+        is NULL otherwise. Read and write ``inputs`` rather than this column.
         """
         return Column(
-            JSON, 
-            nullable=False
+            "inputs",
+            JSON(none_as_null=True),  # None is SQL NULL, not a JSON null
+            nullable=True
+        )
+
+    @declared_attr
+    def inputs_array(cls):
+        """
+        Flat numeric inputs as a native float8[], in the ``array`` storage mode.
+        """
+        return Column(
+            ARRAY(Float),
+            nullable=True
+        )
+
+    @declared_attr
+    def inputs_packed(cls):
+        """
+        Flat numeric inputs as packed little-endian float64 bytes, in the
+        ``packed`` storage mode: 8 bytes per operand and no parsing on load.
+        """
+        return Column(
+            LargeBinary,
+            nullable=True
+        )
+
+    @declared_attr
+    def operand_count(cls):
+        """
+        Number of operands, derived from the inputs whenever they are set.
+
+        Lets the report rollup and operand filters work without decoding
+        the inputs. NULL only for rows written before the column existed,
+        until ``python -m app.migrate_inputs`` backfills them.
+        """
+        return Column(
+            Integer,
+            nullable=True
+        )
+
+    @declared_attr
+    def expression(cls):
+        """
+        Arithmetic expression for ``expression`` calculations, e.g.
+        ``(a + b) / c ** 2``. NULL for every other calculation type.
+        """
+        return Column(
+            Text,
+            nullable=True
+        )
+
+    @declared_attr
+    def operation(cls):
+        """
+        Calculation type evaluated at every point of a ``sweep`` calculation,
+        e.g. ``exponentiation``. NULL for every other calculation type.
+        """
+        return Column(
+            String(50),
+            nullable=True
         )
 
     @declared_attr
@@ -116,6 +224,30 @@ class AbstractCalculation:
             nullable=True
         )
 
+    @declared_attr
+    def result_array(cls):
+        """
+        Vector or matrix result of the array calculation types, stored as a
+        one- or two-dimensional float8[]. NULL for scalar results.
+        """
+        return Column(
+            ARRAY(Float),
+            nullable=True
+        )
+
+    @declared_attr
+    def payload_hash(cls):
+        """
+        Key of the shared payload holding this calculation's inputs,
+        attributes and result, in the content-addressed storage mode. Those
+        columns are then NULL on the row. See ``app.models.calculation_payload``.
+        """
+        return Column(
+            LargeBinary,
+            ForeignKey('calculation_payloads.hash'),
+            nullable=True
+        )
+
     @declared_attr
     def created_at(cls):
         """
@@ -153,19 +285,42 @@ class AbstractCalculation:
         """
         return relationship("User", back_populates="calculations")
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        Register concrete calculation types in the operation registry.
+
+        A subclass whose ``polymorphic_identity`` names a catalog entry takes
+        its operand rules, result attributes and batch kernel from that entry
+        and is registered under the same name.
+        """
+        super().__init_subclass__(**kwargs)
+        identity = cls.__dict__.get("__mapper_args__", {}).get("polymorphic_identity")
+        definition = catalog.catalog.get(identity) if identity else None
+        if definition is None:
+            return
+        cls.definition = definition
+        cls.batch_kernel = staticmethod(definition.batch_kernel) if definition.batch_kernel else None
+        cls.operand_range = definition.operand_range
+        cls.operand_count_error = definition.operand_count_error
+        cls.result_attributes = definition.attributes
+        cls.sweepable = definition.sweepable
+        operation_registry.register(identity, cls)
+
     @classmethod
-    def create(cls, calculation_type: str, user_id: uuid.UUID, inputs: List[float]) -> "Calculation":
+    def create(cls, calculation_type: str, user_id: uuid.UUID, inputs: List[float], **attributes) -> "Calculation":
         """
         Factory method to create calculation instances of the appropriate type.
         
         This implements the Factory Method design pattern, which provides an
         interface for creating objects but allows subclasses to decide which
-        class to instantiate.
+        class to instantiate. The class is looked up in the frozen
+        ``operation_registry`` table.
         
         Args:
             calculation_type: The type of calculation to create (e.g., "addition")
             user_id: The UUID of the user who owns this calculation
             inputs: List of numeric inputs for the calculation
+            **attributes: Type-specific columns, e.g. ``expression``
             
         Returns:
             An instance of the appropriate Calculation subclass
@@ -173,32 +328,373 @@ class AbstractCalculation:
         Raises:
             ValueError: If the calculation_type is not supported
         """
-        calculation_classes = {
-            'addition': Addition,
-            'subtraction': Subtraction,
-            'multiplication': Multiplication,
-            'division': Division,
-            'exponentiation': Exponentiation,
-        }
-        calculation_class = calculation_classes.get(calculation_type.lower())
+        calculation_class = operation_registry.get(calculation_type)
         if not calculation_class:
             raise ValueError(f"Unsupported calculation type: {calculation_type}")
-        return calculation_class(user_id=user_id, inputs=inputs)
+        return calculation_class(user_id=user_id, inputs=inputs, **attributes)
+
+    # The catalog entry of this type; the attributes below are copied from
+    # it when the subclass is defined
+    definition: Optional[Operation] = None
+
+    # Vectorized implementation used by evaluate_batch(); None means scalar only
+    batch_kernel = None
+
+    # (min, max) operand counts accepted by validate_inputs(); None means no
+    # upper bound besides operand_limit()
+    operand_range: Tuple[int, Optional[int]] = (2, None)
+    operand_count_error = "Inputs must be a list with at least two numbers."
+
+    # Columns besides type and inputs that determine the result; they are
+    # part of the result cache key and travel with offloaded evaluations
+    result_attributes: Tuple[str, ...] = ()
+
+    # Whether a sweep may evaluate this type with one operand varying
+    sweepable = True
+
+    # Per-type operand limit; None means settings.CALCULATION_MAX_OPERANDS
+    max_operands: Optional[int] = None
+
+    # Running-value kernel used by scan(); None means the type has no scan
+    scan_kernel = None
+
+    @classmethod
+    def operand_limit(cls) -> int:
+        """The maximum number of operands this calculation type accepts."""
+        return cls.max_operands or settings.CALCULATION_MAX_OPERANDS
+
+    @staticmethod
+    def result_columns(value) -> dict:
+        """
+        Map an evaluated result onto the ``result`` and ``result_array`` columns.
+
+        Lists (vector and matrix results) go to ``result_array``; numbers to
+        ``result``. Both keys are always present so bulk writes share one
+        column set.
+        """
+        if isinstance(value, list):
+            return {"result": None, "result_array": value}
+        return {"result": value, "result_array": None}
+
+    @staticmethod
+    def input_columns(inputs, storage: Optional[str] = None) -> dict:
+        """
+        Map inputs onto the ``inputs``, ``inputs_array``, ``inputs_packed``
+        and ``operand_count`` columns.
+
+        A flat list of numbers goes to the column of the storage mode
+        (``CALCULATION_INPUTS_STORAGE`` unless ``storage`` is given); any
+        other inputs, and all inputs in the ``json`` mode, go to the JSON
+        column. All keys are always present so bulk writes share one column
+        set.
+
+        A float64 array, such as the view returned by ``decode_operands()``,
+        is already in the packed layout and is kept packed in every mode.
+        """
+        storage = storage or settings.CALCULATION_INPUTS_STORAGE
+        columns = {
+            "inputs_json": None,
+            "inputs_array": None,
+            "inputs_packed": None,
+            "operand_count": len(inputs) if isinstance(inputs, (list, np.ndarray)) else None,
+        }
+        if isinstance(inputs, np.ndarray):
+            columns["inputs_packed"] = inputs.astype(PACKED_DTYPE, copy=False).tobytes()
+        elif storage == "array" and _is_flat(inputs):
+            columns["inputs_array"] = [float(value) for value in inputs]
+        elif storage == "packed" and _is_flat(inputs):
+            columns["inputs_packed"] = pack_floats(inputs)
+        else:
+            columns["inputs_json"] = inputs
+        return columns
+
+    @staticmethod
+    def decode_inputs(inputs_json, inputs_array, inputs_packed):
+        """
+        Rebuild inputs from whichever storage column holds them.
+
+        The result is always a list: it is what the API returns and what
+        the JSON column and the cost guards work on. Evaluation can skip
+        the conversion of packed inputs through ``operands()``.
+        """
+        if inputs_packed is not None:
+            return np.frombuffer(inputs_packed, dtype=PACKED_DTYPE).tolist()
+        if inputs_array is not None:
+            return list(inputs_array)
+        return inputs_json
+
+    @staticmethod
+    def decode_operands(inputs_json, inputs_array, inputs_packed):
+        """
+        Like ``decode_inputs``, but packed inputs come back as a read-only
+        float64 view of the stored bytes, without copying, for evaluation.
+        """
+        if inputs_packed is not None:
+            return np.frombuffer(inputs_packed, dtype=PACKED_DTYPE)
+        return AbstractCalculation.decode_inputs(inputs_json, inputs_array, None)
+
+    @property
+    def inputs(self):
+        """
+        The operands, decoded from their storage column.
+
+        Decoded lists are kept together with the column value they came
+        from, so a row is decoded again only after it has been reloaded.
+        """
+        source = self.inputs_packed if self.inputs_packed is not None else self.inputs_array
+        if source is None:
+            return self.inputs_json
+        cached = self.__dict__.get("_decoded_inputs")
+        if cached is not None and cached[0] is source:
+            return cached[1]
+        value = self.decode_inputs(None, self.inputs_array, self.inputs_packed)
+        self.__dict__["_decoded_inputs"] = (source, value)
+        return value
+
+    @inputs.setter
+    def inputs(self, value) -> None:
+        columns = self.input_columns(value)
+        for name, column_value in columns.items():
+            setattr(self, name, column_value)
+        source = columns["inputs_packed"] if columns["inputs_packed"] is not None else columns["inputs_array"]
+        if isinstance(value, np.ndarray):
+            # Decoded into a list only if ``inputs`` is read
+            self.__dict__.pop("_decoded_inputs", None)
+        else:
+            self.__dict__["_decoded_inputs"] = (source, value)
+
+    def operands(self):
+        """
+        The inputs in the form that is cheapest to evaluate.
+
+        Packed inputs that have not been decoded yet are returned as a
+        read-only float64 view of the stored bytes, without copying; the
+        catalog functions and batch kernels take it as is. Otherwise this is
+        ``inputs``.
+        """
+        if self.inputs_packed is not None:
+            cached = self.__dict__.get("_decoded_inputs")
+            if cached is None or cached[0] is not self.inputs_packed:
+                return self.decode_operands(None, None, self.inputs_packed)
+        return self.inputs
+
+    def count_operands(self) -> int:
+        """Number of operands, read from ``operand_count`` when it is populated."""
+        if self.operand_count is not None:
+            return self.operand_count
+        return len(self.inputs) if isinstance(self.inputs, list) else 0
+
+    def set_result(self, value) -> None:
+        """Store an evaluated result in the column that fits its shape."""
+        for name, column_value in self.result_columns(value).items():
+            setattr(self, name, column_value)
+
+    @property
+    def value(self):
+        """The stored result: a number, or a list for vector and matrix results."""
+        return self.result if self.result_array is None else self.result_array
+
+    def cache_key(self):
+        """Key for the shared result cache, or None if the inputs cannot be keyed."""
+        return ResultCache.make_key(self.type, self.operands(), *self.attributes().values())
+
+    def attributes(self) -> dict:
+        """The ``result_attributes`` of this calculation, by name."""
+        return {name: getattr(self, name) for name in self.result_attributes}
+
+    @classmethod
+    def evaluate_batch(cls, calculations: List["Calculation"]) -> List[Union[float, ValueError]]:
+        """
+        Evaluate many calculations at once with the NumPy batch kernels.
+
+        Every item is validated and cost-guarded first. Results already in
+        the shared result cache are reused; the remaining calculations go
+        through ``catalog.evaluate_batch()``, which computes each type in one
+        vectorized pass and re-evaluates anything the kernel cannot represent
+        exactly, so results and errors always match the one-at-a-time path.
+
+        Args:
+            calculations: Calculation instances of any supported types
+
+        Returns:
+            A list aligned with ``calculations`` holding either the result or
+            the ValueError raised for that item
+        """
+        results: List[Union[float, ValueError, None]] = [None] * len(calculations)
+        # A disabled cache is skipped entirely: no keys, lookups or misses
+        keys = [c.cache_key() if result_cache.enabled else None for c in calculations]
+        pending = []
+        for position, calculation in enumerate(calculations):
+            # Guards first, so cached results never bypass a limit
+            try:
+                calculation.check()
+            except ValueError as e:
+                results[position] = e
+                continue
+            if keys[position] is not None:
+                hit, value = result_cache.get(keys[position])
+                if hit:
+                    results[position] = value
+                    continue
+            pending.append(position)
 
+        values = catalog.evaluate_batch([
+            (calculations[p].type, calculations[p].operands(), calculations[p].attributes()) for p in pending
+        ])
+        for p, value in zip(pending, values):
+            results[p] = value
+            if keys[p] is not None and not isinstance(value, ValueError):
+                result_cache.put(keys[p], value)
+        return results
+
+    def estimated_cost(self) -> int:
+        """
+        Rough cost of evaluating this calculation, in operand-steps.
+
+        Used to decide whether evaluation should leave the request thread.
+
+        Returns:
+            int: The number of operands, or 0 if inputs are not a list
+        """
+        operands = self.operands()
+        return len(operands) if isinstance(operands, (list, np.ndarray)) else 0
+
+    def estimated_magnitude(self) -> Optional[float]:
+        """
+        Estimate log10 of the absolute result without evaluating it.
+
+        Subclasses whose result magnitude can be predicted cheaply (products,
+        quotients, powers) override this so that results which would overflow
+        are rejected before any work is done.
+
+        Returns:
+            float or None: The estimate, or None when it cannot be predicted
+        """
+        return None
+
+    def validate_inputs(self) -> None:
+        """
+        Check the inputs against this type's operand-count rules.
+
+        Raises:
+            ValueError: If inputs are not a list or have the wrong length
+        """
+        operands = self.operands()
+        if not isinstance(operands, (list, np.ndarray)):
+            raise ValueError("Inputs must be a list of numbers.")
+        low, high = self.operand_range
+        if len(operands) < low or (high is not None and len(operands) > high):
+            raise ValueError(self.operand_count_error)
+
+    def check_cost(self) -> None:
+        """
+        Reject calculations that are too expensive or would overflow.
+
+        Raises:
+            ValueError: If there are more operands than the type allows, or
+                the estimated result magnitude exceeds the float range
+        """
+        limit = self.operand_limit()
+        operands = self.operands()
+        if isinstance(operands, (list, np.ndarray)) and len(operands) > limit:
+            raise ValueError(f"Too many inputs: at most {limit} numbers are allowed.")
+        magnitude = self.estimated_magnitude()
+        if magnitude is not None and magnitude > FLOAT_MAX_LOG10:
+            raise ValueError("Result is too large to represent.")
+
+    def check(self) -> None:
+        """
+        Run the input validation and the cost guard.
+
+        Raises:
+            ValueError: If either rejects the calculation
+        """
+        self.validate_inputs()
+        self.check_cost()
+
+    @memoize_result
     def get_result(self) -> float:
         """
-        Method to compute calculation result.
+        Compute the calculation result with ``evaluate_uncached()``.
+
+        Successful results are memoized in the shared result cache.
+        """
+        return self.evaluate_uncached()
+
+    def evaluate_uncached(self) -> float:
+        """
+        Compute the calculation result without consulting the result cache.
+
+        Template method: validates the inputs, runs the cost guard, delegates
+        the arithmetic to ``compute()``, then makes sure the
+        result is finite and real so that it can be stored and serialized.
+        Array results are returned as (nested) lists.
+
+        Returns:
+            float: The result of the calculation, or a list for vector and
+                matrix results
+
+        Raises:
+            ValueError: If the inputs are invalid, the calculation is too
+                expensive, or the result is not a finite real number
+            NotImplementedError: If called on the base class
+        """
+        self.validate_inputs()
+        self.check_cost()
+        try:
+            result = self.compute()
+        except OverflowError:
+            raise ValueError("Result is too large to represent.")
+        except TypeError:
+            # e.g. a vector given where a number is expected
+            raise ValueError("Inputs must be a list of numbers.")
+        return finite_result(result)
+
+    def scan(self) -> np.ndarray:
+        """
+        The running value of the operand chain after each operand.
+
+        The last running value is the result. The inputs are validated and
+        guarded exactly as in ``get_result()``, and a chain that fails there
+        fails here with the same error.
+
+        Returns:
+            np.ndarray: One float64 running value per operand
+
+        Raises:
+            ValueError: If the type has no scan or the calculation is invalid
+        """
+        if self.scan_kernel is None:
+            raise ValueError(f"Calculations of type '{self.type}' do not support scan.")
+        self.validate_inputs()
+        self.check_cost()
+        values = catalog.as_values(self.operands())
+        with np.errstate(all="ignore"):
+            running = self.scan_kernel(values)
+        if not np.isfinite(running).all():
+            # Non-finite values never recover, so the full chain fails too:
+            # let the scalar path raise its exact error
+            self.evaluate_uncached()
+            raise ValueError("Result is not a finite number.")
+        return running
+
+    def compute(self) -> float:
+        """
+        Method to compute the raw calculation result.
         
-        This is an abstract method that must be implemented by subclasses.
-        It defines the interface that all calculation types must implement.
+        Calls the catalog function of this type with the inputs and the
+        ``result_attributes``. It is only called once ``validate_inputs()``
+        has passed.
         
         Returns:
             float: The result of the calculation
             
         Raises:
-            NotImplementedError: If not implemented by a subclass
+            NotImplementedError: If the type has no catalog entry
         """
-        raise NotImplementedError
+        if self.definition is None:
+            raise NotImplementedError
+        return self.definition.compute(self.operands(), **self.attributes())
 
     def __repr__(self):
         """
@@ -219,7 +715,54 @@ class Calculation(Base, AbstractCalculation):
     
     The concrete calculation subclasses (Addition, Subtraction, etc.) will
     inherit from this class and specify their own polymorphic identities.
+
+    The composite ``(user_id, created_at DESC, id)`` index backs keyset
+    pagination of a user's history, so each page is a single index range scan.
     """
+    __table_args__ = (
+        Index(
+            'ix_calculations_user_created_id',
+            'user_id',
+            text('created_at DESC'),
+            'id',
+        ),
+        # Ownership-checked lookups: WHERE id = ... AND user_id = ...
+        Index('ix_calculations_user_id_id', 'user_id', 'id'),
+        # Payload references, for the foreign key check and garbage collection
+        Index('ix_calculations_payload_hash', 'payload_hash', postgresql_where=text('payload_hash IS NOT NULL')),
+    )
+
+    # Content-addressed rows load their payload when they are loaded; see
+    # app.models.calculation_payload
+    payload = relationship("CalculationPayload", lazy="select", viewonly=True)
+
+    @classmethod
+    def payload_loading(cls) -> list:
+        """
+        Query options that load the payloads of many calculations at once.
+
+        In the content-addressed storage mode the payloads are joined into
+        the query. Otherwise nothing is joined, and the few rows stored
+        while the mode was on load their payload one by one.
+        """
+        return [joinedload(cls.payload)] if settings.CALCULATION_CONTENT_ADDRESSED else []
+
+    @classmethod
+    def id_criteria(cls, calc_id: uuid.UUID) -> list:
+        """
+        WHERE criteria selecting one calculation by id.
+
+        With month partitioning an id alone would probe every partition. A
+        version 7 id carries its creation time, so the lookup also bounds
+        ``created_at`` around it and PostgreSQL prunes to the partition that
+        holds the row. Other ids, and the other modes, match on id only.
+        """
+        criteria = [cls.id == calc_id]
+        if settings.CALCULATION_PARTITIONING == "month" and calc_id.version == 7:
+            created = uuid7_time(calc_id).replace(tzinfo=None)
+            criteria.append(cls.created_at.between(created - ID_TIME_SLACK, created + ID_TIME_SLACK))
+        return criteria
+
     __mapper_args__ = {
         "polymorphic_on": "type",
         "polymorphic_identity": "calculation",
@@ -236,24 +779,7 @@ class Addition(Calculation):
         [10, -5] -> 10 + (-5) = 5
     """
     __mapper_args__ = {"polymorphic_identity": "addition"}
-
-    def get_result(self) -> float:
-        """
-        Calculate the sum of all input values.
-        
-        Validates inputs and returns the sum using Python's built-in sum() function.
-        
-        Returns:
-            float: The sum of all input values
-            
-        Raises:
-            ValueError: If inputs are not a list or if fewer than 2 numbers provided
-        """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        return sum(self.inputs)
+    scan_kernel = staticmethod(batch.add_scan)
 
 class Subtraction(Calculation):
     """
@@ -265,27 +791,7 @@ class Subtraction(Calculation):
         [100, 50, 25] -> 100 - 50 - 25 = 25
     """
     __mapper_args__ = {"polymorphic_identity": "subtraction"}
-
-    def get_result(self) -> float:
-        """
-        Calculate the result of subtracting subsequent values from the first value.
-        
-        Takes the first number and subtracts all remaining numbers sequentially.
-        
-        Returns:
-            float: The result of the subtraction sequence
-            
-        Raises:
-            ValueError: If inputs are not a list or if fewer than 2 numbers provided
-        """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            result -= value
-        return result
+    scan_kernel = staticmethod(batch.subtract_scan)
 
 class Exponentiation(Calculation):
     """
@@ -294,20 +800,32 @@ class Exponentiation(Calculation):
     """
     __mapper_args__ = {"polymorphic_identity": "exponentiation"}
 
-    def get_result(self) -> float:
+    def estimated_cost(self) -> int:
         """
-        Calculate the result of raising the first input to the power of the second.
-        Returns:
-            float: base ** exponent
-        Raises:
-            ValueError: If inputs are not a list or not exactly two numbers
+        Integer powers are computed exactly, by repeated squaring: one
+        big-integer multiplication per bit of the exponent, each on up to as
+        many digits as the result. Float powers are a single step.
         """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) != 2:
-            raise ValueError("Exponentiation requires exactly two numbers: [base, exponent].")
+        if not isinstance(self.inputs, list) or len(self.inputs) != 2:
+            return super().estimated_cost()
+        base, exponent = self.inputs
+        if not all(isinstance(value, int) and not isinstance(value, bool) for value in (base, exponent)):
+            return super().estimated_cost()
+        digits = math.ceil(max(self.estimated_magnitude() or 0.0, 1.0))
+        return super().estimated_cost() + abs(exponent).bit_length() * digits
+
+    def estimated_magnitude(self) -> Optional[float]:
+        """log10|base ** exponent| = exponent * log10|base|."""
+        if not isinstance(self.inputs, list) or len(self.inputs) != 2:
+            return None
         base, exponent = self.inputs
-        return base ** exponent
+        magnitude = _log10_abs(base)
+        if magnitude is None or isinstance(exponent, bool) or not isinstance(exponent, (int, float)):
+            return None
+        try:
+            return float(exponent) * magnitude
+        except OverflowError:
+            return math.inf
 
 class Multiplication(Calculation):
     """
@@ -319,25 +837,19 @@ class Multiplication(Calculation):
         [10, 0.5] -> 10 * 0.5 = 5
     """
     __mapper_args__ = {"polymorphic_identity": "multiplication"}
+    scan_kernel = staticmethod(batch.multiply_scan)
 
-    def get_result(self) -> float:
-        """
-        Calculate the product of all input values.
-        
-        Returns:
-            float: The product of all input values
-            
-        Raises:
-            ValueError: If inputs are not a list or if fewer than 2 numbers provided
-        """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        result = 1
+    def estimated_magnitude(self) -> Optional[float]:
+        """log10|product| = sum of log10|x|; unknown when any factor is zero."""
+        if not isinstance(self.inputs, list) or len(self.inputs) < 2:
+            return None
+        total = 0.0
         for value in self.inputs:
-            result *= value
-        return result
+            magnitude = _log10_abs(value)
+            if magnitude is None:
+                return None
+            total += magnitude
+        return total
 
 class Division(Calculation):
     """
@@ -352,28 +864,41 @@ class Division(Calculation):
         - Division by zero raises a ValueError
     """
     __mapper_args__ = {"polymorphic_identity": "division"}
+    scan_kernel = staticmethod(batch.divide_scan)
 
-    def get_result(self) -> float:
+    def estimated_magnitude(self) -> Optional[float]:
+        """log10|quotient| = log10|x0| - sum of log10|xi|; unknown with zeros."""
+        if not isinstance(self.inputs, list) or len(self.inputs) < 2:
+            return None
+        total = _log10_abs(self.inputs[0])
+        if total is None:
+            return None
+        for value in self.inputs[1:]:
+            magnitude = _log10_abs(value)
+            if magnitude is None:
+                return None
+            total -= magnitude
+        return total
+
+class Expression(Calculation):
+    """
+    Expression calculation subclass.
+
+    Evaluates an arithmetic formula over the inputs instead of a single
+    operation. Operands are bound by name in order of first appearance, or
+    referenced by position.
+    Examples:
+        "(a + b) / c ** 2" with [1, 2, 3] -> (1 + 2) / 3 ** 2 = 0.333...
+        "x[1] - x[0]" with [10, 4] -> 4 - 10 = -6
+
+    The expression is compiled once into a plan that is cached by its text,
+    so repeated formulas skip parsing.
+    """
+    __mapper_args__ = {"polymorphic_identity": "expression"}
+
+    def estimated_cost(self) -> int:
         """
-        Calculate the result of dividing the first value by all subsequent values.
-        
-        Takes the first number and divides by all remaining numbers sequentially.
-        Includes validation to prevent division by zero.
-        
-        Returns:
-            float: The result of the division sequence
-            
-        Raises:
-            ValueError: If inputs are not a list, if fewer than 2 numbers provided,
-                        or if attempting to divide by zero
+        Operands plus the length of the expression, which bounds the size of
+        its syntax tree. Nothing is compiled to estimate it.
         """
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            if value == 0:
-                raise ValueError("Cannot divide by zero.")
-            result /= value
-        return result
+        return super().estimated_cost() + len(self.expression or "")
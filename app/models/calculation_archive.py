@@ -0,0 +1,98 @@
+# app/models/calculation_archive.py
+"""
+Calculation Archive Model Module
+
+Calculations older than ``CALCULATION_ARCHIVE_AFTER_DAYS`` are moved out of
+``calculations`` by ``python -m app.archive`` into ``calculations_archive``,
+which keeps one row per calculation:
+
+- ``id``, ``user_id``, ``type``, ``operand_count`` and ``created_at`` stay
+  plain columns, so lookups, pages and the report rollup can filter and
+  aggregate on them.
+- Everything else (inputs, attributes, result and ``updated_at``) is stored
+  as one zlib-compressed JSON document in ``payload``.
+
+The hot table and its indexes then only hold recent calculations, which is
+what almost every request reads. Archived calculations stay readable:
+``to_calculation()`` turns a row back into a detached calculation of the
+right type that the API serializes like any other. They are read-only;
+they can be deleted, but not updated.
+"""
+
+import json
+import zlib
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, LargeBinary, String, text
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+from app.models.calculation import Calculation
+
+# Columns that live in the compressed payload
+PAYLOAD_FIELDS = ("inputs", "expression", "operation", "result", "result_array")
+
+
+class ArchivedCalculation(Base):
+    """
+    One archived calculation.
+    """
+
+    __tablename__ = "calculations_archive"
+    __table_args__ = (
+        # Keyset pages of a user's archived history, like the hot table's index
+        Index('ix_calculations_archive_user_created_id', 'user_id', text('created_at DESC'), 'id'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+
+    user_id = Column(UUID(as_uuid=True),
+                     ForeignKey('users.id', ondelete='CASCADE'),
+                     nullable=False)
+
+    type = Column(String(50), nullable=False)
+
+    operand_count = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime, nullable=False)
+
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed JSON
+
+    def __repr__(self):
+        return f"<ArchivedCalculation(id={self.id}, type={self.type})>"
+
+    @staticmethod
+    def encode_payload(calculation: Calculation) -> bytes:
+        """Compress the columns of a calculation that are not kept as plain columns."""
+        document = {name: getattr(calculation, name) for name in PAYLOAD_FIELDS}
+        document["updated_at"] = calculation.updated_at.isoformat()
+        return zlib.compress(json.dumps(document, separators=(",", ":")).encode(), 9)
+
+    @classmethod
+    def from_calculation(cls, calculation: Calculation) -> dict:
+        """Column values that archive a calculation, for a bulk INSERT."""
+        return {
+            "id": calculation.id,
+            "user_id": calculation.user_id,
+            "type": calculation.type,
+            "operand_count": calculation.count_operands(),
+            "created_at": calculation.created_at,
+            "payload": cls.encode_payload(calculation),
+        }
+
+    def to_calculation(self) -> Calculation:
+        """
+        The archived calculation as a detached instance of its type.
+
+        The instance is never added to a session; it only serves reads.
+        """
+        document = json.loads(zlib.decompress(self.payload))
+        calculation = Calculation.create(
+            self.type, self.user_id, document["inputs"],
+            expression=document["expression"], operation=document["operation"],
+        )
+        calculation.id = self.id
+        calculation.result = document["result"]
+        calculation.result_array = document["result_array"]
+        calculation.created_at = self.created_at
+        calculation.updated_at = datetime.fromisoformat(document["updated_at"])
+        return calculation
@@ -0,0 +1,215 @@
+# app/models/calculation_dependency.py
+"""
+Calculation Dependency Model Module
+
+This module lets one calculation use another calculation's result as an
+operand. Each edge says "operand ``position`` of ``calculation_id`` is the
+result of ``source_id``". Together the edges form a directed acyclic graph
+over a user's calculations.
+
+A linked calculation still stores plain numbers in ``inputs``: the upstream
+results are copied in when the calculation is evaluated. Every other code
+path (batch evaluation, the report, pagination) keeps working on numbers.
+The edges are only needed when an upstream calculation changes. In that
+case ``propagate()`` recomputes the affected downstream calculations in
+topological order and stops at any node whose value did not change.
+
+Deleting a calculation removes its edges. Calculations that used its result
+keep the last value they saw. The foreign keys to ``calculations`` cascade
+these deletes, except when ``calculations`` is partitioned: PostgreSQL can
+only reference a partitioned table through a unique key that includes the
+partition key, so the constraints are skipped and ``unlink()`` and
+``delete_orphans()`` remove the edges instead.
+"""
+
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, List, Mapping, Set
+
+from sqlalchemy import Column, ForeignKeyConstraint, Integer, delete, or_, select
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.config import settings
+from app.core.evaluation import evaluate
+from app.database import Base
+from app.models.calculation import Calculation
+
+
+def topological_order(dependencies: Mapping[Hashable, Iterable[Hashable]]) -> List[Hashable]:
+    """
+    Order nodes so that every node comes after the nodes it depends on.
+
+    Args:
+        dependencies: Maps each node to the nodes it depends on. Every
+            dependency must itself be a key.
+
+    Returns:
+        list: The nodes in evaluation order (Kahn's algorithm, stable with
+        respect to the mapping's order)
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    remaining = {node: len(set(parents)) for node, parents in dependencies.items()}
+    children = defaultdict(list)
+    for node, parents in dependencies.items():
+        for parent in set(parents):
+            children[parent].append(node)
+
+    ready = deque(node for node, count in remaining.items() if count == 0)
+    order = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for child in children[node]:
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                ready.append(child)
+    if len(order) != len(remaining):
+        raise ValueError("Calculation graph contains a cycle.")
+    return order
+
+
+def _calculations_unpartitioned(ddl, target, bind, **kw) -> bool:
+    """DDL condition for the foreign keys to ``calculations``."""
+    return settings.CALCULATION_PARTITIONING == "none"
+
+
+class CalculationDependency(Base):
+    """
+    One operand of a calculation that is linked to another calculation's result.
+    """
+
+    __tablename__ = "calculation_dependencies"
+    __table_args__ = (
+        ForeignKeyConstraint(['calculation_id'], ['calculations.id'], ondelete='CASCADE')
+        .ddl_if(callable_=_calculations_unpartitioned),
+        ForeignKeyConstraint(['source_id'], ['calculations.id'], ondelete='CASCADE')
+        .ddl_if(callable_=_calculations_unpartitioned),
+    )
+
+    calculation_id = Column(UUID(as_uuid=True), primary_key=True)
+
+    position = Column(Integer, primary_key=True)  # index into inputs
+
+    source_id = Column(UUID(as_uuid=True),
+                       nullable=False,
+                       index=True)  # Index for finding downstream calculations
+
+    def __repr__(self):
+        return (f"<CalculationDependency(calculation_id={self.calculation_id}, "
+                f"position={self.position}, source_id={self.source_id})>")
+
+    @classmethod
+    def _downstream_edges(cls, db, calculation_id) -> list:
+        """
+        All edges reachable from a calculation, found with one recursive query.
+
+        UNION (rather than UNION ALL) discards rows already seen, so the
+        query terminates even if the stored graph were to contain a cycle.
+        """
+        reachable = (
+            select(cls.calculation_id, cls.position, cls.source_id)
+            .where(cls.source_id == calculation_id)
+            .cte("reachable", recursive=True)
+        )
+        reachable = reachable.union(
+            select(cls.calculation_id, cls.position, cls.source_id)
+            .join(reachable, cls.source_id == reachable.c.calculation_id)
+        )
+        return db.execute(select(reachable)).all()
+
+    @classmethod
+    def downstream_ids(cls, db, calculation_id) -> Set:
+        """IDs of every calculation that depends, directly or not, on this one."""
+        return {edge.calculation_id for edge in cls._downstream_edges(db, calculation_id)}
+
+    @classmethod
+    def link(cls, db, calculation: Calculation, sources: Dict[int, object], replace: bool = True) -> None:
+        """
+        Set a calculation's links to ``{position: source_id}``.
+
+        The calculation must already be flushed so that it has an id. Pass
+        ``replace=False`` for new calculations, which have no links to drop.
+        """
+        if replace:
+            db.query(cls).filter(cls.calculation_id == calculation.id).delete(synchronize_session=False)
+        db.add_all(
+            cls(calculation_id=calculation.id, position=position, source_id=source_id)
+            for position, source_id in sources.items()
+        )
+
+    @classmethod
+    def unlink(cls, db, calculation_id) -> None:
+        """Remove every edge into or out of a calculation that is being deleted."""
+        db.execute(delete(cls).where(
+            or_(cls.calculation_id == calculation_id, cls.source_id == calculation_id)
+        ))
+
+    @classmethod
+    def delete_orphans(cls, db) -> int:
+        """
+        Remove edges whose calculation or source no longer exists.
+
+        Only needed when ``calculations`` is partitioned and the foreign keys
+        cannot cascade, e.g. after a partition was dropped or a user deleted.
+
+        Returns:
+            int: Number of edges removed
+        """
+        calculation_exists = select(Calculation.id).where(Calculation.id == cls.calculation_id).exists()
+        source_exists = select(Calculation.id).where(Calculation.id == cls.source_id).exists()
+        result = db.execute(delete(cls).where(or_(~calculation_exists, ~source_exists)))
+        return result.rowcount
+
+    @classmethod
+    def propagate(cls, db, calculation: Calculation) -> List[Calculation]:
+        """
+        Recompute the calculations downstream of one whose result changed.
+
+        The affected subgraph is loaded with one recursive query and walked
+        in topological order. A calculation is recomputed only if one of its
+        linked operands actually changed; if its own result comes out the
+        same, nothing below it is touched.
+
+        Returns:
+            list: The calculations that were recomputed
+
+        Raises:
+            ValueError: If a downstream calculation no longer evaluates
+                (e.g. it now divides by zero); the caller should roll back
+        """
+        edges = cls._downstream_edges(db, calculation.id)
+        if not edges:
+            return []
+
+        incoming = defaultdict(list)  # calculation id -> [(position, source id)]
+        for edge in edges:
+            incoming[edge.calculation_id].append((edge.position, edge.source_id))
+        affected = {
+            calc.id: calc
+            for calc in db.query(Calculation).options(*Calculation.payload_loading())
+            .filter(Calculation.id.in_(list(incoming)))
+        }
+        order = topological_order({
+            calc_id: [source for _, source in links if source in incoming]
+            for calc_id, links in incoming.items()
+        })
+
+        changed = {calculation.id: calculation.value}
+        recomputed = []
+        for calc_id in order:
+            node = affected[calc_id]
+            inputs = list(node.inputs)
+            for position, source_id in incoming[calc_id]:
+                if source_id in changed and position < len(inputs):
+                    inputs[position] = changed[source_id]
+            if inputs == node.inputs:
+                continue
+            previous = node.value
+            node.inputs = inputs
+            node.set_result(evaluate(node))
+            node.updated_at = datetime.utcnow()
+            recomputed.append(node)
+            if node.value != previous:
+                changed[calc_id] = node.value
+        return recomputed
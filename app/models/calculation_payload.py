@@ -0,0 +1,248 @@
+# app/models/calculation_payload.py
+"""
+Calculation Payload Model Module
+
+With ``CALCULATION_CONTENT_ADDRESSED`` enabled, the operands, attributes and
+result of a calculation are stored once per distinct content in
+``calculation_payloads``, keyed by ``content_hash()``: a SHA-256 digest of
+the type, the expression and operation attributes, and the inputs. Many
+users submit the same calculations, so most new rows then add only their
+owner, timestamps, type, operand count and a 32-byte ``payload_hash`` to
+``calculations``.
+
+The result is not part of the key. It follows from the rest, so a stored
+payload also answers the question "has this exact calculation been
+evaluated before?". ``stored_results()`` looks up the hashes of new
+calculations, and a hit skips evaluation entirely. This works like
+``result_cache``, but the payloads are shared by every process and survive
+restarts.
+
+The models keep working on plain attributes:
+- The ``load`` and ``refresh`` events copy the payload's columns onto the
+  instance as committed values. The payload is loaded by primary key, or
+  joined into queries that use ``Calculation.payload_loading()``.
+- The ``before_insert`` and ``before_update`` events move changed content
+  into a payload and leave only the hash on the row.
+- The ``after_insert`` and ``after_update`` events put the values back on
+  the instance.
+Bulk inserts that bypass the unit of work use ``split_rows()``. When the
+setting is off, changed content is written inline again and the hash is
+cleared. Rows of both kinds can coexist.
+
+Deleting calculations leaves their payloads behind. ``delete_unreferenced()``
+removes payloads that no calculation uses any more. Writers store payloads
+with ``INSERT ... ON CONFLICT DO UPDATE``, which locks an existing payload
+row until their calculation is committed, and the garbage collector skips
+locked rows, so it never deletes a payload that is about to be referenced.
+"""
+
+import hashlib
+import json
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Float, JSON, LargeBinary, String, Text, event, inspect, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm.attributes import flag_modified, set_committed_value
+from app.core.config import settings
+from app.database import Base
+from app.models.calculation import Calculation
+
+# Calculation columns that move into the payload
+PAYLOAD_COLUMNS = (
+    "inputs_json", "inputs_array", "inputs_packed", "expression", "operation", "result", "result_array",
+)
+
+
+def _as_floats(value):
+    if isinstance(value, list):
+        return [_as_floats(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _as_floats(item) for key, item in value.items()}
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def content_hash(calculation_type: str, inputs, expression=None, operation=None) -> bytes:
+    """
+    Key of a calculation's content.
+
+    Flat numeric inputs are hashed as packed float64 values, like the
+    result cache keys them, so ``[1, 2]`` and ``[1.0, 2.0]`` share a payload.
+    Other inputs (vectors, matrices, sweeps) are hashed as compact JSON,
+    with integers written as floats for the same reason.
+    """
+    digest = hashlib.sha256(json.dumps([calculation_type.lower(), expression, operation]).encode())
+    try:
+        encoded = b"d" + array('d', inputs).tobytes()
+    except TypeError:
+        encoded = b"j" + json.dumps(_as_floats(inputs), separators=(",", ":"), sort_keys=True).encode()
+    digest.update(encoded)
+    return digest.digest()
+
+
+class CalculationPayload(Base):
+    """
+    The content of one or more identical calculations.
+    """
+
+    __tablename__ = "calculation_payloads"
+
+    hash = Column(LargeBinary, primary_key=True)  # content_hash() of the columns below
+
+    type = Column(String(50), nullable=False)
+
+    inputs_json = Column("inputs", JSON(none_as_null=True), nullable=True)
+
+    inputs_array = Column(ARRAY(Float), nullable=True)
+
+    inputs_packed = Column(LargeBinary, nullable=True)
+
+    expression = Column(Text, nullable=True)
+
+    operation = Column(String(50), nullable=True)
+
+    result = Column(Float, nullable=True)
+
+    result_array = Column(ARRAY(Float), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<CalculationPayload(hash={self.hash.hex()[:12]}, type={self.type})>"
+
+    @staticmethod
+    def key_of(calculation: Calculation) -> bytes:
+        return content_hash(calculation.type, calculation.inputs, calculation.expression, calculation.operation)
+
+    def fill(self, calculation: Calculation) -> None:
+        """Copy the payload onto a loaded calculation without marking it changed."""
+        for name in PAYLOAD_COLUMNS:
+            set_committed_value(calculation, name, getattr(self, name))
+
+    @classmethod
+    def store(cls, connection, rows: Iterable[dict]) -> None:
+        """
+        Insert payload rows whose hash is not stored yet, with one statement.
+
+        Payloads that already exist are locked until the transaction ends,
+        by a no-op update of their hash, so ``delete_unreferenced()`` cannot
+        remove them before the calculations that reference them are stored.
+        """
+        unique = list({row["hash"]: row for row in rows}.values())
+        if unique:
+            # A Core statement, so rows are keyed by column rather than attribute
+            columns = {prop.key: prop.columns[0].key for prop in cls.__mapper__.column_attrs}
+            statement = insert(cls.__table__)
+            connection.execute(
+                statement.on_conflict_do_update(index_elements=["hash"], set_={"hash": statement.excluded.hash}),
+                [{"created_at": datetime.utcnow(), **{columns[name]: value for name, value in row.items()}}
+                 for row in unique],
+            )
+
+    @classmethod
+    def stored_results(cls, db, keys: Iterable[bytes]) -> Dict[bytes, object]:
+        """
+        Results of the payloads that are already stored, by hash.
+
+        Values are numbers, or lists for vector and matrix results.
+        """
+        keys = list(set(keys))
+        if not keys:
+            return {}
+        rows = db.execute(select(cls.hash, cls.result, cls.result_array).where(cls.hash.in_(keys)))
+        return {key: result if result_array is None else result_array for key, result, result_array in rows}
+
+    @classmethod
+    def split_rows(cls, db, rows: List[dict]) -> Tuple[List[dict], List[dict]]:
+        """
+        Move the content of calculation rows for a bulk INSERT into payloads.
+
+        Returns:
+            tuple: The rows to insert, which reference their payload by
+            ``payload_hash``, and the removed content of each row, to put
+            back on the inserted calculations with ``fill_values()``
+        """
+        payloads, slim, contents = [], [], []
+        for row in rows:
+            content = {name: row.get(name) for name in PAYLOAD_COLUMNS}
+            inputs = Calculation.decode_inputs(content["inputs_json"], content["inputs_array"], content["inputs_packed"])
+            key = content_hash(row["type"], inputs, content["expression"], content["operation"])
+            payloads.append({"hash": key, "type": row["type"], **content})
+            slim.append({**row, **dict.fromkeys(PAYLOAD_COLUMNS), "payload_hash": key})
+            contents.append(content)
+        cls.store(db.connection(), payloads)
+        return slim, contents
+
+    @staticmethod
+    def fill_values(calculation: Calculation, content: dict) -> None:
+        for name, value in content.items():
+            set_committed_value(calculation, name, value)
+
+    @classmethod
+    def delete_unreferenced(cls, db, min_age: timedelta = timedelta(hours=1)) -> int:
+        """
+        Delete payloads that no calculation references.
+
+        Payloads locked by a writer that is storing a calculation with the
+        same content are skipped, and so are payloads younger than
+        ``min_age``.
+
+        Returns:
+            int: Number of payloads deleted
+        """
+        referenced = select(Calculation.payload_hash).where(Calculation.payload_hash == cls.hash).exists()
+        unreferenced = (
+            select(cls.hash)
+            .where(~referenced, cls.created_at < datetime.utcnow() - min_age)
+            .with_for_update(skip_locked=True)
+        )
+        result = db.execute(cls.__table__.delete().where(cls.hash.in_(unreferenced)))
+        return result.rowcount
+
+
+def _content_changed(calculation: Calculation) -> bool:
+    state = inspect(calculation)
+    return state.pending or any(state.attrs[name].history.has_changes() for name in PAYLOAD_COLUMNS)
+
+
+@event.listens_for(Calculation, "load", propagate=True)
+def _fill_on_load(calculation, context):
+    if calculation.payload_hash is not None:
+        calculation.payload.fill(calculation)
+
+
+@event.listens_for(Calculation, "refresh", propagate=True)
+def _fill_on_refresh(calculation, context, attrs):
+    _fill_on_load(calculation, context)
+
+
+@event.listens_for(Calculation, "before_insert", propagate=True)
+@event.listens_for(Calculation, "before_update", propagate=True)
+def _move_content(mapper, connection, calculation):
+    if not _content_changed(calculation):
+        return
+    if not settings.CALCULATION_CONTENT_ADDRESSED:
+        if calculation.payload_hash is not None:
+            # Write the content inline again, including unchanged columns
+            calculation.payload_hash = None
+            for name in PAYLOAD_COLUMNS:
+                flag_modified(calculation, name)
+        return
+    content = {name: getattr(calculation, name) for name in PAYLOAD_COLUMNS}
+    key = CalculationPayload.key_of(calculation)
+    CalculationPayload.store(connection, [{"hash": key, "type": calculation.type, **content}])
+    calculation.payload_hash = key
+    for name in PAYLOAD_COLUMNS:
+        setattr(calculation, name, None)
+    calculation.__dict__["_payload_content"] = content
+
+
+@event.listens_for(Calculation, "after_insert", propagate=True)
+@event.listens_for(Calculation, "after_update", propagate=True)
+def _restore_content(mapper, connection, calculation):
+    content = calculation.__dict__.pop("_payload_content", None)
+    if content is not None:
+        CalculationPayload.fill_values(calculation, content)
@@ -0,0 +1,227 @@
+# app/models/calculation_stats.py
+"""
+Calculation Statistics Model Module
+
+This module defines a per-user rollup of calculation usage. One row per user
+holds the running totals that the /calculations/report endpoint needs:
+
+- total number of calculations
+- sum of operand counts (for the average)
+- per-type counters (for the most common type)
+- timestamp of the most recent calculation
+
+The row is updated in the same transaction as every calculation create,
+update and delete, so the report can be answered with a single primary-key
+lookup instead of scanning the user's calculations.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey, JSON, func, literal, select, text
+from sqlalchemy.dialects.postgresql import UUID, insert
+from app.database import Base
+from app.models.calculation import Calculation
+from app.models.calculation_archive import ArchivedCalculation
+from app.models.user import User
+
+
+class UserCalculationStats(Base):
+    """
+    Incrementally maintained calculation statistics for a single user.
+
+    Writers lock the row with SELECT ... FOR UPDATE before changing it, so
+    concurrent requests from the same user cannot lose updates.
+    """
+
+    __tablename__ = "user_calculation_stats"
+
+    user_id = Column(UUID(as_uuid=True),
+                     ForeignKey('users.id', ondelete='CASCADE'),
+                     primary_key=True)
+
+    total_count = Column(Integer, nullable=False, default=0)
+
+    operand_sum = Column(BigInteger, nullable=False, default=0)
+
+    type_counts = Column(JSON, nullable=False, default=dict)  # {"addition": 3, ...}
+
+    last_calculation_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<UserCalculationStats(user_id={self.user_id}, total_count={self.total_count})>"
+
+    @property
+    def average_operands(self) -> float:
+        """Average number of operands per calculation (0.0 when empty)."""
+        if not self.total_count:
+            return 0.0
+        return self.operand_sum / self.total_count
+
+    @property
+    def most_common_type(self) -> Optional[str]:
+        """The calculation type with the highest counter, or None when empty."""
+        if not self.type_counts:
+            return None
+        return max(self.type_counts.items(), key=lambda item: item[1])[0]
+
+    @classmethod
+    def _locked(cls, db, user_id) -> "UserCalculationStats":
+        """
+        Fetch the user's stats row with a row lock, creating it if missing.
+
+        The insert uses ON CONFLICT DO NOTHING so two first writes for the
+        same user cannot fail on the primary key.
+        """
+        db.execute(
+            insert(cls.__table__)
+            .values(user_id=user_id, total_count=0, operand_sum=0, type_counts={})
+            .on_conflict_do_nothing(index_elements=['user_id'])
+        )
+        return db.query(cls).filter(cls.user_id == user_id).with_for_update().populate_existing().one()
+
+    def _bump_type(self, calculation_type: str, delta: int) -> None:
+        counts = dict(self.type_counts or {})
+        counts[calculation_type] = counts.get(calculation_type, 0) + delta
+        if counts[calculation_type] <= 0:
+            del counts[calculation_type]
+        # Reassign so SQLAlchemy detects the change to the JSON column
+        self.type_counts = counts
+
+    @classmethod
+    def record_create(cls, db, calculation: Calculation) -> "UserCalculationStats":
+        """
+        Account for a newly created calculation.
+
+        Must be called after the calculation has been flushed so that
+        ``created_at`` is populated.
+        """
+        return cls.record_many(db, calculation.user_id, [calculation])
+
+    @classmethod
+    def record_many(cls, db, user_id, calculations: List[Calculation]) -> "UserCalculationStats":
+        """
+        Account for several newly created calculations owned by one user.
+
+        The stats row is locked once for the whole group, which keeps batch
+        inserts to a single extra round trip.
+        """
+        stats = cls._locked(db, user_id)
+        for calculation in calculations:
+            stats.total_count += 1
+            stats.operand_sum += calculation.count_operands()
+            stats._bump_type(calculation.type, 1)
+            if stats.last_calculation_at is None or calculation.created_at > stats.last_calculation_at:
+                stats.last_calculation_at = calculation.created_at
+        return stats
+
+    @classmethod
+    def record_update(cls, db, calculation: Calculation, old_operand_count: int) -> "UserCalculationStats":
+        """
+        Account for a change to a calculation's inputs.
+
+        Only the operand sum changes; the type and creation time of a
+        calculation are immutable.
+        """
+        stats = cls._locked(db, calculation.user_id)
+        stats.operand_sum += calculation.count_operands() - old_operand_count
+        return stats
+
+    @classmethod
+    def record_delete(cls, db, calculation: Calculation) -> "UserCalculationStats":
+        """
+        Account for a deleted calculation.
+
+        Must be called after the delete has been flushed. If the newest
+        calculation was removed, the last timestamp is re-read from the
+        ``(user_id, created_at DESC, id)`` index, or from the archive once no
+        recent calculations are left.
+        """
+        stats = cls._locked(db, calculation.user_id)
+        stats.total_count = max(stats.total_count - 1, 0)
+        stats.operand_sum = max(stats.operand_sum - calculation.count_operands(), 0)
+        stats._bump_type(calculation.type, -1)
+        if stats.last_calculation_at is not None and calculation.created_at >= stats.last_calculation_at:
+            stats.last_calculation_at = db.query(func.max(Calculation.created_at)).filter(
+                Calculation.user_id == calculation.user_id
+            ).scalar() or db.query(func.max(ArchivedCalculation.created_at)).filter(
+                ArchivedCalculation.user_id == calculation.user_id
+            ).scalar()
+        return stats
+
+    @classmethod
+    def rebuild(cls, db, user_ids: Optional[Iterable] = None) -> int:
+        """
+        Recompute stats from the calculations table and the archive.
+
+        Used to backfill the rollup when the table is first created, or to
+        repair it; it is not routine maintenance. Writers must not change a
+        row between the aggregate and the overwrite, so the rows are locked
+        first and the aggregate runs afterwards, in a fresh snapshot:
+
+        - With ``user_ids``, only those users are recomputed, under the same
+          row locks that writers take. Their aggregates read through the
+          ``(user_id, created_at DESC, id)`` indexes.
+        - Without, every row is rebuilt under a table lock that holds off
+          all writers until the transaction ends.
+
+        Returns:
+            int: Number of users with statistics
+        """
+        if user_ids is None:
+            db.execute(text(f"LOCK TABLE {cls.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+        else:
+            user_ids = list(set(user_ids))
+            if not user_ids:
+                return 0
+            # Create missing rows for users that still exist, then lock them all in key order
+            db.execute(
+                insert(cls.__table__)
+                .from_select(
+                    ["user_id", "total_count", "operand_sum", "type_counts"],
+                    select(User.id, literal(0), literal(0), literal({}, JSON)).where(User.id.in_(user_ids)),
+                )
+                .on_conflict_do_nothing(index_elements=['user_id'])
+            )
+            locked = db.query(cls).filter(cls.user_id.in_(user_ids)).order_by(cls.user_id) \
+                .with_for_update().populate_existing().all()
+
+        def scoped(query, model):
+            return query if user_ids is None else query.filter(model.user_id.in_(user_ids))
+
+        rows = scoped(db.query(
+            Calculation.user_id,
+            Calculation.type,
+            func.count(Calculation.id),
+            # Rows written before operand_count existed fall back to the JSON length
+            func.sum(func.coalesce(Calculation.operand_count, func.json_array_length(Calculation.inputs_json))),
+            func.max(Calculation.created_at),
+        ), Calculation).group_by(Calculation.user_id, Calculation.type).all()
+        # Archived calculations still count towards the report
+        rows += scoped(db.query(
+            ArchivedCalculation.user_id,
+            ArchivedCalculation.type,
+            func.count(ArchivedCalculation.id),
+            func.sum(ArchivedCalculation.operand_count),
+            func.max(ArchivedCalculation.created_at),
+        ), ArchivedCalculation).group_by(ArchivedCalculation.user_id, ArchivedCalculation.type).all()
+
+        totals: Dict = defaultdict(lambda: {
+            "total_count": 0, "operand_sum": 0, "type_counts": {}, "last_calculation_at": None
+        })
+        for user_id, calculation_type, count, operand_sum, last_at in rows:
+            entry = totals[user_id]
+            entry["total_count"] += count
+            entry["operand_sum"] += int(operand_sum or 0)
+            entry["type_counts"][calculation_type] = entry["type_counts"].get(calculation_type, 0) + count
+            if entry["last_calculation_at"] is None or last_at > entry["last_calculation_at"]:
+                entry["last_calculation_at"] = last_at
+
+        if user_ids is None:
+            db.query(cls).delete(synchronize_session=False)
+            db.add_all(cls(user_id=user_id, **entry) for user_id, entry in totals.items())
+        else:
+            for stats in locked:
+                for name, value in totals[stats.user_id].items():
+                    setattr(stats, name, value)
+        return len(totals)
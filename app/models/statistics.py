@@ -0,0 +1,93 @@
+# app/models/statistics.py
+"""
+Statistical Calculation Models Module
+
+This module adds calculation types that summarize a whole vector of
+operands, such as a batch of sensor readings, in one step:
+
+- mean, median
+- variance and stddev (sample statistics, n - 1 in the denominator)
+- min and max
+- percentile: ``[q, value, value, ...]`` where ``q`` is between 0 and 100
+
+They are ordinary single-table ``Calculation`` subclasses, so they are
+created with ``Calculation.create`` and stored, listed and reported like the
+arithmetic types. The work is done by NumPy on a float64 array instead of a
+Python loop, in the functions of ``app.operations.catalog``, and these
+types accept far longer operand lists (``CALCULATION_STATISTICS_MAX_OPERANDS``)
+than the arithmetic ones.
+"""
+
+from app.core.config import settings
+from app.models.calculation import Calculation
+
+
+class StatisticMixin:
+    """
+    Shared behaviour of the NumPy-backed statistical calculation types.
+    """
+    @classmethod
+    def operand_limit(cls) -> int:
+        """Statistical types accept much longer operand lists than arithmetic ones."""
+        return settings.CALCULATION_STATISTICS_MAX_OPERANDS
+
+
+class Mean(StatisticMixin, Calculation):
+    """
+    Arithmetic mean of the inputs.
+    Example: [2, 4, 9] -> 5
+    """
+    __mapper_args__ = {"polymorphic_identity": "mean"}
+
+
+class Median(StatisticMixin, Calculation):
+    """
+    Median of the inputs; the average of the middle two for an even count.
+    Example: [7, 1, 3, 5] -> 4
+    """
+    __mapper_args__ = {"polymorphic_identity": "median"}
+
+
+class Variance(StatisticMixin, Calculation):
+    """
+    Sample variance of the inputs (divides by n - 1).
+    Example: [2, 4, 4, 4, 5, 5, 7, 9] -> 4.571...
+    """
+    __mapper_args__ = {"polymorphic_identity": "variance"}
+
+
+class StandardDeviation(StatisticMixin, Calculation):
+    """
+    Sample standard deviation of the inputs (divides by n - 1).
+    Example: [2, 4, 4, 4, 5, 5, 7, 9] -> 2.138...
+    """
+    __mapper_args__ = {"polymorphic_identity": "stddev"}
+
+
+class Minimum(StatisticMixin, Calculation):
+    """
+    Smallest input.
+    Example: [3, -1, 2] -> -1
+    """
+    __mapper_args__ = {"polymorphic_identity": "min"}
+
+
+class Maximum(StatisticMixin, Calculation):
+    """
+    Largest input.
+    Example: [3, -1, 2] -> 3
+    """
+    __mapper_args__ = {"polymorphic_identity": "max"}
+
+
+class Percentile(StatisticMixin, Calculation):
+    """
+    Percentile of the values, with linear interpolation between data points.
+
+    The first input is the percentile to compute (0-100) and the rest are
+    the data.
+    Examples:
+        [50, 1, 2, 3, 4] -> 2.5 (the median)
+        [90, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10] -> 9.1
+    """
+    __mapper_args__ = {"polymorphic_identity": "percentile"}
@@ -0,0 +1,71 @@
+# app/models/sweep.py
+"""
+Sweep Calculation Model Module
+
+A sweep evaluates one calculation type at many points, varying a single
+operand while the others stay fixed: ``2 ** x`` for x in 0..10,000, or one
+dividend over a range of divisors. It replaces one calculation per point
+with one evaluation and, optionally, one stored row.
+
+Exactly one input of a sweep is a list, the values of the varying operand;
+the other inputs are the fixed operands of ``operation``, in place:
+
+    operation "exponentiation", inputs [2, [0, 1, 2, 3]] -> [1, 2, 4, 8]
+
+Every point follows the semantics of the swept type. The sweep itself is
+``app.operations.catalog``'s "sweep" entry: types with a batch kernel are
+evaluated in one vectorized pass over a points x operands matrix, and any
+point the kernel cannot represent, and every point of a type without a
+kernel, is evaluated with the type's catalog function, so errors read
+exactly as they would for a single calculation. The first failing point
+fails the whole sweep. The results are a vector, stored in
+``result_array``. This model adds the sweep's cost limits.
+"""
+
+from app.core.config import settings
+from app.models.calculation import Calculation
+from app.operations.catalog import sweep_position
+
+
+class Sweep(Calculation):
+    """
+    One operation evaluated across the values of a varying operand.
+    Example (operation "division"): [[1, 2, 4], 8] -> [0.125, 0.25, 0.5]
+    """
+    __mapper_args__ = {"polymorphic_identity": "sweep"}
+
+    def varying_position(self) -> int:
+        """
+        Index of the input that holds the values to sweep.
+
+        Raises:
+            ValueError: If there is not exactly one such input
+        """
+        return sweep_position(self.inputs)
+
+    def point_count(self) -> int:
+        """Number of values to sweep, counted without validating the inputs."""
+        if not isinstance(self.inputs, list):
+            return 0
+        return sum(len(operand) for operand in self.inputs if isinstance(operand, list))
+
+    def estimated_cost(self) -> int:
+        """A sweep costs one step per operand per point."""
+        if not isinstance(self.inputs, list):
+            return 0
+        return max(self.point_count(), 1) * len(self.inputs)
+
+    def check_cost(self) -> None:
+        """
+        Reject sweeps with too many points or too large a points x operands matrix.
+
+        Raises:
+            ValueError: If a sweep limit or the operand limit is exceeded
+        """
+        super().check_cost()
+        limit = settings.CALCULATION_SWEEP_MAX_POINTS
+        if self.point_count() > limit:
+            raise ValueError(f"Too many points: a sweep may evaluate at most {limit} values.")
+        limit = settings.CALCULATION_ARRAY_MAX_ELEMENTS
+        if self.estimated_cost() > limit:
+            raise ValueError(f"Too many elements: points x operands may be at most {limit}.")
@@ -21,6 +21,7 @@ from sqlalchemy import Column, String, Boolean, DateTime, or_
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.core.config import get_settings
+from app.core.ids import uuid7
 from app.database import Base
 from app.models.calculation import Calculation
 
@@ -56,10 +57,8 @@ class User(Base):
     
     # Primary key and identifying fields
     id = Column(PG_UUID(as_uuid=True), 
-                primary_key=True, 
-                default=uuid.uuid4,  # Auto-generate UUIDs
-                unique=True, 
-                index=True)          # Index for faster lookups
+                primary_key=True,    # The primary key index serves lookups by id
+                default=uuid7)       # Auto-generate time-ordered UUIDs
     
     username = Column(String(50), 
                       unique=True,    # Prevent duplicate usernames 
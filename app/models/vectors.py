@@ -0,0 +1,107 @@
+# app/models/vectors.py
+"""
+Vector and Matrix Calculation Models Module
+
+This module adds calculation types whose operands are whole vectors or
+matrices rather than single numbers:
+
+- vector_add, vector_subtract, vector_multiply, vector_divide: element-wise
+  arithmetic over equal-length vectors, folded left to right like the scalar
+  types. Plain numbers may be mixed in and apply to every element, e.g.
+  ``[[1, 2, 3], 10]`` for vector_add gives ``[11, 12, 13]``.
+- dot: dot product of exactly two equal-length vectors (a number).
+- matmul: product of a chain of matrices, each given as a list of rows,
+  e.g. ``[[[1, 2], [3, 4]], [[5], [6]]]`` gives ``[[17], [39]]``.
+
+Vector and matrix results are stored in the ``result_array`` column and
+returned as (nested) lists; ``result`` stays NULL for them. The work is done
+by NumPy on float64 arrays, in the functions of ``app.operations.catalog``,
+and the total number of elements across all operands (and in a matrix
+product) is capped by ``CALCULATION_ARRAY_MAX_ELEMENTS``.
+"""
+
+from app.core.config import settings
+from app.models.calculation import Calculation
+
+
+def _element_count(operand) -> int:
+    """Number of scalars in an operand, counted without converting it."""
+    if not isinstance(operand, list):
+        return 1
+    return sum(len(row) if isinstance(row, list) else 1 for row in operand)
+
+
+class ArrayMixin:
+    """
+    Shared behaviour of the NumPy-backed vector and matrix calculation types.
+    """
+
+    def element_count(self) -> int:
+        """Total number of scalars across all operands."""
+        if not isinstance(self.inputs, list):
+            return 0
+        return sum(_element_count(operand) for operand in self.inputs)
+
+    def estimated_cost(self) -> int:
+        """Array types cost one step per element rather than per operand."""
+        return self.element_count()
+
+    def check_cost(self) -> None:
+        """
+        Reject calculations whose operands hold too many elements in total.
+
+        Raises:
+            ValueError: If the element cap or the operand limit is exceeded
+        """
+        super().check_cost()
+        limit = settings.CALCULATION_ARRAY_MAX_ELEMENTS
+        if self.element_count() > limit:
+            raise ValueError(f"Too many elements: at most {limit} numbers are allowed across all operands.")
+
+
+class VectorAddition(ArrayMixin, Calculation):
+    """
+    Element-wise sum of vectors; numbers are added to every element.
+    Example: [[1, 2], [3, 4], 10] -> [14, 16]
+    """
+    __mapper_args__ = {"polymorphic_identity": "vector_add"}
+
+
+class VectorSubtraction(ArrayMixin, Calculation):
+    """
+    Subtracts each following operand from the first, element by element.
+    Example: [[10, 20], [1, 2]] -> [9, 18]
+    """
+    __mapper_args__ = {"polymorphic_identity": "vector_subtract"}
+
+
+class VectorMultiplication(ArrayMixin, Calculation):
+    """
+    Element-wise (Hadamard) product; numbers scale every element.
+    Example: [[1, 2], [3, 4], 2] -> [6, 16]
+    """
+    __mapper_args__ = {"polymorphic_identity": "vector_multiply"}
+
+
+class VectorDivision(ArrayMixin, Calculation):
+    """
+    Divides the first operand by each following one, element by element.
+    Example: [[10, 20], [2, 4]] -> [5, 5]
+    """
+    __mapper_args__ = {"polymorphic_identity": "vector_divide"}
+
+
+class DotProduct(ArrayMixin, Calculation):
+    """
+    Dot product of two equal-length vectors.
+    Example: [[1, 2, 3], [4, 5, 6]] -> 32
+    """
+    __mapper_args__ = {"polymorphic_identity": "dot"}
+
+
+class MatrixMultiplication(ArrayMixin, Calculation):
+    """
+    Product of a chain of matrices, each a list of rows.
+    Example: [[[1, 2], [3, 4]], [[5], [6]]] -> [[17], [39]]
+    """
+    __mapper_args__ = {"polymorphic_identity": "matmul"}
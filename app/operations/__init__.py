@@ -1,17 +1,36 @@
-# app/operations.py
+# app/operations/__init__.py
 
 """
-Module: operations.py
-
-This module contains basic arithmetic functions that perform addition, subtraction,
-multiplication, and division of two numbers. These functions are foundational for
-building more complex applications, such as calculators or financial tools.
-
-Functions:
-- add(a: Union[int, float], b: Union[int, float]) -> Union[int, float]: Returns the sum of a and b.
-- subtract(a: Union[int, float], b: Union[int, float]) -> Union[int, float]: Returns the difference when b is subtracted from a.
-- multiply(a: Union[int, float], b: Union[int, float]) -> Union[int, float]: Returns the product of a and b.
-- divide(a: Union[int, float], b: Union[int, float]) -> float: Returns the quotient when a is divided by b. Raises ValueError if b is zero.
+Module: operations
+
+This package contains the arithmetic the calculator is built on. It has no
+web or database dependencies, so it can be used on its own.
+
+Scalar functions (n-ary; operands are folded left to right, and a single
+operand is returned as the value of a one-step chain):
+- add(a, *rest) -> Number: Sum of all operands.
+- subtract(a, *rest) -> Number: The first operand minus the others.
+- multiply(a, *rest) -> Number: Product of all operands.
+- divide(a, *rest) -> Number: The first operand divided by the others. Raises ValueError if a divisor is zero.
+- power(base, exponent) -> Number: base raised to exponent. Raises ValueError for zero to a negative power.
+
+The Calculation models delegate their arithmetic to these functions, so the
+results here are exactly the stored ones.
+
+Array kernels (NumPy, see ``app.operations.batch``):
+- add_rows, subtract_rows, multiply_rows, divide_rows, power_rows: Evaluate
+  many operand lists of one operation at once.
+- add_scan, subtract_scan, multiply_scan, divide_scan: Running values of one
+  operand chain.
+
+Submodules:
+- batch: The array kernels.
+- expression: Safe compilation of arithmetic expressions.
+- registry: The registry of calculation types.
+- catalog: Every calculation type as a plain function, with its batch kernel
+  and operand-count rule; the models' array arithmetic lives here.
+- cli: ``python -m app.operations``, an offline batch evaluator for CSV and
+  NDJSON calculation files.
 
 Usage:
 These functions can be imported and used in other modules or integrated into APIs
@@ -20,101 +39,155 @@ to perform arithmetic operations based on user input.
 
 from typing import Union  # Import Union for type hinting multiple possible types
 
+from app.operations.batch import (  # noqa: F401 - re-exported array kernels
+    add_rows,
+    add_scan,
+    divide_rows,
+    divide_scan,
+    multiply_rows,
+    multiply_scan,
+    power_rows,
+    subtract_rows,
+    subtract_scan,
+)
+
 # Define a type alias for numbers that can be either int or float
 Number = Union[int, float]
 
-def add(a: Number, b: Number) -> Number:
+def add(a: Number, *rest: Number) -> Number:
     """
-    Add two numbers and return the result.
+    Add numbers and return the sum.
+
+    Like ``sum()``, the chain starts from 0, so ``add(-0.0, -0.0)`` is 0.0.
 
     Parameters:
     - a (int or float): The first number to add.
-    - b (int or float): The second number to add.
+    - rest (int or float): The numbers to add to it.
 
     Returns:
-    - int or float: The sum of a and b.
+    - int or float: The sum of all operands.
 
     Example:
     >>> add(2, 3)
     5
     >>> add(2.5, 3)
     5.5
+    >>> add(1, 2, 3, 4)
+    10
     """
-    # Perform addition of a and b
-    result = a + b
+    # Fold left to right so the rounding matches the batch kernels
+    result = 0
+    for value in (a, *rest):
+        result += value
     return result
 
-def subtract(a: Number, b: Number) -> Number:
+def subtract(a: Number, *rest: Number) -> Number:
     """
-    Subtract the second number from the first and return the result.
+    Subtract the other numbers from the first and return the result.
 
     Parameters:
     - a (int or float): The number from which to subtract.
-    - b (int or float): The number to subtract.
+    - rest (int or float): The numbers to subtract.
 
     Returns:
-    - int or float: The difference between a and b.
+    - int or float: The difference.
 
     Example:
     >>> subtract(5, 3)
     2
     >>> subtract(5.5, 2)
     3.5
+    >>> subtract(10, 3, 2)
+    5
     """
-    # Perform subtraction of b from a
-    result = a - b
+    result = a
+    for value in rest:
+        result -= value
     return result
 
-def multiply(a: Number, b: Number) -> Number:
+def multiply(a: Number, *rest: Number) -> Number:
     """
-    Multiply two numbers and return the product.
+    Multiply numbers and return the product.
 
     Parameters:
     - a (int or float): The first number to multiply.
-    - b (int or float): The second number to multiply.
+    - rest (int or float): The numbers to multiply it by.
 
     Returns:
-    - int or float: The product of a and b.
+    - int or float: The product of all operands.
 
     Example:
     >>> multiply(2, 3)
     6
     >>> multiply(2.5, 4)
     10.0
+    >>> multiply(2, 3, 4)
+    24
     """
-    # Perform multiplication of a and b
-    result = a * b
+    result = a
+    for value in rest:
+        result *= value
     return result
 
-def divide(a: Number, b: Number) -> float:
+def divide(a: Number, *rest: Number) -> Number:
     """
-    Divide the first number by the second and return the quotient.
+    Divide the first number by the others and return the quotient.
 
     Parameters:
     - a (int or float): The dividend.
-    - b (int or float): The divisor.
+    - rest (int or float): The divisors.
 
     Returns:
-    - float: The quotient of a divided by b.
+    - int or float: The quotient (a float whenever there is a divisor).
 
     Raises:
-    - ValueError: If b is zero, as division by zero is undefined.
+    - ValueError: If any divisor is zero, as division by zero is undefined.
 
     Example:
     >>> divide(6, 3)
     2.0
     >>> divide(5.5, 2)
     2.75
+    >>> divide(100, 4, 5)
+    5.0
     >>> divide(5, 0)
     Traceback (most recent call last):
         ...
     ValueError: Cannot divide by zero!
     """
-    # Check if the divisor is zero to prevent division by zero
-    if b == 0:
-        # Raise a ValueError with a descriptive message
+    # Check every divisor first so nothing is computed for an invalid chain
+    if any(value == 0 for value in rest):
         raise ValueError("Cannot divide by zero!")
-    
-    # Perform division of a by b and return the result as a float
-    result = a / b
+
+    result = a
+    for value in rest:
+        result /= value
     return result
+
+def power(base: Number, exponent: Number) -> Number:
+    """
+    Raise a number to a power.
+
+    Follows Python's ``**``: a negative base with a fractional exponent
+    gives a complex number, and float results too large to represent raise
+    OverflowError.
+
+    Parameters:
+    - base (int or float): The base.
+    - exponent (int or float): The exponent.
+
+    Returns:
+    - int or float: base ** exponent.
+
+    Raises:
+    - ValueError: If zero is raised to a negative power.
+
+    Example:
+    >>> power(2, 8)
+    256
+    >>> power(4, 0.5)
+    2.0
+    """
+    if base == 0 and exponent < 0:
+        raise ValueError("Cannot raise zero to a negative power.")
+    return base ** exponent
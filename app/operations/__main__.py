@@ -0,0 +1,9 @@
+# app/operations/__main__.py
+"""Run the offline batch evaluator: ``python -m app.operations --help``."""
+
+import sys
+
+from app.operations.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
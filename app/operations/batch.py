@@ -0,0 +1,145 @@
+# app/operations/batch.py
+"""
+Module: batch.py
+
+Vectorized NumPy kernels that evaluate many calculations of the same type at
+once. Each kernel takes a list of operand lists (one per calculation) and
+returns a float64 array with one result per calculation.
+
+Ragged operand lists are packed into a padded 2-D array using the operation's
+right identity (0.0 for addition/subtraction, 1.0 for multiplication/division),
+so padding never changes a result. Chains are folded one column at a time,
+left to right, which reproduces the exact rounding of the sequential Python
+loops in the Calculation models rather than NumPy's pairwise summation.
+
+Kernels do not validate their inputs. Invalid items (zero divisors, overflow,
+negative bases with fractional exponents) come back as inf or NaN, and the
+caller is expected to re-evaluate those with the scalar implementation.
+
+Scan kernels go the other way: they take the operands of one calculation and
+return its running value after every operand, using NumPy's ``accumulate``,
+which is also a sequential left-to-right pass.
+
+Functions:
+- pack(rows, fill) -> np.ndarray: Pack ragged operand lists into a padded matrix.
+- fold(op, matrix) -> np.ndarray: Left-to-right reduction of each row.
+- add_rows, subtract_rows, multiply_rows, divide_rows, power_rows: Batch kernels.
+- add_scan, subtract_scan, multiply_scan, divide_scan: Scan kernels.
+"""
+
+import math
+from typing import Callable, Sequence
+
+import numpy as np
+
+# Operand lists for a batch: one inner sequence per calculation
+Rows = Sequence[Sequence[float]]
+
+
+def pack(rows: Rows, fill: float) -> np.ndarray:
+    """
+    Pack ragged operand lists into a padded float64 matrix.
+
+    Parameters:
+    - rows: One operand list per calculation, or a 2-D array of equal-length
+      rows, which is used as is.
+    - fill: Value used to pad shorter rows.
+
+    Returns:
+    - np.ndarray: Array of shape (len(rows), longest row length).
+
+    Example:
+    >>> pack([[1, 2, 3], [4, 5]], 0.0).tolist()
+    [[1.0, 2.0, 3.0], [4.0, 5.0, 0.0]]
+    """
+    if isinstance(rows, np.ndarray) and rows.ndim == 2:
+        return rows.astype(np.float64, copy=False)
+    width = max((len(row) for row in rows), default=0)
+    matrix = np.full((len(rows), width), fill, dtype=np.float64)
+    for i, row in enumerate(rows):
+        matrix[i, :len(row)] = row
+    return matrix
+
+
+def fold(op: Callable, matrix: np.ndarray) -> np.ndarray:
+    """
+    Reduce each row of a matrix left to right with a binary ufunc.
+
+    The loop runs once per column and is vectorized across rows, so the
+    rounding of every row matches a sequential Python loop.
+
+    Parameters:
+    - op: A NumPy binary ufunc such as np.subtract.
+    - matrix: The packed operands.
+
+    Returns:
+    - np.ndarray: One reduced value per row.
+    """
+    acc = matrix[:, 0].copy()
+    with np.errstate(all="ignore"):
+        for j in range(1, matrix.shape[1]):
+            op(acc, matrix[:, j], out=acc)
+    return acc
+
+
+def add_rows(rows: Rows) -> np.ndarray:
+    """Sum each operand list: [1, 2, 3] -> 6."""
+    # Python's sum() starts from 0, which turns a leading -0.0 into 0.0
+    return fold(np.add, pack(rows, 0.0)) + 0.0
+
+
+def subtract_rows(rows: Rows) -> np.ndarray:
+    """Subtract the rest of each operand list from its first value: [10, 3, 2] -> 5."""
+    return fold(np.subtract, pack(rows, 0.0))
+
+
+def multiply_rows(rows: Rows) -> np.ndarray:
+    """Multiply each operand list together: [2, 3, 4] -> 24."""
+    return fold(np.multiply, pack(rows, 1.0))
+
+
+def divide_rows(rows: Rows) -> np.ndarray:
+    """Divide the first value of each operand list by the rest: [100, 4, 5] -> 5. Zero divisors yield inf/NaN."""
+    return fold(np.divide, pack(rows, 1.0))
+
+
+def _pow_or_nan(base: float, exponent: float) -> float:
+    try:
+        return float(base ** exponent)
+    except (ArithmeticError, TypeError):  # overflow, 0 ** -n, complex results
+        return math.nan
+
+
+# np.power uses SIMD approximations that can differ from the C library pow()
+# by one ulp, so powers are computed with Python's float pow over the packed
+# columns to stay bit-identical with Exponentiation.get_result()
+_pow = np.frompyfunc(_pow_or_nan, 2, 1)
+
+
+def power_rows(rows: Rows) -> np.ndarray:
+    """Raise each [base, exponent] pair: [2, 8] -> 256. Overflow and invalid powers yield NaN."""
+    matrix = pack(rows, 1.0)
+    # the packed columns hold NumPy floats, which overflow to inf with a warning
+    with np.errstate(all="ignore"):
+        return _pow(matrix[:, 0], matrix[:, 1]).astype(np.float64)
+
+
+def add_scan(values: np.ndarray) -> np.ndarray:
+    """Running sums: [1, 2, 3] -> [1, 3, 6]."""
+    # Start from 0.0 like the scalar loop, so a leading -0.0 becomes 0.0
+    return np.add.accumulate(np.concatenate(([0.0], values)))[1:]
+
+
+def subtract_scan(values: np.ndarray) -> np.ndarray:
+    """Running differences: [10, 3, 2] -> [10, 7, 5]."""
+    return np.subtract.accumulate(values)
+
+
+def multiply_scan(values: np.ndarray) -> np.ndarray:
+    """Running products: [2, 3, 4] -> [2, 6, 24]."""
+    return np.multiply.accumulate(values)
+
+
+def divide_scan(values: np.ndarray) -> np.ndarray:
+    """Running quotients: [100, 4, 5] -> [100, 25, 5]. Zero divisors yield inf/NaN."""
+    return np.divide.accumulate(values)
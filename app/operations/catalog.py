@@ -0,0 +1,496 @@
+# app/operations/catalog.py
+"""
+Module: catalog.py
+
+Every calculation type as a plain function of its operand list, with no
+models or database behind it.
+
+``catalog`` is an OperationRegistry of Operation entries: the function that
+computes one result, the batch kernel where the type has one, and the
+operand-count rule. It is the only definition of each type: the calculation
+models take their operand rules and batch kernels from the entry of the same
+name and delegate ``compute()`` to it, and ``python -m app.operations``
+evaluates through the catalog directly, so it reports the API's results and
+error messages without importing the ORM.
+
+A flat list of numbers may also be given as a 1-D float64 array, e.g. the
+zero-copy view of packed inputs: the statistics and the batch kernels use
+it as is, and the scalar folds convert it to Python floats first.
+
+The API's per-request cost limits (operand counts, sweep points, magnitude
+estimates) belong to the models and are not applied here; the element cap on
+matrix products is.
+
+Classes:
+- Operation: One calculation type.
+
+Functions:
+- finite_result(result): Check that a computed result can be stored.
+- sweep_position(inputs) -> int: Index of the values a sweep varies.
+- evaluate(calculation_type, inputs, **attributes): Evaluate one calculation.
+- evaluate_batch(items) -> List: Evaluate many, with the batch kernels.
+
+Attributes:
+- catalog: The name -> Operation table.
+"""
+
+import math
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.core.config import settings
+from app.operations import add, batch, divide, multiply, power, subtract
+from app.operations.expression import compile_expression
+from app.operations.registry import OperationRegistry
+
+# One calculation for evaluate_batch(): (type, inputs, attributes)
+Item = Tuple[str, Any, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Operation:
+    """
+    One calculation type.
+
+    Attributes:
+    - name: The type name clients send, e.g. "addition".
+    - compute: Computes the result from the operand list and the attributes.
+    - batch_kernel: Vectorized implementation (see ``app.operations.batch``),
+      or None.
+    - operand_range: (min, max) operand count; max None means no bound.
+    - operand_count_error: Message for an operand list of the wrong length.
+    - attributes: Fields besides the inputs that ``compute`` takes.
+    - sweepable: Whether a sweep may evaluate the type at many points.
+    """
+    name: str
+    compute: Callable[..., Any]
+    batch_kernel: Optional[Callable] = None
+    operand_range: Tuple[int, Optional[int]] = (2, None)
+    operand_count_error: str = "Inputs must be a list with at least two numbers."
+    attributes: Tuple[str, ...] = ()
+    sweepable: bool = True
+
+    def check_count(self, inputs) -> None:
+        """
+        Raises:
+        - ValueError: If inputs are not a list (or 1-D array) or have the
+          wrong length.
+        """
+        if not isinstance(inputs, list) and not (isinstance(inputs, np.ndarray) and inputs.ndim == 1):
+            raise ValueError("Inputs must be a list of numbers.")
+        low, high = self.operand_range
+        if len(inputs) < low or (high is not None and len(inputs) > high):
+            raise ValueError(self.operand_count_error)
+
+    def evaluate(self, inputs, **attributes):
+        """
+        Evaluate one operand list.
+
+        Returns:
+        - float, or a (nested) list for vector and matrix results.
+
+        Raises:
+        - ValueError: With the message the API reports for the same input.
+        """
+        self.check_count(inputs)
+        try:
+            result = self.compute(inputs, **{name: attributes.get(name) for name in self.attributes})
+        except OverflowError:
+            raise ValueError("Result is too large to represent.")
+        except TypeError:
+            raise ValueError("Inputs must be a list of numbers.")
+        return finite_result(result)
+
+
+def finite_result(result):
+    """
+    Check that a computed result is a finite real number (or array of them).
+
+    Returns:
+    - The result, with arrays converted to (nested) lists.
+
+    Raises:
+    - ValueError: If the result overflowed, is NaN or is complex.
+    """
+    if isinstance(result, np.ndarray):
+        if np.isinf(result).any():
+            raise ValueError("Result is too large to represent.")
+        if np.isnan(result).any():
+            raise ValueError("Result is not a finite number.")
+        return result.tolist()
+    if isinstance(result, complex):
+        raise ValueError("Result is not a real number.")
+    try:
+        if math.isinf(result):
+            raise OverflowError
+    except OverflowError:
+        raise ValueError("Result is too large to represent.")
+    if math.isnan(result):
+        raise ValueError("Result is not a finite number.")
+    return result
+
+
+def as_values(inputs: Sequence, error: str = "Inputs must be a list of numbers.") -> np.ndarray:
+    """
+    The operands as a float64 array.
+
+    Raises:
+    - ValueError: If the operands are not all numbers.
+    """
+    if isinstance(inputs, np.ndarray):
+        if inputs.dtype.kind not in "iuf":
+            raise ValueError(error)
+        return inputs.astype(np.float64, copy=False)
+    try:
+        # array('d') unpacks a list of Python floats faster than np.asarray
+        return np.frombuffer(array('d', inputs), dtype=np.float64)
+    except (TypeError, OverflowError):
+        raise ValueError(error)
+
+
+def as_arrays(inputs: Sequence, ndims: Tuple[int, ...], error: str) -> List[np.ndarray]:
+    """
+    The operands as float64 arrays of the allowed dimensions (0 = a number).
+
+    Raises:
+    - ValueError: If an operand is not a number, a vector or a rectangular
+      list of rows, as ``ndims`` allows.
+    """
+    arrays = []
+    for operand in inputs:
+        try:
+            operand = np.asarray(operand, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError(error)
+        if operand.ndim not in ndims or (operand.ndim and 0 in operand.shape):
+            raise ValueError(error)
+        arrays.append(operand)
+    return arrays
+
+
+# Scalar arithmetic
+
+def _numbers(inputs) -> list:
+    """The operands unchanged, after checking that they are all numbers."""
+    if isinstance(inputs, np.ndarray):
+        # The folds are Python loops: NumPy scalars would only slow them down
+        return as_values(inputs).tolist()
+    if not all(isinstance(value, (int, float)) for value in inputs):
+        raise ValueError("Inputs must be a list of numbers.")
+    return inputs
+
+
+def _addition(inputs):
+    return add(*_numbers(inputs))
+
+
+def _subtraction(inputs):
+    return subtract(*_numbers(inputs))
+
+
+def _multiplication(inputs):
+    return multiply(*_numbers(inputs))
+
+
+def _division(inputs):
+    values = _numbers(inputs)
+    if any(value == 0 for value in values[1:]):
+        raise ValueError("Cannot divide by zero.")
+    return divide(*values)
+
+
+def _exponentiation(inputs):
+    return power(*_numbers(inputs))
+
+
+def _expression(inputs, expression=None):
+    if not expression:
+        raise ValueError("Expression calculations require an expression.")
+    return compile_expression(expression).evaluate(inputs)
+
+
+# Statistics
+
+def mean(inputs) -> float:
+    """Arithmetic mean: [2, 4, 9] -> 5."""
+    return float(np.mean(as_values(inputs)))
+
+
+def median(inputs) -> float:
+    """Median, averaging the middle two for an even count: [7, 1, 3, 5] -> 4."""
+    return float(np.median(as_values(inputs)))
+
+
+def variance(inputs) -> float:
+    """Sample variance (n - 1 in the denominator)."""
+    return float(np.var(as_values(inputs), ddof=1))
+
+
+def stddev(inputs) -> float:
+    """Sample standard deviation (n - 1 in the denominator)."""
+    return float(np.std(as_values(inputs), ddof=1))
+
+
+def minimum(inputs) -> float:
+    """Smallest operand."""
+    return float(np.min(as_values(inputs)))
+
+
+def maximum(inputs) -> float:
+    """Largest operand."""
+    return float(np.max(as_values(inputs)))
+
+
+def percentile(inputs) -> float:
+    """
+    Percentile ``q`` of the data, for inputs ``[q, value, ...]``.
+
+    Raises:
+    - ValueError: If q is not between 0 and 100.
+    """
+    values = as_values(inputs)
+    q = values[0]
+    if not 0 <= q <= 100:
+        raise ValueError("Percentile must be between 0 and 100.")
+    return float(np.percentile(values[1:], q))
+
+
+# Vectors and matrices
+
+VECTOR_SHAPE_ERROR = "Operands must be numbers or vectors of numbers."
+
+
+def _vectors(inputs) -> List[np.ndarray]:
+    arrays = as_arrays(inputs, (0, 1), VECTOR_SHAPE_ERROR)
+    lengths = {len(operand) for operand in arrays if operand.ndim == 1}
+    if not lengths:
+        raise ValueError("Inputs must include at least one vector.")
+    if len(lengths) > 1:
+        raise ValueError("Vectors must all have the same length.")
+    return arrays
+
+
+def fold_vectors(ufunc: Callable, arrays: List[np.ndarray]) -> np.ndarray:
+    """Fold numbers and equal-length vectors left to right with a ufunc."""
+    shape = next(operand.shape for operand in arrays if operand.ndim)
+    result = np.array(np.broadcast_to(arrays[0], shape))
+    with np.errstate(all="ignore"):
+        for operand in arrays[1:]:
+            ufunc(result, operand, out=result)
+    return result
+
+
+def vector_add(inputs) -> np.ndarray:
+    """Element-wise sum: [[1, 2], [3, 4], 10] -> [14, 16]."""
+    return fold_vectors(np.add, _vectors(inputs))
+
+
+def vector_subtract(inputs) -> np.ndarray:
+    """Element-wise difference: [[10, 20], [1, 2]] -> [9, 18]."""
+    return fold_vectors(np.subtract, _vectors(inputs))
+
+
+def vector_multiply(inputs) -> np.ndarray:
+    """Element-wise product: [[1, 2], [3, 4], 2] -> [6, 16]."""
+    return fold_vectors(np.multiply, _vectors(inputs))
+
+
+def vector_divide(inputs) -> np.ndarray:
+    """
+    Element-wise quotient: [[10, 20], [2, 4]] -> [5, 5].
+
+    Raises:
+    - ValueError: If any divisor element is zero.
+    """
+    arrays = _vectors(inputs)
+    if any((divisor == 0).any() for divisor in arrays[1:]):
+        raise ValueError("Cannot divide by zero.")
+    return fold_vectors(np.divide, arrays)
+
+
+def dot(inputs) -> float:
+    """Dot product of two equal-length vectors: [[1, 2, 3], [4, 5, 6]] -> 32."""
+    a, b = as_arrays(inputs, (1,), "Dot product operands must be vectors of numbers.")
+    if len(a) != len(b):
+        raise ValueError("Vectors must all have the same length.")
+    with np.errstate(all="ignore"):
+        return float(np.dot(a, b))
+
+
+def matmul(inputs) -> np.ndarray:
+    """
+    Product of a chain of matrices: [[[1, 2], [3, 4]], [[5], [6]]] -> [[17], [39]].
+
+    Raises:
+    - ValueError: If consecutive shapes do not line up, or the product would
+      hold more than ``CALCULATION_ARRAY_MAX_ELEMENTS`` numbers.
+    """
+    matrices = as_arrays(inputs, (2,), "Matrices must be non-empty rectangular lists of rows.")
+    for left, right in zip(matrices, matrices[1:]):
+        if left.shape[1] != right.shape[0]:
+            raise ValueError(f"Matrix shapes {left.shape} and {right.shape} are not aligned.")
+    rows, columns = matrices[0].shape[0], matrices[-1].shape[1]
+    limit = settings.CALCULATION_ARRAY_MAX_ELEMENTS
+    if rows * columns > limit:
+        raise ValueError(f"Too many elements: the result may hold at most {limit} numbers.")
+    with np.errstate(all="ignore"):
+        # multi_dot picks the cheapest multiplication order for longer chains
+        return np.linalg.multi_dot(matrices)
+
+
+def sweep_position(inputs) -> int:
+    """
+    Index of the sweep input that holds the values to sweep.
+
+    Raises:
+    - ValueError: If there is not exactly one such input.
+    """
+    positions = [i for i, operand in enumerate(inputs) if isinstance(operand, list)]
+    if len(positions) != 1:
+        raise ValueError("Exactly one input must be the list of values to sweep.")
+    return positions[0]
+
+
+def _sweep(inputs, operation=None, expression=None):
+    if not isinstance(operation, str):
+        raise ValueError("A sweep needs an operation to evaluate.")
+    swept = catalog.get(operation)
+    if swept is None:
+        raise ValueError(f"Unsupported calculation type: {operation}")
+    if not swept.sweepable:
+        raise ValueError(f"Calculations of type '{operation}' cannot be swept.")
+    position = sweep_position(inputs)
+    if not inputs[position]:
+        raise ValueError("The list of values to sweep must not be empty.")
+    values = as_values(inputs[position], "Values to sweep must be numbers.")
+
+    point = list(inputs)
+    point[position] = float(values[0])
+    row = as_values(point)
+    # The operand count and the expression are the same at every point
+    swept.check_count(point)
+    if "expression" in swept.attributes and not expression:
+        raise ValueError("Expression calculations require an expression.")
+
+    results = np.full(len(values), np.nan)
+    if swept.batch_kernel is not None:
+        matrix = np.repeat(row[np.newaxis, :], len(values), axis=0)
+        matrix[:, position] = values
+        with np.errstate(all="ignore"):
+            results = np.asarray(swept.batch_kernel(matrix), dtype=np.float64)
+
+    for index in np.flatnonzero(~np.isfinite(results)):
+        point[position] = float(values[index])
+        try:
+            results[index] = swept.evaluate(point, expression=expression)
+        except ValueError as e:
+            raise ValueError(f"Point {index} ({values[index]:g}): {e}")
+    return results
+
+
+catalog = OperationRegistry()
+
+for _operation in (
+    Operation("addition", _addition, batch.add_rows),
+    Operation("subtraction", _subtraction, batch.subtract_rows),
+    Operation("multiplication", _multiplication, batch.multiply_rows),
+    Operation("division", _division, batch.divide_rows),
+    Operation("exponentiation", _exponentiation, batch.power_rows, operand_range=(2, 2),
+              operand_count_error="Exponentiation requires exactly two numbers: [base, exponent]."),
+    Operation("expression", _expression, operand_range=(1, None),
+              operand_count_error="Inputs must be a list with at least one number.",
+              attributes=("expression",)),
+    Operation("mean", mean, operand_range=(1, None),
+              operand_count_error="Inputs must be a list with at least one number."),
+    Operation("median", median, operand_range=(1, None),
+              operand_count_error="Inputs must be a list with at least one number."),
+    Operation("variance", variance),
+    Operation("stddev", stddev),
+    Operation("min", minimum, operand_range=(1, None),
+              operand_count_error="Inputs must be a list with at least one number."),
+    Operation("max", maximum, operand_range=(1, None),
+              operand_count_error="Inputs must be a list with at least one number."),
+    Operation("percentile", percentile,
+              operand_count_error="Percentile requires [percentile, value, ...] with at least one value."),
+    Operation("vector_add", vector_add, operand_count_error="Inputs must be a list with at least two operands.",
+              sweepable=False),
+    Operation("vector_subtract", vector_subtract,
+              operand_count_error="Inputs must be a list with at least two operands.", sweepable=False),
+    Operation("vector_multiply", vector_multiply,
+              operand_count_error="Inputs must be a list with at least two operands.", sweepable=False),
+    Operation("vector_divide", vector_divide,
+              operand_count_error="Inputs must be a list with at least two operands.", sweepable=False),
+    Operation("dot", dot, operand_range=(2, 2), operand_count_error="Dot product requires exactly two vectors.",
+              sweepable=False),
+    Operation("matmul", matmul, operand_count_error="Matrix multiplication requires at least two matrices.",
+              sweepable=False),
+    Operation("sweep", _sweep, operand_range=(1, None),
+              operand_count_error="Inputs must be a list with at least one operand.",
+              attributes=("operation", "expression"), sweepable=False),
+):
+    catalog.register(_operation.name, _operation)
+
+
+def evaluate(calculation_type: str, inputs, **attributes):
+    """
+    Evaluate one calculation by type name.
+
+    Raises:
+    - ValueError: If the type is unknown or the calculation fails.
+    """
+    operation = catalog.get(calculation_type) if isinstance(calculation_type, str) else None
+    if operation is None:
+        raise ValueError(f"Unsupported calculation type: {calculation_type}")
+    return operation.evaluate(inputs, **attributes)
+
+
+def evaluate_batch(items: Sequence[Item]) -> List[Union[Any, ValueError]]:
+    """
+    Evaluate many calculations, one vectorized pass per type with a kernel.
+
+    Items the kernel cannot represent exactly (wrong operand count, zero
+    divisor, overflow, NaN) are re-evaluated one at a time, so results and
+    errors match ``evaluate()``.
+
+    Returns:
+    - A list aligned with ``items`` holding either the result or the
+      ValueError raised for that item.
+    """
+    results: List[Any] = [None] * len(items)
+    groups = defaultdict(list)
+    for position, (calculation_type, _, _) in enumerate(items):
+        operation = catalog.get(calculation_type) if isinstance(calculation_type, str) else None
+        if operation is None:
+            results[position] = ValueError(f"Unsupported calculation type: {calculation_type}")
+        else:
+            groups[operation].append(position)
+
+    for operation, positions in groups.items():
+        done = set()
+        if operation.batch_kernel is not None:
+            low, high = operation.operand_range
+            vectorized = [
+                p for p in positions
+                if isinstance(items[p][1], (list, np.ndarray)) and low <= len(items[p][1]) <= (high or math.inf)
+            ]
+            try:
+                values = operation.batch_kernel([items[p][1] for p in vectorized]) if vectorized else []
+            except (TypeError, ValueError):
+                # Non-numeric operands: let evaluate() report them
+                values = []
+            for p, value in zip(vectorized, values):
+                if math.isfinite(value):
+                    results[p] = float(value)
+                    done.add(p)
+
+        for p in positions:
+            if p not in done:
+                try:
+                    results[p] = operation.evaluate(items[p][1], **items[p][2])
+                except ValueError as e:
+                    results[p] = e
+    return results
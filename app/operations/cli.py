@@ -0,0 +1,270 @@
+# app/operations/cli.py
+"""
+Module: cli.py
+
+Offline batch evaluator: ``python -m app.operations``.
+
+Reads calculations from a file or stdin, evaluates them through
+``app.operations.catalog`` (the functions and batch kernels the API's models
+use), and writes one result per calculation as it goes. Nothing here imports
+the web stack, the ORM or the database, so it can be used to recompute or
+validate exported calculations anywhere the package is installed. The API's
+per-request cost limits do not apply.
+
+Input formats:
+- ndjson: one JSON object per line,
+  ``{"type": "addition", "inputs": [1, 2], "expression": ..., "operation": ...}``
+  (``expression`` and ``operation`` only where the type uses them).
+- csv: one calculation per row, ``type,operand,operand,...``. A first row
+  starting with ``type`` is treated as a header and skipped.
+
+Blank lines are skipped in both formats. Records are grouped into chunks;
+each chunk is evaluated with ``catalog.evaluate_batch`` in a worker
+process, several chunks are in flight at once, and results are written in
+input order as soon as their chunk is done. Memory use depends on the chunk
+size and worker count, not on the size of the input.
+
+Output is NDJSON, ``{"line": 3, "result": 5.0}`` or ``{"line": 4, "error":
+"Cannot divide by zero."}``, or CSV with ``line,result,error`` columns.
+``line`` is the 1-based line number in the input. The exit status is 1 if
+any calculation failed, so the tool can also be used as a validator.
+
+Functions:
+- parse_record(line_number, line, input_format) -> Tuple: Parse one input line.
+- evaluate_chunk(records) -> List: Evaluate a chunk of parsed records.
+- main(argv) -> int: Entry point.
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from app.operations import catalog
+
+# A parsed input line: (line number, type, inputs, attributes), or
+# (line number, error message) when the line could not be parsed
+Record = Tuple
+# One output row: (line number, result, error message)
+Outcome = Tuple[int, Any, Optional[str]]
+
+FORMATS = ("ndjson", "csv")
+# Attributes a record may carry besides its type and inputs
+ATTRIBUTES = ("expression", "operation")
+
+
+def detect_format(path: Optional[str]) -> str:
+    """Input format implied by a file name; stdin and unknown extensions are ndjson."""
+    if path and os.path.splitext(path)[1].lower() == ".csv":
+        return "csv"
+    return "ndjson"
+
+
+def parse_record(line_number: int, line: str, input_format: str) -> Optional[Record]:
+    """
+    Parse one input line.
+
+    Args:
+        line_number: 1-based position of the line in the input
+        line: The raw line
+        input_format: "ndjson" or "csv"
+
+    Returns:
+        The parsed record, an error record if the line is invalid, or None
+        for blank lines and CSV headers
+    """
+    if not line.strip():
+        return None
+    if input_format == "csv":
+        row = next(csv.reader([line]))
+        calculation_type = row[0].strip()
+        if line_number == 1 and calculation_type.lower() == "type":
+            return None
+        try:
+            inputs = [float(field) for field in row[1:] if field.strip()]
+        except ValueError:
+            return (line_number, "Operands must be numbers.")
+        return (line_number, calculation_type, inputs, {})
+
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError as e:
+        return (line_number, f"Invalid JSON: {e.msg}")
+    if not isinstance(data, dict) or not isinstance(data.get("type"), str):
+        return (line_number, 'Each line must be an object with a "type" and "inputs".')
+    attributes = {name: data[name] for name in ATTRIBUTES if data.get(name) is not None}
+    return (line_number, data["type"], data.get("inputs"), attributes)
+
+
+def read_records(stream: TextIO, input_format: str) -> Iterator[Record]:
+    """Parse a stream lazily, one record per non-blank line."""
+    for line_number, line in enumerate(stream, start=1):
+        record = parse_record(line_number, line, input_format)
+        if record is not None:
+            yield record
+
+
+def evaluate_chunk(records: Sequence[Record]) -> List[Outcome]:
+    """
+    Evaluate a chunk of records; runs in a worker process.
+
+    Valid records are evaluated together with ``catalog.evaluate_batch``,
+    so records of a type with a batch kernel share one vectorized pass.
+    Parse errors are passed through unchanged.
+    """
+    outcomes: List[Outcome] = []
+    items, positions = [], []
+    for record in records:
+        if len(record) == 2:
+            outcomes.append((record[0], None, record[1]))
+            continue
+        line_number, calculation_type, inputs, attributes = record
+        positions.append(len(outcomes))
+        outcomes.append((line_number, None, None))
+        items.append((calculation_type, inputs, attributes))
+
+    for position, value in zip(positions, catalog.evaluate_batch(items)):
+        line_number = outcomes[position][0]
+        if isinstance(value, Exception):
+            outcomes[position] = (line_number, None, str(value))
+        else:
+            outcomes[position] = (line_number, value, None)
+    return outcomes
+
+
+def chunked(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    """Split records into lists of at most ``size``."""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _InlineExecutor(Executor):
+    """Executor that runs each task immediately, for ``--workers 0``."""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def evaluate_stream(records: Iterable[Record], executor: Executor, chunk_size: int,
+                    max_pending: int) -> Iterator[Outcome]:
+    """
+    Evaluate records chunk by chunk, yielding outcomes in input order.
+
+    At most ``max_pending`` chunks are submitted but not yet written, which
+    bounds memory while keeping every worker busy.
+    """
+    pending: deque = deque()
+    for chunk in chunked(records, chunk_size):
+        pending.append(executor.submit(evaluate_chunk, chunk))
+        if len(pending) >= max_pending:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+class OutputWriter:
+    """Writes outcomes as NDJSON or CSV and counts successes and failures."""
+
+    def __init__(self, stream: TextIO, output_format: str):
+        self.stream = stream
+        self.output_format = output_format
+        self.succeeded = 0
+        self.failed = 0
+        self.csv = csv.writer(stream, lineterminator="\n") if output_format == "csv" else None
+        if self.csv is not None:
+            self.csv.writerow(["line", "result", "error"])
+
+    def write(self, outcome: Outcome) -> None:
+        line_number, result, error = outcome
+        if error is None:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        if self.csv is not None:
+            if isinstance(result, list):
+                result = json.dumps(result)
+            self.csv.writerow([line_number, "" if result is None else result, error or ""])
+        elif error is None:
+            self.stream.write(json.dumps({"line": line_number, "result": result}) + "\n")
+        else:
+            self.stream.write(json.dumps({"line": line_number, "error": error}) + "\n")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.operations",
+        description="Evaluate a CSV or NDJSON file of calculations without the web app or database.",
+    )
+    parser.add_argument("input", nargs="?", default="-",
+                        help="Input file, or - for stdin (default)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Output file, or - for stdout (default)")
+    parser.add_argument("-f", "--format", choices=FORMATS,
+                        help="Input format (default: from the file extension, ndjson for stdin)")
+    parser.add_argument("--output-format", choices=FORMATS, default="ndjson",
+                        help="Output format (default: ndjson)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes; 0 evaluates in this process (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=10000,
+                        help="Calculations per worker task (default: 10000)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Do not print the summary to stderr")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the batch evaluator.
+
+    Returns:
+        int: 0 if every calculation succeeded, 1 if any failed
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers must not be negative")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    input_format = args.format or detect_format(None if args.input == "-" else args.input)
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    if args.workers:
+        # spawn, like the API's evaluation pool: workers start from a clean interpreter
+        executor = ProcessPoolExecutor(max_workers=args.workers,
+                                       mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = _InlineExecutor()
+
+    writer = OutputWriter(target, args.output_format)
+    try:
+        with executor:
+            records = read_records(source, input_format)
+            for outcome in evaluate_stream(records, executor, args.chunk_size, 2 * max(args.workers, 1)):
+                writer.write(outcome)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+        else:
+            target.flush()
+
+    if not args.quiet:
+        print(f"{writer.succeeded} succeeded, {writer.failed} failed", file=sys.stderr)
+    return 1 if writer.failed else 0
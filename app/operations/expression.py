@@ -0,0 +1,225 @@
+# app/operations/expression.py
+"""
+Module: expression.py
+
+Safe compilation of arithmetic expressions such as ``(a + b) / c ** 2`` into
+reusable evaluation plans.
+
+An expression is parsed with Python's ``ast`` module and only a small set of
+node types is accepted: numeric constants, operand references, the unary
+operators ``+``/``-`` and the binary operators ``+ - * / // % **``. Anything
+else (calls, attribute access, comparisons, names starting with ``_``, ...)
+is rejected before any code is generated. The checked tree is compiled once
+into a Python function, so evaluating a plan is a single function call.
+
+Operands are referenced either by name or by position, but not both:
+
+- Named: ``(a + b) / c`` binds the inputs to the names in the order they
+  first appear, so ``[1, 2, 3]`` gives ``a=1, b=2, c=3``. The function
+  takes one parameter per name.
+- Positional: ``(x[0] + x[1]) / x[2]`` indexes the inputs directly. The
+  function takes the inputs as a single sequence ``x``, so a plan stays as
+  small as its text whatever the largest index is.
+
+Compiled plans are kept in an LRU cache keyed by the expression text, so
+repeated formulas skip parsing entirely.
+
+Functions:
+- compile_expression(text) -> ExpressionPlan: Parse, check and compile (cached).
+"""
+
+import ast
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Sequence, Tuple
+
+from app.core.config import settings
+
+_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+# The name used for positional references: x[0], x[1], ...
+POSITIONAL_NAME = "x"
+
+
+@dataclass(frozen=True)
+class ExpressionPlan:
+    """
+    A compiled expression.
+
+    Attributes:
+    - text: The expression as written.
+    - operands: Operand names in binding order, or the "x[i]" labels that a
+      positional expression references, in index order.
+    - arity: Number of inputs the expression expects.
+    - node_count: Size of the syntax tree.
+    - positional: Whether the function takes the inputs as one sequence
+      rather than one parameter per operand.
+    """
+    text: str
+    operands: Tuple[str, ...]
+    arity: int
+    node_count: int
+    function: Callable[..., float]
+    positional: bool = False
+
+    def evaluate(self, inputs: Sequence[float]) -> float:
+        """
+        Evaluate the plan against a list of inputs.
+
+        Raises:
+        - ValueError: If the number of inputs does not match the expression,
+          or on division by zero.
+        - OverflowError: If an intermediate result is too large.
+        """
+        if len(inputs) != self.arity:
+            raise ValueError(
+                f"Expression uses {self.arity} operand(s) but {len(inputs)} input(s) were given."
+            )
+        # Floats only: integer constants must not turn ** into bignum arithmetic
+        values = [float(value) for value in inputs]
+        try:
+            if self.positional:
+                return self.function(values)
+            return self.function(*values)
+        except ZeroDivisionError:
+            raise ValueError("Cannot divide by zero.")
+
+
+class _Checker(ast.NodeTransformer):
+    """Rejects disallowed syntax and collects the operand references."""
+
+    def __init__(self):
+        self.names = []        # named operands in order of first appearance
+        self.positions = set()  # positional indexes
+        self.node_count = 0
+
+    def generic_visit(self, node):
+        raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}.")
+
+    def visit(self, node):
+        self.node_count += 1
+        return super().visit(node)
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _BINARY_OPERATORS):
+            raise ValueError(f"Unsupported operator in expression: {type(node.op).__name__}.")
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _UNARY_OPERATORS):
+            raise ValueError(f"Unsupported operator in expression: {type(node.op).__name__}.")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError("Expressions may only contain numeric constants.")
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+    def visit_Name(self, node):
+        if node.id.startswith("_") or node.id == POSITIONAL_NAME:
+            raise ValueError(f"Invalid operand name: {node.id}.")
+        if node.id not in self.names:
+            self.names.append(node.id)
+        return ast.copy_location(ast.Name(id=node.id, ctx=ast.Load()), node)
+
+    def visit_Subscript(self, node):
+        index = node.slice
+        if not (
+            isinstance(node.value, ast.Name)
+            and node.value.id == POSITIONAL_NAME
+            and isinstance(index, ast.Constant)
+            and type(index.value) is int
+            and 0 <= index.value < settings.CALCULATION_MAX_OPERANDS
+        ):
+            raise ValueError(f"Positional operands must be written {POSITIONAL_NAME}[0], {POSITIONAL_NAME}[1], ...")
+        self.positions.add(index.value)
+        return ast.copy_location(
+            ast.Subscript(value=ast.Name(id=POSITIONAL_NAME, ctx=ast.Load()), slice=ast.Constant(index.value),
+                          ctx=ast.Load()),
+            node,
+        )
+
+
+@lru_cache(maxsize=settings.CALCULATION_EXPRESSION_PLAN_CACHE_SIZE)
+def compile_expression(text: str) -> ExpressionPlan:
+    """
+    Parse, check and compile an expression.
+
+    Results are cached by expression text; errors are not cached.
+
+    Parameters:
+    - text: The arithmetic expression.
+
+    Returns:
+    - ExpressionPlan: The compiled plan.
+
+    Raises:
+    - ValueError: If the expression is empty, too long, malformed or uses
+      anything other than numbers, operands and arithmetic operators.
+
+    Example:
+    >>> compile_expression("(a + b) / c ** 2").evaluate([1, 2, 3])
+    0.3333333333333333
+    """
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("Expression must be a non-empty string.")
+    if len(text) > settings.CALCULATION_EXPRESSION_MAX_LENGTH:
+        raise ValueError(
+            f"Expression is longer than {settings.CALCULATION_EXPRESSION_MAX_LENGTH} characters."
+        )
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except (SyntaxError, RecursionError, MemoryError):
+        raise ValueError("Expression is not valid arithmetic.")
+
+    checker = _Checker()
+    try:
+        tree = checker.visit(tree)
+    except RecursionError:
+        raise ValueError("Expression is nested too deeply.")
+    if checker.names and checker.positions:
+        raise ValueError(f"Use either named operands or {POSITIONAL_NAME}[i] references, not both.")
+
+    if checker.positions:
+        arity = max(checker.positions) + 1
+        parameters = [POSITIONAL_NAME]
+        operands = tuple(f"{POSITIONAL_NAME}[{i}]" for i in sorted(checker.positions))
+    else:
+        parameters = list(checker.names)
+        operands = tuple(checker.names)
+        arity = len(parameters)
+
+    function_tree = ast.Expression(
+        body=ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg(arg=name) for name in parameters],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            body=tree.body,
+        )
+    )
+    ast.fix_missing_locations(function_tree)
+    try:
+        code = compile(function_tree, "<expression>", "eval")
+    except (RecursionError, MemoryError):
+        raise ValueError("Expression is nested too deeply.")
+    function = eval(code, {"__builtins__": {}})
+    return ExpressionPlan(
+        text=text,
+        operands=operands,
+        arity=arity,
+        node_count=checker.node_count,
+        function=function,
+        positional=bool(checker.positions),
+    )
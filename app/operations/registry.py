@@ -0,0 +1,84 @@
+# app/operations/registry.py
+"""
+Module: registry.py
+
+Registry of the calculation operations the application supports. Each
+operation registers itself once, at import time, under its type name (the
+string clients send, e.g. "addition"). The first lookup freezes the table
+into a read-only mapping, so dispatch is a single dict lookup and the set of
+allowed type names never changes while the application is running.
+
+The registry does not care what it stores. The calculation models register
+their Calculation subclasses, which supply the scalar implementation
+(``compute``), the batch kernel, the operand-count rules and the cost
+estimators as class attributes and methods.
+
+Classes:
+- OperationRegistry: Name -> implementation table that freezes on first use.
+
+Attributes:
+- operation_registry: The application-wide registry.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Optional
+
+
+class OperationRegistry:
+    """
+    Name -> implementation table for calculation operations.
+
+    Names are case-insensitive and stored in lowercase. Registration is only
+    allowed until the table is frozen, which happens on the first lookup or
+    an explicit ``freeze()`` call.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, Any] = {}
+        self._table: Optional[Mapping[str, Any]] = None
+        self._names: FrozenSet[str] = frozenset()
+
+    def register(self, name: str, implementation: Any) -> None:
+        """
+        Add an operation to the table.
+
+        Raises:
+            RuntimeError: If the table has already been frozen
+            ValueError: If another implementation is registered under the name
+        """
+        if self._table is not None:
+            raise RuntimeError(f"Cannot register operation '{name}': the registry is frozen.")
+        name = name.lower()
+        existing = self._pending.get(name)
+        if existing is not None and existing is not implementation:
+            raise ValueError(f"Operation '{name}' is already registered.")
+        self._pending[name] = implementation
+
+    def freeze(self) -> Mapping[str, Any]:
+        """Build the read-only dispatch table. Safe to call more than once."""
+        if self._table is None:
+            self._table = MappingProxyType(dict(self._pending))
+            self._names = frozenset(self._table)
+        return self._table
+
+    @property
+    def table(self) -> Mapping[str, Any]:
+        """The frozen name -> implementation mapping."""
+        return self.freeze()
+
+    @property
+    def names(self) -> FrozenSet[str]:
+        """The registered operation names."""
+        self.freeze()
+        return self._names
+
+    def get(self, name: str) -> Optional[Any]:
+        """Look up an operation by name (case-insensitive); None if unknown."""
+        return self.table.get(name.lower())
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self.table
+
+
+# Application-wide registry, filled in by app.models.calculation
+operation_registry = OperationRegistry()
@@ -0,0 +1,342 @@
+# app/partitions.py
+"""
+Calculations Table Partitioning
+
+With ``CALCULATION_PARTITIONING`` set, ``calculations`` is created as a
+declarative PostgreSQL partitioned table instead of a single heap:
+
+- ``month``: ``PARTITION BY RANGE (created_at)``, one partition per calendar
+  month (``calculations_y2026m10``) plus ``calculations_default`` for rows
+  outside every month that has a partition. Lookups and pages bounded on
+  ``created_at`` only scan the months they touch, and ``Calculation.id_criteria``
+  adds such a bound to id lookups using the time inside version 7 ids.
+  Retention drops or detaches whole months, which is a catalog change
+  instead of a DELETE that rewrites indexes and leaves dead tuples behind.
+  Only the expired rows that landed in the default partition, normally
+  few, are deleted (or moved to ``calculations_default_expired``) row by row.
+- ``hash``: ``PARTITION BY HASH (user_id)`` into ``CALCULATION_HASH_PARTITIONS``
+  partitions (``calculations_p00`` ...). Every request handler filters on
+  ``user_id``, so each one touches a single partition, whose indexes are a
+  fraction of the size of the whole table's.
+
+PostgreSQL requires the partition key in the primary key, so the primary key
+becomes ``(id, created_at)`` or ``(id, user_id)``; the models still identify
+a calculation by ``id`` alone. The indexes declared on the model are created
+on the parent and cascade to every partition. ``calculation_dependencies``
+loses its foreign keys to ``calculations`` (see that module).
+
+The table is only created partitioned when it does not exist yet; an existing
+table is left as it is. To convert one, rename it, start the app (or run
+``python -m app.partitions create``) and copy the rows across with
+``INSERT INTO calculations SELECT * FROM <old name>``.
+
+Usage:
+    python -m app.partitions status
+    python -m app.partitions create
+    python -m app.partitions maintain --months-ahead 3 --retention-months 12
+    python -m app.partitions maintain --retention-months 12 --detach --dry-run
+"""
+
+import argparse
+import re
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import MetaData, PrimaryKeyConstraint, Table, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import engine as default_engine
+from app.models.calculation import Calculation
+from app.models.calculation_dependency import CalculationDependency
+from app.models.calculation_payload import CalculationPayload
+from app.models.calculation_stats import UserCalculationStats
+from app.models.user import User
+
+PARTITION_MODES = ("none", "month", "hash")
+# Partition key column of each mode
+PARTITION_KEYS = {"month": "created_at", "hash": "user_id"}
+# pg_partitioned_table.partstrat of each mode
+_STRATEGIES = {"r": "month", "h": "hash"}
+
+_MONTH_NAME = re.compile(r"^calculations_y(\d{4})m(\d{2})$")
+DEFAULT_PARTITION = "calculations_default"
+# Standalone table that keeps the default partition's expired rows with --detach
+DEFAULT_EXPIRED_TABLE = "calculations_default_expired"
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing ``day``."""
+    return date(day.year, day.month, 1)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month ``months`` after the one containing ``day``."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_partition_name(start: date) -> str:
+    return f"calculations_y{start.year:04d}m{start.month:02d}"
+
+
+def parse_month_partition(name: str) -> Optional[date]:
+    """Start of the month a partition covers, or None if the name is not a monthly partition."""
+    match = _MONTH_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def partitioned_table(mode: str, metadata: Optional[MetaData] = None) -> Table:
+    """
+    A copy of the ``calculations`` table declared as partitioned.
+
+    The copy lives in its own MetaData, next to copies of ``users`` and
+    ``calculation_payloads`` for its foreign keys, so the model's table
+    keeps its plain definition.
+
+    Raises:
+        ValueError: If the mode is not "month" or "hash"
+    """
+    if mode not in PARTITION_KEYS:
+        raise ValueError(f"Unknown partitioning mode: {mode}")
+    metadata = metadata if metadata is not None else MetaData()
+    User.__table__.to_metadata(metadata)
+    CalculationPayload.__table__.to_metadata(metadata)
+    table = Calculation.__table__.to_metadata(metadata)
+    key = PARTITION_KEYS[mode]
+    table.c[key].primary_key = True
+    table.append_constraint(PrimaryKeyConstraint("id", key))
+    table.dialect_options["postgresql"]["partition_by"] = (
+        f"RANGE ({key})" if mode == "month" else f"HASH ({key})"
+    )
+    return table
+
+
+def partition_strategy(bind: Engine = default_engine) -> Optional[str]:
+    """Partitioning mode of the existing ``calculations`` table, or None if it is not partitioned."""
+    with bind.connect() as conn:
+        strategy = conn.execute(text(
+            "SELECT p.partstrat FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = 'calculations' AND c.relnamespace = current_schema()::regnamespace"
+        )).scalar()
+    return _STRATEGIES.get(strategy)
+
+
+def list_partitions(bind: Engine = default_engine) -> List[str]:
+    """Names of the partitions currently attached to ``calculations``, sorted."""
+    with bind.connect() as conn:
+        return list(conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'calculations'::regclass ORDER BY c.relname"
+        )).scalars())
+
+
+def _create_month_partition(conn, start: date) -> None:
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {month_partition_name(start)} PARTITION OF calculations "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')"
+    ))
+
+
+def create_partitioned_table(
+    bind: Engine = default_engine,
+    mode: Optional[str] = None,
+    hash_partitions: Optional[int] = None,
+    months_ahead: Optional[int] = None,
+    today: Optional[date] = None,
+) -> bool:
+    """
+    Create ``calculations`` as a partitioned table, with its first partitions.
+
+    Month mode creates the current month, ``months_ahead`` further months
+    and the default partition; hash mode creates all ``hash_partitions``
+    partitions. Must run before ``Base.metadata.create_all``, which then
+    leaves the existing table alone.
+
+    Args:
+        bind: Engine of the database
+        mode: "month" or "hash"; defaults to ``CALCULATION_PARTITIONING``
+        hash_partitions: Defaults to ``CALCULATION_HASH_PARTITIONS``
+        months_ahead: Defaults to ``CALCULATION_PARTITION_MONTHS_AHEAD``
+        today: Date used as the current month (defaults to today)
+
+    Returns:
+        bool: False if ``calculations`` already existed and nothing was done
+
+    Raises:
+        ValueError: If the mode or partition count is invalid
+    """
+    mode = mode or settings.CALCULATION_PARTITIONING
+    hash_partitions = hash_partitions or settings.CALCULATION_HASH_PARTITIONS
+    months_ahead = settings.CALCULATION_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    table = partitioned_table(mode)
+    if hash_partitions < 1:
+        raise ValueError("Hash partitioning needs at least one partition.")
+
+    with bind.begin() as conn:
+        if inspect(conn).has_table(table.name):
+            return False
+        table.metadata.create_all(conn)  # users first, for the owner foreign key
+        if mode == "month":
+            current = month_start(today or date.today())
+            for offset in range(months_ahead + 1):
+                _create_month_partition(conn, add_months(current, offset))
+            conn.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF calculations DEFAULT"))
+        else:
+            for remainder in range(hash_partitions):
+                conn.execute(text(
+                    f"CREATE TABLE calculations_p{remainder:02d} PARTITION OF calculations "
+                    f"FOR VALUES WITH (MODULUS {hash_partitions}, REMAINDER {remainder})"
+                ))
+    return True
+
+
+def maintain_partitions(
+    bind: Engine = default_engine,
+    months_ahead: Optional[int] = None,
+    retention_months: Optional[int] = None,
+    detach: bool = False,
+    dry_run: bool = False,
+    today: Optional[date] = None,
+    report: Callable[[str], None] = print,
+) -> Dict[str, List[str]]:
+    """
+    Create upcoming monthly partitions and retire expired ones.
+
+    Meant to run daily, e.g. from cron. Partitions are created for the
+    current month and ``months_ahead`` further months, so rows never land
+    in the default partition by accident. A monthly partition expires once
+    it ends on or before the first day of the month ``retention_months``
+    before the current one; it is dropped, or with ``detach`` detached and
+    kept as a standalone table for archiving. Rows of the default partition
+    created before the same cutoff are deleted, or with ``detach`` moved to
+    ``calculations_default_expired``. In the same transaction, dependency
+    edges of the removed rows are deleted and the report rollup is rebuilt
+    for the owners of those rows only.
+
+    Args:
+        bind: Engine of the database
+        months_ahead: Defaults to ``CALCULATION_PARTITION_MONTHS_AHEAD``
+        retention_months: Defaults to ``CALCULATION_RETENTION_MONTHS``; 0 keeps everything
+        detach: Detach expired partitions instead of dropping them
+        dry_run: Only report what would be done
+        today: Date used as the current month (defaults to today)
+        report: Receives one line per action
+
+    Returns:
+        dict: Partition names that were (or would be) ``created``, ``dropped``
+        and ``detached``, and ``purged``: the default partition if it held
+        expired rows
+
+    Raises:
+        ValueError: If ``calculations`` is not partitioned by month
+    """
+    months_ahead = settings.CALCULATION_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    retention_months = settings.CALCULATION_RETENTION_MONTHS if retention_months is None else retention_months
+    if partition_strategy(bind) != "month":
+        raise ValueError("calculations is not partitioned by month.")
+
+    partitions = list_partitions(bind)
+    existing = {parse_month_partition(name): name for name in partitions}
+    current = month_start(today or date.today())
+    actions = {"created": [], "dropped": [], "detached": [], "purged": []}
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        if start not in existing:
+            actions["created"].append(month_partition_name(start))
+    if retention_months > 0:
+        cutoff = add_months(current, -retention_months)
+        expired = sorted(name for start, name in existing.items() if start and add_months(start, 1) <= cutoff)
+        actions["detached" if detach else "dropped"].extend(expired)
+        # Expired rows outside every monthly partition
+        expired_default = f"SELECT {{}} FROM {DEFAULT_PARTITION} WHERE created_at < '{cutoff.isoformat()}'"
+        if DEFAULT_PARTITION in partitions:
+            with bind.connect() as conn:
+                if conn.execute(text(expired_default.format("1") + " LIMIT 1")).first():
+                    actions["purged"].append(DEFAULT_PARTITION)
+
+    for verb, names in actions.items():
+        for name in names:
+            report(f"{verb}{' (dry run)' if dry_run else ''}: {name}")
+    if dry_run:
+        return actions
+
+    expired = actions["detached"] + actions["dropped"] + actions["purged"]
+    with Session(bind) as db:
+        for name in actions["created"]:
+            _create_month_partition(db.connection(), parse_month_partition(name))
+        # Owners of the retired rows, read before they leave calculations
+        owners = set(db.execute(text(" UNION ".join(
+            expired_default.format("DISTINCT user_id") if name == DEFAULT_PARTITION
+            else f"SELECT DISTINCT user_id FROM {name}"
+            for name in expired
+        ))).scalars()) if expired else set()
+        for name in actions["detached"]:
+            db.execute(text(f"ALTER TABLE calculations DETACH PARTITION {name}"))
+        for name in actions["dropped"]:
+            db.execute(text(f"DROP TABLE {name}"))
+        if actions["purged"]:
+            if detach:
+                db.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_EXPIRED_TABLE} (LIKE calculations)"))
+                db.execute(text(f"INSERT INTO {DEFAULT_EXPIRED_TABLE} {expired_default.format('*')}"))
+            purged = db.execute(text(
+                f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < '{cutoff.isoformat()}'"
+            )).rowcount
+        if expired:
+            removed = CalculationDependency.delete_orphans(db)
+            users = UserCalculationStats.rebuild(db, owners)
+        db.commit()
+
+    if actions["purged"]:
+        target = f"moved to {DEFAULT_EXPIRED_TABLE}" if detach else "deleted"
+        report(f"{target}: {purged} expired rows of {DEFAULT_PARTITION}")
+    if expired:
+        report(f"removed {removed} dependency edges, rebuilt stats for {users} users")
+    return actions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Create, inspect and retire calculations partitions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="Show the partitioning mode and partitions")
+    create = commands.add_parser("create", help="Create calculations as a partitioned table")
+    create.add_argument("--mode", choices=PARTITION_MODES[1:], default=None,
+                        help="Partitioning mode (default: CALCULATION_PARTITIONING)")
+    maintain = commands.add_parser("maintain", help="Create upcoming and retire expired monthly partitions")
+    maintain.add_argument("--months-ahead", type=int, default=None,
+                          help="Future months to create (default: CALCULATION_PARTITION_MONTHS_AHEAD)")
+    maintain.add_argument("--retention-months", type=int, default=None,
+                          help="Whole months kept before the current one; 0 keeps all "
+                               "(default: CALCULATION_RETENTION_MONTHS)")
+    maintain.add_argument("--detach", action="store_true", help="Detach expired partitions instead of dropping them")
+    maintain.add_argument("--dry-run", action="store_true", help="Report actions without running them")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "status":
+            mode = partition_strategy()
+            print(f"mode: {mode or 'none'}")
+            for name in list_partitions() if mode else []:
+                print(name)
+        elif args.command == "create":
+            mode = args.mode or settings.CALCULATION_PARTITIONING
+            if mode == "none":
+                parser.error("set CALCULATION_PARTITIONING or pass --mode")
+            created = create_partitioned_table(mode=mode)
+            print("Created partitioned calculations table." if created else "calculations already exists.")
+        else:
+            maintain_partitions(
+                months_ahead=args.months_ahead, retention_months=args.retention_months,
+                detach=args.detach, dry_run=args.dry_run,
+            )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())  # pragma: no cover
@@ -0,0 +1,140 @@
+# app/payloads.py
+"""
+Content-Addressed Payload Job
+
+Maintains ``calculation_payloads``, the shared content of calculations
+stored with ``CALCULATION_CONTENT_ADDRESSED`` enabled (see
+``app.models.calculation_payload``):
+
+- ``migrate`` moves the content of calculations that still store it inline
+  into payloads, so existing history is deduplicated too. Rows are read in
+  keyset batches; each batch stores its payloads with one INSERT ... ON
+  CONFLICT DO UPDATE and points the rows at them with one bulk UPDATE, in
+  one transaction. The job can be stopped and restarted at any point.
+- ``gc`` deletes payloads that no calculation references any more, after
+  deletes, updates or archiving. Schedule it like ``app.partitions
+  maintain``.
+
+PostgreSQL only returns the space freed in ``calculations`` after
+``VACUUM FULL calculations``.
+
+Usage:
+    python -m app.payloads migrate --batch-size 5000
+    python -m app.payloads migrate --dry-run
+    python -m app.payloads gc
+"""
+
+import argparse
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+
+from app.database import SessionLocal
+from app.models.calculation import Calculation
+from app.models.calculation_payload import PAYLOAD_COLUMNS, CalculationPayload
+from app.models.user import User  # noqa: F401 - configures the Calculation.user relationship
+
+
+def migrate_payloads(
+    batch_size: int = 5000,
+    dry_run: bool = False,
+    session_factory: Callable = SessionLocal,
+    report: Callable[[str], None] = print,
+) -> Dict[str, float]:
+    """
+    Move inline calculation content into content-addressed payloads.
+
+    Args:
+        batch_size: Calculations moved per transaction
+        dry_run: Count the calculations that would move without moving them
+        session_factory: Creates the database session
+        report: Receives a progress line after every batch
+
+    Returns:
+        dict: Totals for ``migrated``, ``payloads`` (payloads referenced
+        afterwards) and ``seconds``
+    """
+    totals = {"migrated": 0, "payloads": 0, "seconds": 0.0}
+    started = time.monotonic()
+    columns = [getattr(Calculation, name) for name in PAYLOAD_COLUMNS]
+    with session_factory() as db:
+        if dry_run:
+            totals["migrated"] = db.scalar(
+                select(func.count(Calculation.id)).where(Calculation.payload_hash.is_(None))
+            )
+            report(f"would move {totals['migrated']} calculations into payloads")
+        last_id = None
+        while not dry_run:
+            batch = db.execute(
+                select(Calculation.id, Calculation.type, *columns)
+                .where(Calculation.payload_hash.is_(None))
+                .where(*([Calculation.id > last_id] if last_id is not None else []))
+                .order_by(Calculation.id)
+                .limit(batch_size)
+            ).mappings().all()
+            if not batch:
+                break
+            last_id = batch[-1]["id"]
+            rows, _ = CalculationPayload.split_rows(db, [dict(row) for row in batch])
+            db.execute(update(Calculation), [
+                {"id": row["id"], "payload_hash": row["payload_hash"], **dict.fromkeys(PAYLOAD_COLUMNS)}
+                for row in rows
+            ])
+            db.commit()
+
+            totals["migrated"] += len(batch)
+            elapsed = time.monotonic() - started
+            report(f"migrated={totals['migrated']} rate={totals['migrated'] / max(elapsed, 1e-9):.0f} rows/s")
+        if not dry_run:
+            totals["payloads"] = db.scalar(select(func.count(func.distinct(Calculation.payload_hash))))
+
+    totals["seconds"] = time.monotonic() - started
+    return totals
+
+
+def collect_garbage(min_age: timedelta = timedelta(hours=1), session_factory: Callable = SessionLocal) -> int:
+    """
+    Delete payloads that no calculation references.
+
+    Args:
+        min_age: Payloads younger than this are kept
+        session_factory: Creates the database session
+
+    Returns:
+        int: Number of payloads deleted
+    """
+    with session_factory() as db:
+        deleted = CalculationPayload.delete_unreferenced(db, min_age)
+        db.commit()
+    return deleted
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain content-addressed calculation payloads.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate = commands.add_parser("migrate", help="Move inline calculation content into payloads")
+    migrate.add_argument("--batch-size", type=int, default=5000, help="Calculations per transaction (default: 5000)")
+    migrate.add_argument("--dry-run", action="store_true", help="Count calculations without moving them")
+    gc = commands.add_parser("gc", help="Delete payloads no calculation references")
+    gc.add_argument("--min-age-minutes", type=int, default=60,
+                    help="Keep payloads younger than this, which may be in use by running inserts (default: 60)")
+    args = parser.parse_args(argv)
+
+    if args.command == "gc":
+        print(f"Done: {collect_garbage(timedelta(minutes=args.min_age_minutes))} unreferenced payloads deleted")
+        return 0
+    totals = migrate_payloads(batch_size=args.batch_size, dry_run=args.dry_run)
+    if args.dry_run:
+        print(f"Done: {totals['migrated']} calculations to move (dry run)")
+    else:
+        print(
+            f"Done: {totals['migrated']} calculations moved in {totals['seconds']:.1f}s, "
+            f"{totals['payloads']} distinct payloads referenced"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())  # pragma: no cover
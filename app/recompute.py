@@ -0,0 +1,262 @@
+# app/recompute.py
+"""
+Bulk Result Recompute Job
+
+Recomputes the stored ``result`` of every calculation, for use after the
+semantics of an operation change (for example float handling in
+``Division.get_result``).
+
+The job is built to run over tens of millions of rows:
+- Rows are streamed with a server-side cursor (``yield_per``), never loaded
+  all at once.
+- Each batch is evaluated in a process pool with the vectorized
+  ``Calculation.evaluate_batch`` engine.
+- Only results that actually changed are written back, with one bulk
+  UPDATE and one commit per batch.
+- Progress and throughput are reported after every batch.
+
+Calculations stored in the content-addressed mode hold no inputs or result
+of their own; the job recomputes their shared ``calculation_payloads`` rows
+instead, after the inline calculations.
+
+A changed result is copied into the calculations that link to it (see
+``CalculationDependency``). Once every row has been recomputed, the job
+propagates from each changed calculation that has dependents, upstream
+sources first, with one transaction per source.
+
+Usage:
+    python -m app.recompute --batch-size 5000 --workers 4
+    python -m app.recompute --dry-run
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, update
+
+from app.database import SessionLocal
+from app.models.calculation import Calculation
+from app.models.calculation_dependency import CalculationDependency, topological_order
+from app.models.calculation_payload import CalculationPayload
+from app.models.user import User  # noqa: F401 - configures the Calculation.user relationship
+
+# (id, type, inputs (a float64 view for packed rows), expression, operation,
+# stored result, stored array result) as read from the calculations table, or
+# with the hash as the id from calculation_payloads
+Row = Tuple[UUID, str, list, Optional[str], Optional[str], Optional[float], Optional[list]]
+
+
+def _same_result(old, new) -> bool:
+    if old is None:
+        return False
+    if isinstance(old, float) and math.isnan(old):
+        return isinstance(new, float) and math.isnan(new)
+    return old == new
+
+
+def _decoded(row) -> Row:
+    """
+    A selected row with its stored inputs decoded from whichever column holds
+    them. Packed inputs stay a float64 view of the stored bytes, which the
+    batch kernels evaluate without building a list.
+    """
+    calc_id, calc_type, inputs_json, inputs_array, inputs_packed, *rest = row
+    return (calc_id, calc_type, Calculation.decode_operands(inputs_json, inputs_array, inputs_packed), *rest)
+
+
+def recompute_chunk(rows: List[Row], key: str = "id") -> Tuple[List[Dict], int]:
+    """
+    Recompute one batch of rows. Runs inside a worker process.
+
+    Args:
+        rows: Rows read from the calculations or calculation_payloads table
+        key: Name of the primary key the updates are addressed by
+
+    Returns:
+        tuple: ``(updates, errors)`` where ``updates`` holds
+        ``{key, "result", "result_array"}`` for every row whose result changed, and ``errors`` counts rows that
+        no longer evaluate (they are left untouched)
+    """
+    calculations = [
+        Calculation.create(calc_type, None, inputs, expression=expression, operation=operation)
+        for _, calc_type, inputs, expression, operation, _, _ in rows
+    ]
+    updates = []
+    errors = 0
+    for (calc_id, *_, old_result, old_array), new_result in zip(rows, Calculation.evaluate_batch(calculations)):
+        if isinstance(new_result, ValueError):
+            errors += 1
+            continue
+        if not isinstance(new_result, list):
+            new_result = float(new_result)
+        if not _same_result(old_result if old_array is None else old_array, new_result):
+            updates.append({key: calc_id, **Calculation.result_columns(new_result)})
+    return updates, errors
+
+
+def linked_sources(session, model, keys: Iterable) -> Set[UUID]:
+    """
+    IDs of the calculations behind changed rows that other calculations link to.
+
+    Args:
+        model: Calculation or CalculationPayload, the table the keys address
+        keys: Calculation ids, or payload hashes
+    """
+    if model is CalculationPayload:
+        keys = select(Calculation.id).where(Calculation.payload_hash.in_(list(keys)))
+    else:
+        keys = list(keys)
+    return set(session.scalars(
+        select(CalculationDependency.source_id).where(CalculationDependency.source_id.in_(keys)).distinct()
+    ))
+
+
+def propagate_changes(session, source_ids: Set[UUID]) -> Tuple[int, int]:
+    """
+    Bring the dependents of recomputed calculations up to date.
+
+    Sources are propagated in topological order, so a source that depends
+    on another is handled after it and sees its new value. Each source is
+    committed on its own; one whose dependents no longer evaluate is rolled
+    back and counted as an error.
+
+    Returns:
+        tuple: ``(recomputed, errors)``
+    """
+    downstream = {source: CalculationDependency.downstream_ids(session, source) for source in source_ids}
+    order = topological_order({
+        source: [upstream for upstream in source_ids if source in downstream[upstream]]
+        for source in source_ids
+    })
+    recomputed = errors = 0
+    for source_id in order:
+        calculation = (
+            session.query(Calculation).options(*Calculation.payload_loading())
+            .filter(*Calculation.id_criteria(source_id)).one_or_none()
+        )
+        if calculation is None:
+            continue
+        try:
+            recomputed += len(CalculationDependency.propagate(session, calculation))
+            session.commit()
+        except ValueError:
+            session.rollback()
+            errors += 1
+    return recomputed, errors
+
+
+def recompute_results(
+    batch_size: int = 5000,
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+    session_factory: Callable = SessionLocal,
+    report: Callable[[str], None] = print,
+) -> Dict[str, float]:
+    """
+    Recompute and write back the result of every stored calculation.
+
+    Args:
+        batch_size: Rows fetched per server-side cursor batch and per UPDATE
+        workers: Size of the process pool; 0 evaluates in this process,
+            None uses one worker per CPU
+        dry_run: Count changes without writing them
+        session_factory: Creates database sessions (one reads, one writes)
+        report: Receives a progress line after every batch
+
+    Returns:
+        dict: Totals for ``processed``, ``changed``, ``errors``,
+        ``propagated`` (dependent calculations brought up to date) and
+        ``seconds``
+    """
+    totals = {"processed": 0, "changed": 0, "errors": 0, "propagated": 0, "seconds": 0.0}
+    started = time.monotonic()
+    sources: Set[UUID] = set()
+
+    with session_factory() as reader, session_factory() as writer:
+        def handle(model, key: str, batch_rows: int, outcome: Tuple[List[Dict], int]):
+            updates, errors = outcome
+            if updates and not dry_run:
+                writer.execute(update(model), updates)
+                writer.commit()
+                sources.update(linked_sources(writer, model, [row[key] for row in updates]))
+            totals["processed"] += batch_rows
+            totals["changed"] += len(updates)
+            totals["errors"] += errors
+            elapsed = time.monotonic() - started
+            report(
+                f"processed={totals['processed']} changed={totals['changed']} "
+                f"errors={totals['errors']} rate={totals['processed'] / max(elapsed, 1e-9):.0f} rows/s"
+            )
+
+        # Inline calculations first, then the shared payloads
+        tables = (
+            (Calculation, "id", [Calculation.payload_hash.is_(None)]),
+            (CalculationPayload, "hash", []),
+        )
+        if workers != 0:
+            workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers) if workers else None
+        try:
+            for model, key, criteria in tables:
+                stream = reader.execute(
+                    select(
+                        getattr(model, key), model.type, model.inputs_json, model.inputs_array,
+                        model.inputs_packed, model.expression, model.operation,
+                        model.result, model.result_array,
+                    )
+                    .where(*criteria)
+                    .execution_options(yield_per=batch_size)
+                )
+                partitions = ([_decoded(row) for row in partition] for partition in stream.partitions())
+
+                if executor is None:
+                    for rows in partitions:
+                        handle(model, key, len(rows), recompute_chunk(rows, key))
+                    continue
+                # Bound the batches in flight so memory stays constant
+                max_in_flight = 2 * workers
+                pending = {}
+                for rows in partitions:
+                    pending[executor.submit(recompute_chunk, rows, key)] = len(rows)
+                    if len(pending) >= max_in_flight:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            handle(model, key, pending.pop(future), future.result())
+                for future in wait(pending).done:
+                    handle(model, key, pending[future], future.result())
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if sources:
+            totals["propagated"], errors = propagate_changes(writer, sources)
+            totals["errors"] += errors
+            report(f"propagated={totals['propagated']} from {len(sources)} changed sources")
+
+    totals["seconds"] = time.monotonic() - started
+    return totals
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Recompute the stored result of every calculation.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per batch (default: 5000)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes; 0 runs in-process (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing them")
+    args = parser.parse_args(argv)
+
+    totals = recompute_results(batch_size=args.batch_size, workers=args.workers, dry_run=args.dry_run)
+    print(
+        f"Done: {totals['processed']} rows in {totals['seconds']:.1f}s, "
+        f"{totals['changed']} changed{' (dry run)' if args.dry_run else ''}, "
+        f"{totals['propagated']} dependents updated, {totals['errors']} errors"
+    )
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -13,8 +13,19 @@ from .calculation import (
     CalculationType,
     CalculationBase,
     CalculationCreate,
+    CalculationReference,
     CalculationUpdate,
-    CalculationResponse
+    CalculationResponse,
+    CalculationBatchItemResult,
+    CalculationBatchResponse,
+    CalculationIngestError,
+    CalculationIngestSummary,
+    CalculationGraphNode,
+    CalculationGraphRequest,
+    CalculationGraphResponse,
+    SweepRange,
+    CalculationSweepRequest,
+    CalculationSweepResponse
 )
 
 __all__ = [
@@ -30,6 +41,17 @@ __all__ = [
     'CalculationType',
     'CalculationBase',
     'CalculationCreate',
+    'CalculationReference',
     'CalculationUpdate',
     'CalculationResponse',
+    'CalculationBatchItemResult',
+    'CalculationBatchResponse',
+    'CalculationIngestError',
+    'CalculationIngestSummary',
+    'CalculationGraphNode',
+    'CalculationGraphRequest',
+    'CalculationGraphResponse',
+    'SweepRange',
+    'CalculationSweepRequest',
+    'CalculationSweepResponse',
 ]
\ No newline at end of file
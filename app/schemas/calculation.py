@@ -12,31 +12,38 @@ The schemas use Pydantic's validation system to ensure data integrity and provid
 clear error messages when validation fails.
 """
 
+import math
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict, model_validator, field_validator
-from typing import List, Optional
+from pydantic import (
+    BaseModel, Field, ConfigDict, ValidationInfo, ValidatorFunctionWrapHandler, model_validator, field_validator
+)
+from typing import Dict, List, Optional, Union
 from uuid import UUID
 from datetime import datetime
 
-class CalculationType(str, Enum):
-    """
+from app.core.config import settings
+from app.core.packed import decode_base64_floats, unpack_floats
+from app.models.calculation import operation_registry
+
+# Built from the operation registry, so every registered calculation type is
+# accepted without listing it here. Members are the upper-cased type names,
+# e.g. CalculationType.ADDITION == "addition".
+CalculationType = Enum(
+    "CalculationType",
+    {name.upper(): name for name in sorted(operation_registry.names)},
+    type=str,
+    module=__name__,
+)
+CalculationType.__doc__ = """
     Enumeration of valid calculation types.
     
     Using an Enum provides type safety and ensures that only valid
     calculation types are accepted. The str base class ensures that
     the values are serialized as strings in JSON.
-    
-    Benefits of using Enum:
-    - Type checking at compile time
-    - Documentation of valid values
-    - Prevents typos and invalid values
-    - Self-documenting code
-    """
-    ADDITION = "addition"
-    SUBTRACTION = "subtraction"
-    MULTIPLICATION = "multiplication"
-    DIVISION = "division"
-    EXPONENTIATION = "exponentiation"
+    """
+
+# An input value: a number, a vector, or a matrix given as a list of rows
+Value = Union[float, List[float], List[List[float]]]
 
 class CalculationBase(BaseModel):
     """
@@ -50,15 +57,30 @@ class CalculationBase(BaseModel):
     """
     type: CalculationType = Field(
         ...,  # The ... means this field is required
-        description="Type of calculation (addition, subtraction, multiplication, division, exponentiation)",
+        description=f"Type of calculation ({', '.join(sorted(operation_registry.names))})",
         example="addition"
     )
-    inputs: List[float] = Field(
+    inputs: List[Value] = Field(
         ...,  # The ... means this field is required
-        description="List of numeric inputs for the calculation",
+        description=(
+            "List of inputs for the calculation; vector and matrix types take lists of numbers or rows. "
+            "Long lists of numbers may instead be sent as a base64 string of little-endian float64 values"
+        ),
         example=[10.5, 3, 2],
         min_items=1  # Allow at least 1 number, business logic will validate specific requirements
     )
+    expression: Optional[str] = Field(
+        None,
+        description="Arithmetic expression over the inputs; only for the expression type",
+        example="(a + b) / c ** 2",
+        max_length=settings.CALCULATION_EXPRESSION_MAX_LENGTH
+    )
+    operation: Optional[str] = Field(
+        None,
+        description="Calculation type evaluated at every point; only for the sweep type",
+        example="exponentiation",
+        max_length=50
+    )
 
     @field_validator("type", mode="before")
     @classmethod
@@ -68,7 +90,7 @@ class CalculationBase(BaseModel):
         
         This validator ensures that:
         1. The input is a string
-        2. The value is one of the allowed calculation types
+        2. The value is one of the registered calculation types
         3. The value is consistently converted to lowercase
         
         Args:
@@ -80,34 +102,51 @@ class CalculationBase(BaseModel):
         Raises:
             ValueError: If the input is not a valid calculation type
         """
-        allowed = {e.value for e in CalculationType}
-        # Ensure v is a string and check (in lowercase) if it's allowed.
-        if not isinstance(v, str) or v.lower() not in allowed:
-            raise ValueError(f"Type must be one of: {', '.join(sorted(allowed))}")
+        # Ensure v is a string and check (in lowercase) if it's registered.
+        if not isinstance(v, str) or v.lower() not in operation_registry.names:
+            raise ValueError(f"Type must be one of: {', '.join(sorted(operation_registry.names))}")
         return v.lower()
 
-    @field_validator("inputs", mode="before")
+    @field_validator("inputs", mode="wrap")
     @classmethod
-    def check_inputs_is_list(cls, v):
+    def check_inputs_is_list(cls, v, handler: ValidatorFunctionWrapHandler, info: ValidationInfo):
         """
-        Validates that the inputs field is a list.
+        Validates that the inputs field is a list of bounded length.
         
         This validator runs before type conversion, ensuring that
         the input is actually a list before attempting to convert
-        each element to float.
+        each element to float, and that oversized lists are rejected
+        before any of that work is done. The length limit depends on
+        the calculation type (statistical types accept longer lists).
+
+        Packed inputs, either a base64 string or the raw bytes of an
+        octet-stream body holding little-endian float64 values, are
+        decoded in one step and skip the per-element conversion.
         
         Args:
             v: The input value to validate
+            handler: The default validation for the field
+            info: Validation context holding the already validated type
             
         Returns:
             list: The validated list
             
         Raises:
-            ValueError: If the input is not a list
+            ValueError: If the input is not a list or valid packed values,
+                or is too long
         """
+        calculation_class = operation_registry.get(info.data.get("type") or "")
+        limit = calculation_class.operand_limit() if calculation_class else settings.CALCULATION_MAX_OPERANDS
+        if isinstance(v, (str, bytes, bytearray)):
+            values = decode_base64_floats(v) if isinstance(v, str) else unpack_floats(v)
+            if len(values) > limit:
+                raise ValueError(f"At most {limit} numbers are allowed")
+            return values
         if not isinstance(v, list):
             raise ValueError("Input should be a valid list")
-        return v
+        if len(v) > limit:
+            raise ValueError(f"At most {limit} numbers are allowed")
+        return handler(v)
 
     @model_validator(mode='after')
     def validate_inputs(self) -> "CalculationBase":
@@ -127,6 +166,10 @@ class CalculationBase(BaseModel):
         # This allows for proper 400 status codes instead of 422
         if len(self.inputs) < 1:
             raise ValueError("At least one number is required")
+        if self.expression is not None and self.type != "expression":
+            raise ValueError("An expression can only be given for expression calculations")
+        if self.operation is not None and self.type != "sweep":
+            raise ValueError("An operation can only be given for sweep calculations")
         return self
 
     model_config = ConfigDict(
@@ -138,7 +181,11 @@ class CalculationBase(BaseModel):
             "examples": [
                 {"type": "addition", "inputs": [10.5, 3, 2]},
                 {"type": "division", "inputs": [100, 2]},
-                {"type": "exponentiation", "inputs": [2, 8]}
+                {"type": "exponentiation", "inputs": [2, 8]},
+                {"type": "expression", "inputs": [1, 2, 3], "expression": "(a + b) / c ** 2"},
+                {"type": "vector_add", "inputs": [[1, 2, 3], [4, 5, 6]]},
+                {"type": "matmul", "inputs": [[[1, 2], [3, 4]], [[5], [6]]]},
+                {"type": "sweep", "inputs": [2, [0, 1, 2, 3]], "operation": "exponentiation"}
             ]
         }
     )
@@ -168,6 +215,29 @@ class CalculationCreate(CalculationBase):
         }
     )
 
+class CalculationReference(BaseModel):
+    """
+    An operand that takes its value from another calculation's result.
+
+    ``calculation_id`` refers to a stored calculation owned by the same user;
+    ``node`` refers to another node of the same POST /calculations/graph
+    request. Exactly one of them must be given.
+    """
+    calculation_id: Optional[UUID] = Field(None, description="UUID of a stored calculation")
+    node: Optional[str] = Field(None, description="Key of another node in the same graph request")
+
+    @model_validator(mode='after')
+    def check_exactly_one_target(self) -> "CalculationReference":
+        """Ensures the reference points at exactly one thing."""
+        if (self.calculation_id is None) == (self.node is None):
+            raise ValueError("A reference needs exactly one of calculation_id or node")
+        return self
+
+    model_config = ConfigDict(extra='forbid')
+
+# An operand is either a value or a reference to another calculation's result
+Operand = Union[Value, CalculationReference]
+
 class CalculationUpdate(BaseModel):
     """
     Schema for updating an existing Calculation.
@@ -178,13 +248,27 @@ class CalculationUpdate(BaseModel):
     Note that all fields are optional (so clients can send partial updates),
     but if inputs are provided, they must pass validation.
     """
-    inputs: Optional[List[float]] = Field(
+    inputs: Optional[List[Operand]] = Field(
         None,  # None means this field is optional
-        description="Updated list of numeric inputs for the calculation",
+        description="Updated list of inputs; an item may reference another calculation's result",
         example=[42, 7],
         min_items=2  # If provided, at least 2 items are required
     )
 
+    @field_validator("inputs", mode="before")
+    @classmethod
+    def check_inputs_length(cls, v):
+        """
+        Rejects oversized input lists before they are converted to floats.
+
+        The calculation type is not part of an update, so this applies the
+        most generous per-type limit; the model enforces the exact one.
+        """
+        limit = max(c.operand_limit() for c in operation_registry.table.values())
+        if isinstance(v, list) and len(v) > limit:
+            raise ValueError(f"At most {limit} numbers are allowed")
+        return v
+
     @model_validator(mode='after')
     def validate_inputs(self) -> "CalculationUpdate":
         """
@@ -255,11 +339,16 @@ class CalculationResponse(CalculationBase):
         ..., 
         description="Time when the calculation was last updated"
     )
-    result: float = Field(
-        ...,
-        description="Result of the calculation",
+    result: Optional[float] = Field(
+        None,
+        description="Result of the calculation; null for vector and matrix results",
         example=15.5
     )
+    result_array: Optional[Union[List[float], List[List[float]]]] = Field(
+        None,
+        description="Vector or matrix result of the array calculation types",
+        example=None
+    )
 
     model_config = ConfigDict(
         # Allow conversion from SQLAlchemy models to this Pydantic model
@@ -278,3 +367,170 @@ class CalculationResponse(CalculationBase):
             }
         }
     )
+
+class CalculationBatchItemResult(BaseModel):
+    """
+    Outcome of one item in a batch create request.
+
+    Exactly one of ``calculation`` and ``error`` is set.
+    """
+    index: int = Field(..., description="Position of the item in the submitted list")
+    calculation: Optional[CalculationResponse] = Field(None, description="The stored calculation, if it succeeded")
+    error: Optional[str] = Field(None, description="Why the item was rejected, if it failed")
+
+class CalculationBatchResponse(BaseModel):
+    """
+    Schema for the response of POST /calculations/batch.
+    """
+    created: int = Field(..., description="Number of calculations stored")
+    failed: int = Field(..., description="Number of items rejected")
+    results: List[CalculationBatchItemResult] = Field(..., description="Per-item results, in submission order")
+
+class CalculationIngestError(BaseModel):
+    """
+    A rejected line from an NDJSON upload.
+    """
+    line: int = Field(..., description="1-based line number in the upload")
+    error: str = Field(..., description="Why the line was rejected")
+
+class CalculationIngestSummary(BaseModel):
+    """
+    Schema for the response of POST /calculations/ingest.
+
+    Only the first few errors are echoed back so the response size stays
+    bounded no matter how large the upload was.
+    """
+    accepted: int = Field(..., description="Number of calculations stored")
+    rejected: int = Field(..., description="Number of lines rejected")
+    errors: List[CalculationIngestError] = Field(..., description="The first rejected lines and their errors")
+
+class CalculationGraphNode(CalculationBase):
+    """
+    One calculation in a POST /calculations/graph request.
+
+    Inputs may be numbers or references to other nodes (by ``key``) or to
+    stored calculations (by ``calculation_id``).
+    """
+    key: str = Field(..., min_length=1, max_length=100, description="Name of this node within the request")
+    inputs: List[Operand] = Field(
+        ...,
+        description="Numbers or references to other calculations' results",
+        example=[{"node": "subtotal"}, 1.2],
+        min_items=1
+    )
+
+class CalculationGraphRequest(BaseModel):
+    """
+    Schema for POST /calculations/graph: several linked calculations
+    evaluated and stored together.
+    """
+    nodes: List[CalculationGraphNode] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.CALCULATION_GRAPH_MAX_NODES,
+        description="The calculations to create; any order, as long as references form no cycle"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "nodes": [
+                    {"key": "subtotal", "type": "addition", "inputs": [19.99, 5.01]},
+                    {"key": "total", "type": "multiplication", "inputs": [{"node": "subtotal"}, 1.2]}
+                ]
+            }
+        }
+    )
+
+class CalculationGraphResponse(BaseModel):
+    """
+    Schema for the response of POST /calculations/graph.
+    """
+    calculations: Dict[str, CalculationResponse] = Field(..., description="The stored calculations by node key")
+
+class SweepRange(BaseModel):
+    """
+    Evenly spaced values from ``start`` up to, but not including, ``stop``,
+    like Python's ``range()``. ``step`` may be fractional or negative.
+    """
+    start: float = Field(..., description="First value", example=0)
+    stop: float = Field(..., description="End of the range (exclusive)", example=10)
+    step: float = Field(1.0, description="Distance between values", example=1)
+
+    def count(self) -> int:
+        """Number of values in the range."""
+        return max(0, math.ceil((self.stop - self.start) / self.step))
+
+    def values(self) -> List[float]:
+        """The values in the range, computed as start + i * step."""
+        return [self.start + i * self.step for i in range(self.count())]
+
+    @model_validator(mode='after')
+    def check_range(self) -> "SweepRange":
+        """Ensures the range is finite, non-empty and not too long."""
+        if not all(math.isfinite(v) for v in (self.start, self.stop, self.step)) or self.step == 0:
+            raise ValueError("start, stop and step must be finite and step must not be zero")
+        count = self.count()
+        if count == 0:
+            raise ValueError("The range is empty")
+        if count > settings.CALCULATION_SWEEP_MAX_POINTS:
+            raise ValueError(f"At most {settings.CALCULATION_SWEEP_MAX_POINTS} values can be swept")
+        return self
+
+class CalculationSweepRequest(CalculationBase):
+    """
+    Schema for POST /calculations/sweep: one operation evaluated while a
+    single operand varies.
+
+    ``type`` is the operation and ``inputs`` are its operands, with ``null``
+    in place of the one that varies. Its values are given either as a list
+    or as a range.
+    """
+    inputs: List[Optional[float]] = Field(
+        ...,
+        description="The operation's operands, with null in place of the one that varies",
+        example=[2, None],
+        min_items=1
+    )
+    values: Optional[List[float]] = Field(
+        None,
+        min_length=1,
+        max_length=settings.CALCULATION_SWEEP_MAX_POINTS,
+        description="Values of the varying operand"
+    )
+    range: Optional[SweepRange] = Field(None, description="Evenly spaced values of the varying operand")
+    save: bool = Field(False, description="Store the whole sweep as one calculation")
+
+    @model_validator(mode='after')
+    def check_sweep(self) -> "CalculationSweepRequest":
+        """Ensures one operand varies and its values are given exactly once."""
+        if self.inputs.count(None) != 1:
+            raise ValueError("Exactly one input must be null, marking the operand to sweep")
+        if (self.values is None) == (self.range is None):
+            raise ValueError("Give exactly one of values or range")
+        return self
+
+    def sweep_inputs(self) -> list:
+        """The inputs of the equivalent sweep calculation: the null replaced by the values."""
+        values = self.values if self.values is not None else self.range.values()
+        return [values if operand is None else operand for operand in self.inputs]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "type": "exponentiation",
+                "inputs": [2, None],
+                "range": {"start": 0, "stop": 11, "step": 1},
+                "save": False
+            }
+        }
+    )
+
+class CalculationSweepResponse(BaseModel):
+    """
+    Schema for the response of POST /calculations/sweep.
+    """
+    type: str = Field(..., description="The operation that was swept")
+    values: List[float] = Field(..., description="Values of the varying operand")
+    results: List[float] = Field(..., description="Result at each value, aligned with values")
+    calculation_id: Optional[UUID] = Field(None, description="The stored sweep calculation, if save was requested")
@@ -2,7 +2,8 @@ import socket
 import subprocess
 import time
 import logging
-from typing import Generator, Dict, List
+import uuid
+from typing import Callable, Generator, Dict, List
 from contextlib import contextmanager
 
 import pytest
@@ -12,6 +13,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from playwright.sync_api import sync_playwright, Browser, Page
 
+from app.core.cache import result_cache
 from app.database import Base, get_engine, get_sessionmaker
 from app.models.user import User
 from app.core.config import settings
@@ -108,6 +110,13 @@ def setup_test_database(request):
         logger.info("Dropping test database tables...")
         drop_db()
 
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """Start and end every test with an empty shared result cache."""
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
 @pytest.fixture
 def db_session() -> Generator[Session, None, None]:
     """
@@ -158,6 +167,47 @@ def seed_users(db_session: Session, request) -> List[User]:
     logger.info(f"Seeded {len(users)} users.")
     return users
 
+@pytest.fixture
+def register_user(db_session: Session) -> Callable[[str], str]:
+    """
+    Return a function that registers and logs in a fresh user through the
+    API and returns the access token. Its argument is the username prefix.
+    """
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+
+    def register(prefix: str = "apiuser") -> str:
+        username = f"{prefix}_{uuid.uuid4().hex[:8]}"
+        password = "ApiPass123!"
+        reg_response = client.post("/auth/register", json={
+            "first_name": "Api",
+            "last_name": "User",
+            "email": f"{username}@example.com",
+            "username": username,
+            "password": password,
+            "confirm_password": password,
+        })
+        if reg_response.status_code != 201:
+            raise Exception(f"Registration failed with status {reg_response.status_code}: {reg_response.json()}")
+
+        login = client.post("/auth/login", json={"username": username, "password": password})
+        if login.status_code != 200:
+            raise Exception(f"Login failed with status {login.status_code}: {login.json()}")
+        return login.json()["access_token"]
+
+    return register
+
+@pytest.fixture
+def user_token(register_user, request) -> str:
+    """
+    Access token of a fresh user registered through the API. Usernames start
+    with "apiuser" unless a 'param' value gives another prefix (e.g., via
+    @pytest.mark.parametrize(..., indirect=True)).
+    """
+    return register_user(getattr(request, "param", "apiuser"))
+
 # ======================================================================================
 # FastAPI Server Fixture
 # ======================================================================================
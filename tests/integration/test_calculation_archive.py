@@ -0,0 +1,109 @@
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.archive import archive_calculations
+from app.database import SessionLocal
+from app.main import app
+from app.models.calculation import Calculation
+from app.models.calculation_archive import ArchivedCalculation
+from app.models.calculation_stats import UserCalculationStats
+
+client = TestClient(app)
+
+def create(headers, calculation_type, inputs):
+    res = client.post("/calculations", json={"type": calculation_type, "inputs": inputs}, headers=headers)
+    assert res.status_code == 201, res.text
+    return res.json()
+
+def backdate(calc_id, created_at):
+    with SessionLocal() as db:
+        db.execute(update(Calculation).where(Calculation.id == UUID(calc_id)).values(created_at=created_at, updated_at=created_at))
+        db.commit()
+
+@pytest.fixture
+def archived_history(user_token):
+    """Four old calculations, the first three archived, and one recent one."""
+    headers = {"Authorization": f"Bearer {user_token}"}
+    old = [create(headers, "addition", [i, 1]) for i in range(4)]
+    for day, calculation in enumerate(old, start=1):
+        backdate(calculation["id"], datetime(2020, 1, day))
+    recent = create(headers, "division", [9, 3])
+    lines = []
+    totals = archive_calculations(older_than_days=30, batch_size=2, now=datetime(2020, 2, 3), report=lines.append)
+    assert totals["archived"] == 3
+    assert len(lines) == 2
+    return headers, old, recent
+
+def test_archive_moves_old_calculations(archived_history):
+    headers, old, recent = archived_history
+    with SessionLocal() as db:
+        ids = [UUID(calculation["id"]) for calculation in old]
+        assert db.query(Calculation).filter(Calculation.id.in_(ids)).count() == 1
+        archived = db.query(ArchivedCalculation).filter(ArchivedCalculation.id.in_(ids)).all()
+        assert sorted(str(row.id) for row in archived) == sorted(c["id"] for c in old[:3])
+        assert all(row.operand_count == 2 for row in archived)
+
+def test_get_falls_back_to_the_archive(archived_history):
+    headers, old, recent = archived_history
+    res = client.get(f"/calculations/{old[0]['id']}", headers=headers)
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["type"] == "addition" and body["inputs"] == [0, 1] and body["result"] == 1
+    assert body["created_at"].startswith("2020-01-01")
+    assert body["updated_at"].startswith("2020-01-01")
+
+def test_list_continues_into_the_archive(archived_history):
+    headers, old, recent = archived_history
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        res = client.get("/calculations", params=params, headers=headers)
+        seen += [item["id"] for item in res.json()]
+        cursor = res.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == [recent["id"]] + [calculation["id"] for calculation in reversed(old)]
+
+def test_list_date_range_reads_only_the_archive(archived_history):
+    headers, old, recent = archived_history
+    params = {"created_after": "2020-01-02T00:00:00", "created_before": "2020-01-03T00:00:00Z"}
+    page = client.get("/calculations", params=params, headers=headers).json()
+    assert [item["id"] for item in page] == [old[1]["id"]]
+
+def test_archived_calculations_are_read_only(archived_history):
+    headers, old, recent = archived_history
+    res = client.put(f"/calculations/{old[0]['id']}", json={"inputs": [5, 5]}, headers=headers)
+    assert res.status_code == 409
+    assert res.json()["detail"] == "Archived calculations are read-only."
+
+def test_delete_archived_calculation_updates_the_report(archived_history):
+    headers, old, recent = archived_history
+    assert client.get("/calculations/report", headers=headers).json()["total_calculations"] == 5
+    assert client.delete(f"/calculations/{old[0]['id']}", headers=headers).status_code == 204
+    assert client.get(f"/calculations/{old[0]['id']}", headers=headers).status_code == 404
+    report = client.get("/calculations/report", headers=headers).json()
+    assert report["total_calculations"] == 4
+    with SessionLocal() as db:
+        before = db.query(UserCalculationStats).filter(UserCalculationStats.user_id == UUID(recent["user_id"])).one()
+        snapshot = (before.total_count, before.operand_sum, dict(before.type_counts))
+        UserCalculationStats.rebuild(db)
+        db.commit()
+        after = db.query(UserCalculationStats).filter(UserCalculationStats.user_id == UUID(recent["user_id"])).one()
+        assert (after.total_count, after.operand_sum, after.type_counts) == snapshot
+
+def test_archive_needs_a_positive_age():
+    with pytest.raises(ValueError, match="at least one day"):
+        archive_calculations(older_than_days=0)
+
+def test_archive_dry_run_moves_nothing(archived_history):
+    headers, old, recent = archived_history
+    lines = []
+    totals = archive_calculations(older_than_days=30, dry_run=True, now=datetime(2020, 2, 5), report=lines.append)
+    assert totals["archived"] >= 1  # old[3] of this and earlier fixtures
+    assert client.get(f"/calculations/{old[3]['id']}", headers=headers).status_code == 200
+    with SessionLocal() as db:
+        assert db.query(ArchivedCalculation).filter(ArchivedCalculation.id == UUID(old[3]["id"])).count() == 0
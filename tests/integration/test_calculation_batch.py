@@ -0,0 +1,50 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_batch_create_mixed_results(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    payload = [
+        {"type": "addition", "inputs": [1, 2, 3]},
+        {"type": "division", "inputs": [1, 0]},
+        {"type": "exponentiation", "inputs": [2, 10]},
+        {"type": "subtraction", "inputs": [5]},
+    ]
+    res = client.post("/calculations/batch", json=payload, headers=headers)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["created"] == 2
+    assert data["failed"] == 2
+    assert [r["index"] for r in data["results"]] == [0, 1, 2, 3]
+
+    assert data["results"][0]["calculation"]["result"] == 6
+    assert data["results"][0]["error"] is None
+    assert data["results"][1]["calculation"] is None
+    assert data["results"][1]["error"] == "Cannot divide by zero."
+    assert data["results"][2]["calculation"]["type"] == "exponentiation"
+    assert data["results"][2]["calculation"]["result"] == 1024
+    assert "at least two numbers" in data["results"][3]["error"]
+
+    # Stored rows are visible through the normal endpoints
+    calc_id = data["results"][2]["calculation"]["id"]
+    res = client.get(f"/calculations/{calc_id}", headers=headers)
+    assert res.status_code == 200
+    report = client.get("/calculations/report", headers=headers).json()
+    assert report["total_calculations"] == 2
+    assert abs(report["average_operands"] - 2.5) < 1e-6
+
+def test_batch_create_empty_list(user_token):
+    res = client.post("/calculations/batch", json=[], headers={"Authorization": f"Bearer {user_token}"})
+    assert res.status_code == 200
+    assert res.json() == {"created": 0, "failed": 0, "results": []}
+
+def test_batch_create_rejects_invalid_schema(user_token):
+    payload = [{"type": "modulus", "inputs": [1, 2]}]
+    res = client.post("/calculations/batch", json=payload, headers={"Authorization": f"Bearer {user_token}"})
+    assert res.status_code == 422
+
+def test_batch_create_unauth():
+    res = client.post("/calculations/batch", json=[{"type": "addition", "inputs": [1, 2]}])
+    assert res.status_code in (401, 403)
@@ -0,0 +1,45 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_create_and_read_expression_calculation(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    payload = {"type": "expression", "inputs": [1, 2, 3], "expression": "(a + b) / c ** 2"}
+    res = client.post("/calculations", json=payload, headers=headers)
+    assert res.status_code == 201, res.text
+    data = res.json()
+    assert data["expression"] == "(a + b) / c ** 2"
+    assert data["result"] == pytest.approx(1 / 3)
+
+    updated = client.put(f"/calculations/{data['id']}", json={"inputs": [2, 4, 2]}, headers=headers)
+    assert updated.status_code == 200
+    assert updated.json()["result"] == 1.5
+
+def test_invalid_expressions_return_400(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    for payload in [
+        {"type": "expression", "inputs": [1, 2], "expression": "open('x')"},
+        {"type": "expression", "inputs": [1, 2]},
+        {"type": "expression", "inputs": [1], "expression": "a + b"},
+    ]:
+        res = client.post("/calculations", json=payload, headers=headers)
+        assert res.status_code == 400, payload
+
+def test_expression_only_allowed_for_expression_type(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    payload = {"type": "addition", "inputs": [1, 2], "expression": "a + b"}
+    res = client.post("/calculations", json=payload, headers=headers)
+    assert res.status_code == 422
+
+def test_batch_with_expressions(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    payload = [
+        {"type": "expression", "inputs": [3, 4], "expression": "(x[0] ** 2 + x[1] ** 2) ** 0.5"},
+        {"type": "addition", "inputs": [1, 2]},
+    ]
+    res = client.post("/calculations/batch", json=payload, headers=headers)
+    assert res.status_code == 200
+    results = [item["calculation"]["result"] for item in res.json()["results"]]
+    assert results == [5.0, 3.0]
@@ -0,0 +1,107 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def _create(headers, payload):
+    res = client.post("/calculations", json=payload, headers=headers)
+    assert res.status_code == 201, res.text
+    return res.json()
+
+def test_graph_is_evaluated_in_dependency_order(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    base = _create(headers, {"type": "addition", "inputs": [1, 1]})
+    payload = {"nodes": [
+        {"key": "total", "type": "addition", "inputs": [{"node": "left"}, {"node": "right"}]},
+        {"key": "left", "type": "multiplication", "inputs": [{"node": "shared"}, 2]},
+        {"key": "right", "type": "multiplication", "inputs": [{"node": "shared"}, 3]},
+        {"key": "shared", "type": "addition", "inputs": [{"calculation_id": base["id"]}, 3]},
+    ]}
+    res = client.post("/calculations/graph", json=payload, headers=headers)
+    assert res.status_code == 201, res.text
+    calcs = res.json()["calculations"]
+    assert list(calcs) == ["total", "left", "right", "shared"]
+    assert calcs["shared"]["result"] == 5
+    assert calcs["total"]["inputs"] == [10, 15]
+    assert calcs["total"]["result"] == 25
+
+    report = client.get("/calculations/report", headers=headers).json()
+    assert report["total_calculations"] == 5
+
+def test_graph_errors_store_nothing(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    bad_graphs = [
+        {"nodes": [{"key": "a", "type": "addition", "inputs": [{"node": "b"}, 1]},
+                   {"key": "b", "type": "addition", "inputs": [{"node": "a"}, 1]}]},
+        {"nodes": [{"key": "a", "type": "addition", "inputs": [{"node": "missing"}, 1]}]},
+        {"nodes": [{"key": "a", "type": "addition", "inputs": [1, 2]},
+                   {"key": "a", "type": "addition", "inputs": [1, 2]}]},
+        {"nodes": [{"key": "a", "type": "subtraction", "inputs": [1, 1]},
+                   {"key": "b", "type": "division", "inputs": [1, {"node": "a"}]}]},
+        {"nodes": [{"key": "a", "type": "addition",
+                    "inputs": [{"calculation_id": "123e4567-e89b-12d3-a456-426614174000"}, 1]}]},
+    ]
+    for graph in bad_graphs:
+        res = client.post("/calculations/graph", json=graph, headers=headers)
+        assert res.status_code == 400, graph
+    assert client.get("/calculations", headers=headers).json() == []
+
+def test_update_propagates_to_downstream_only_when_needed(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations/graph", json={"nodes": [
+        {"key": "a", "type": "addition", "inputs": [1, 2]},
+        {"key": "clamped", "type": "multiplication", "inputs": [{"node": "a"}, 0]},
+        {"key": "b", "type": "addition", "inputs": [{"node": "a"}, 10]},
+        {"key": "c", "type": "multiplication", "inputs": [{"node": "b"}, {"node": "clamped"}, 2]},
+        {"key": "d", "type": "addition", "inputs": [{"node": "clamped"}, 1]},
+    ]}, headers=headers)
+    assert res.status_code == 201, res.text
+    calcs = res.json()["calculations"]
+
+    res = client.put(f"/calculations/{calcs['a']['id']}", json={"inputs": [5, 5]}, headers=headers)
+    assert res.status_code == 200
+    assert res.json()["result"] == 10
+
+    b = client.get(f"/calculations/{calcs['b']['id']}", headers=headers).json()
+    c = client.get(f"/calculations/{calcs['c']['id']}", headers=headers).json()
+    d = client.get(f"/calculations/{calcs['d']['id']}", headers=headers).json()
+    assert b["result"] == 20
+    assert c["inputs"] == [20, 0, 2]
+    # "clamped" stays 0, so "d" is never recomputed
+    assert d["updated_at"] == calcs["d"]["updated_at"]
+
+def test_update_that_breaks_a_dependent_is_rejected(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    calcs = client.post("/calculations/graph", json={"nodes": [
+        {"key": "a", "type": "subtraction", "inputs": [5, 1]},
+        {"key": "b", "type": "division", "inputs": [8, {"node": "a"}]},
+    ]}, headers=headers).json()["calculations"]
+
+    res = client.put(f"/calculations/{calcs['a']['id']}", json={"inputs": [1, 1]}, headers=headers)
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Cannot divide by zero."
+    a = client.get(f"/calculations/{calcs['a']['id']}", headers=headers).json()
+    assert a["result"] == 4
+
+def test_update_can_link_but_not_create_cycles(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    upstream = _create(headers, {"type": "addition", "inputs": [2, 2]})
+    downstream = _create(headers, {"type": "multiplication", "inputs": [1, 3]})
+
+    res = client.put(f"/calculations/{downstream['id']}",
+                     json={"inputs": [{"calculation_id": upstream["id"]}, 3]}, headers=headers)
+    assert res.status_code == 200
+    assert res.json()["result"] == 12
+
+    res = client.put(f"/calculations/{upstream['id']}",
+                     json={"inputs": [{"calculation_id": downstream["id"]}, 1]}, headers=headers)
+    assert res.status_code == 400
+    assert "cannot depend" in res.json()["detail"]
+
+    client.put(f"/calculations/{upstream['id']}", json={"inputs": [3, 3]}, headers=headers)
+    assert client.get(f"/calculations/{downstream['id']}", headers=headers).json()["result"] == 18
+
+    # Deleting the upstream calculation keeps the last value downstream
+    assert client.delete(f"/calculations/{upstream['id']}", headers=headers).status_code == 204
+    assert client.get(f"/calculations/{downstream['id']}", headers=headers).json()["result"] == 18
@@ -0,0 +1,23 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_create_overflowing_calculation_returns_400(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations", json={"type": "exponentiation", "inputs": [10, 400]}, headers=headers)
+    assert res.status_code == 400
+    assert "too large" in res.json()["detail"]
+
+def test_update_to_overflowing_inputs_returns_400(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    created = client.post("/calculations", json={"type": "multiplication", "inputs": [2, 3]}, headers=headers)
+    assert created.status_code == 201
+    calc_id = created.json()["id"]
+
+    res = client.put(f"/calculations/{calc_id}", json={"inputs": [1e200, 1e200]}, headers=headers)
+    assert res.status_code == 400
+
+    unchanged = client.get(f"/calculations/{calc_id}", headers=headers)
+    assert unchanged.json()["result"] == 6
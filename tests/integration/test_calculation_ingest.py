@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.config import settings
+
+client = TestClient(app)
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+def test_ingest_streamed_body_in_chunks(user_token, monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_INGEST_CHUNK_SIZE", 3)
+    lines = [json.dumps({"type": "addition", "inputs": [i, 1]}) for i in range(7)]
+    lines.insert(2, json.dumps({"type": "division", "inputs": [1, 0]}))
+    lines.insert(4, "{not json")
+    lines.insert(5, "")
+
+    def body():
+        # Split lines across arbitrary byte boundaries
+        data = ("\n".join(lines) + "\n").encode()
+        for start in range(0, len(data), 17):
+            yield data[start:start + 17]
+
+    headers = {**NDJSON, "Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations/ingest", content=body(), headers=headers)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["accepted"] == 7
+    assert data["rejected"] == 2
+    assert data["errors"][0] == {"line": 3, "error": "Cannot divide by zero."}
+    assert data["errors"][1]["line"] == 5
+
+    report = client.get("/calculations/report", headers={"Authorization": f"Bearer {user_token}"}).json()
+    assert report["total_calculations"] == 7
+
+@pytest.mark.parametrize("piece_size", [16, 1 << 20], ids=["streamed", "single_chunk"])
+def test_ingest_rejects_overlong_line(user_token, monkeypatch, piece_size):
+    monkeypatch.setattr(settings, "CALCULATION_INGEST_MAX_LINE_BYTES", 64)
+    long_line = json.dumps({"type": "addition", "inputs": list(range(100))})
+    data = "\n".join([long_line, json.dumps({"type": "addition", "inputs": [1, 2]})]).encode()
+
+    def body():
+        for start in range(0, len(data), piece_size):
+            yield data[start:start + piece_size]
+
+    headers = {**NDJSON, "Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations/ingest", content=body(), headers=headers)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["accepted"] == 1
+    assert data["rejected"] == 1
+    assert data["errors"] == [{"line": 1, "error": "Line exceeds 64 bytes"}]
+
+def test_ingest_rejects_a_line_spanning_many_chunks_once(user_token, monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_INGEST_MAX_LINE_BYTES", 64)
+    short_line = json.dumps({"type": "addition", "inputs": [1, 2]})
+    long_line = json.dumps({"type": "addition", "inputs": list(range(200))})
+    data = "\n".join([short_line, long_line, short_line, ""]).encode()
+
+    async def body():
+        # The long line alone is more than ten times the limit
+        for start in range(0, len(data), 32):
+            yield data[start:start + 32]
+
+    async def post():
+        # Unlike TestClient, ASGITransport delivers every piece as its own message
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as async_client:
+            headers = {**NDJSON, "Authorization": f"Bearer {user_token}"}
+            return await async_client.post("/calculations/ingest", content=body(), headers=headers)
+
+    res = asyncio.run(post())
+    assert res.status_code == 200
+    assert res.json() == {
+        "accepted": 2,
+        "rejected": 1,
+        "errors": [{"line": 2, "error": "Line exceeds 64 bytes"}],
+    }
+
+def test_ingest_requires_ndjson_content_type(user_token):
+    res = client.post(
+        "/calculations/ingest",
+        json=[{"type": "addition", "inputs": [1, 2]}],
+        headers={"Authorization": f"Bearer {user_token}"},
+    )
+    assert res.status_code == 415
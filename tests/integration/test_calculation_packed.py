@@ -0,0 +1,57 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.packed import encode_base64_floats, pack_floats
+from app.main import app
+
+client = TestClient(app)
+
+def test_create_from_an_octet_stream_body(user_token):
+    headers = {"Authorization": f"Bearer {user_token}", "Content-Type": "application/octet-stream"}
+    values = [float(i % 100) for i in range(100000)]
+    res = client.post("/calculations/packed?type=mean", content=pack_floats(values), headers=headers)
+    assert res.status_code == 201, res.text
+    assert res.json()["result"] == 49.5
+    assert len(res.json()["inputs"]) == 100000
+
+    res = client.post(
+        "/calculations/packed?type=expression&expression=a*b", content=pack_floats([3, 4]), headers=headers
+    )
+    assert res.status_code == 201, res.text
+    assert res.json()["result"] == 12
+
+def test_base64_inputs_in_json_bodies(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations", json={"type": "division", "inputs": encode_base64_floats([9, 3])}, headers=headers)
+    assert res.status_code == 201, res.text
+    assert res.json()["inputs"] == [9, 3]
+    assert res.json()["result"] == 3
+
+    payload = [
+        {"type": "addition", "inputs": encode_base64_floats([1, 2])},
+        {"type": "addition", "inputs": [3, 4]},
+    ]
+    res = client.post("/calculations/batch", json=payload, headers=headers)
+    assert [r["calculation"]["result"] for r in res.json()["results"]] == [3, 7]
+
+def test_packed_request_errors(user_token, monkeypatch):
+    headers = {"Authorization": f"Bearer {user_token}", "Content-Type": "application/octet-stream"}
+    res = client.post("/calculations/packed?type=division", content=pack_floats([1, 0]), headers=headers)
+    assert res.status_code == 400
+    assert "divide by zero" in res.json()["detail"]
+
+    res = client.post("/calculations/packed?type=addition", content=b"\x00" * 12, headers=headers)
+    assert res.status_code == 422
+
+    res = client.post("/calculations/packed?type=modulo", content=pack_floats([1, 2]), headers=headers)
+    assert res.status_code == 422
+
+    res = client.post(
+        "/calculations/packed?type=addition", content=pack_floats([1, 2]),
+        headers={"Authorization": headers["Authorization"], "Content-Type": "application/json"},
+    )
+    assert res.status_code == 415
+
+    monkeypatch.setattr(settings, "CALCULATION_MAX_OPERANDS", 10)
+    res = client.post("/calculations/packed?type=addition", content=pack_floats(range(11)), headers=headers)
+    assert res.status_code == 413
@@ -0,0 +1,49 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_list_empty(user_token):
+    res = client.get("/calculations", headers={"Authorization": f"Bearer {user_token}"})
+    assert res.status_code == 200
+    assert res.json() == []
+    assert "X-Next-Cursor" not in res.headers and "Link" not in res.headers
+
+def test_list_walks_all_pages_newest_first(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    created = []
+    for i in range(5):
+        res = client.post("/calculations", json={"type": "addition", "inputs": [i, 1]}, headers=headers)
+        assert res.status_code == 201
+        created.append(res.json()["id"])
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        res = client.get("/calculations", params=params, headers=headers)
+        assert res.status_code == 200
+        data = res.json()
+        assert len(data) <= 2
+        seen.extend(c["id"] for c in data)
+        pages += 1
+        cursor = res.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        assert res.links["next"]["url"] == str(res.url.copy_merge_params({"cursor": cursor}))
+
+    assert pages == 3
+    assert seen == list(reversed(created))
+
+def test_list_invalid_cursor(user_token):
+    res = client.get("/calculations", params={"cursor": "not-a-cursor"}, headers={"Authorization": f"Bearer {user_token}"})
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Invalid pagination cursor."
+
+def test_list_limit_out_of_range(user_token):
+    res = client.get("/calculations", params={"limit": 0}, headers={"Authorization": f"Bearer {user_token}"})
+    assert res.status_code == 422
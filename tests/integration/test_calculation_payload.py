@@ -0,0 +1,156 @@
+import uuid
+from datetime import timedelta
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+import app.main
+from app.core.config import settings
+from app.database import SessionLocal
+from app.main import app as fastapi_app
+from app.models.calculation import Calculation
+from app.models.calculation_payload import CalculationPayload, content_hash
+from app.payloads import collect_garbage, migrate_payloads
+from app.recompute import recompute_results
+
+client = TestClient(fastapi_app)
+
+@pytest.fixture
+def register(register_user):
+    return lambda prefix: {"Authorization": f"Bearer {register_user(prefix)}"}
+
+@pytest.fixture
+def content_addressed(monkeypatch, db_session):
+    monkeypatch.setattr(settings, "CALCULATION_CONTENT_ADDRESSED", True)
+
+def create(headers, calculation_type, inputs, **attributes):
+    res = client.post("/calculations", json={"type": calculation_type, "inputs": inputs, **attributes}, headers=headers)
+    assert res.status_code == 201, res.text
+    return res.json()
+
+def stored_row(calc_id):
+    with SessionLocal() as db:
+        return db.execute(
+            select(Calculation.payload_hash, Calculation.inputs_json, Calculation.inputs_array,
+                   Calculation.inputs_packed, Calculation.result, Calculation.operand_count)
+            .where(Calculation.id == UUID(calc_id))
+        ).one()
+
+def test_identical_calculations_share_one_payload(register, content_addressed):
+    inputs = [uuid.uuid4().int % 1000, 7.25]
+    first = create(register("payloada"), "multiplication", inputs)
+    second = create(register("payloadb"), "multiplication", inputs)
+    assert first["result"] == second["result"] == inputs[0] * 7.25
+
+    key = content_hash("multiplication", inputs)
+    for calculation in (first, second):
+        payload_hash, *content, operand_count = stored_row(calculation["id"])
+        assert bytes(payload_hash) == key
+        assert content == [None, None, None, None] and operand_count == 2
+    with SessionLocal() as db:
+        assert db.query(CalculationPayload).filter(CalculationPayload.hash == key).count() == 1
+
+def test_reads_return_the_full_calculation(register, content_addressed):
+    headers = register("payloadread")
+    created = create(headers, "expression", [2, 3], expression="x0 * x1 + 1")
+    body = client.get(f"/calculations/{created['id']}", headers=headers).json()
+    assert (body["inputs"], body["expression"], body["result"]) == ([2, 3], "x0 * x1 + 1", 7)
+    page = client.get("/calculations", headers=headers).json()
+    assert page[0]["inputs"] == [2, 3] and page[0]["result"] == 7
+
+def test_update_moves_to_another_payload(register, content_addressed):
+    headers = register("payloadupdate")
+    created = create(headers, "vector_add", [[1, 2], [3, 4]])
+    res = client.put(f"/calculations/{created['id']}", json={"inputs": [[5, 6], [7, 8]]}, headers=headers)
+    assert res.status_code == 200, res.text
+    assert res.json()["result_array"] == [12, 14]
+    assert bytes(stored_row(created["id"]).payload_hash) == content_hash("vector_add", [[5, 6], [7, 8]])
+    assert client.get(f"/calculations/{created['id']}", headers=headers).json()["inputs"] == [[5, 6], [7, 8]]
+
+def test_turning_the_mode_off_writes_inline_again(register, content_addressed, monkeypatch):
+    headers = register("payloadoff")
+    created = create(headers, "addition", [1, 2, 3])
+    monkeypatch.setattr(settings, "CALCULATION_CONTENT_ADDRESSED", False)
+    res = client.put(f"/calculations/{created['id']}", json={"inputs": [4, 5, 6]}, headers=headers)
+    assert res.json()["result"] == 15
+    row = stored_row(created["id"])
+    assert row.payload_hash is None and row.result == 15
+    assert create(headers, "addition", [1, 2]) and stored_row(created["id"]).payload_hash is None
+
+def test_stored_payload_skips_evaluation(register, content_addressed, monkeypatch):
+    headers = register("payloadhit")
+    create(headers, "exponentiation", [3, 4])
+
+    def fail(calculation):
+        raise AssertionError("evaluated a stored calculation")
+    monkeypatch.setattr(app.main, "evaluate", fail)
+    assert create(register("payloadhit"), "exponentiation", [3.0, 4.0])["result"] == 81
+
+def test_batch_evaluates_only_new_content(register, content_addressed, monkeypatch):
+    headers = register("payloadbatch")
+    seed = uuid.uuid4().int % 1000
+    create(headers, "subtraction", [seed, 1])
+    evaluated = []
+    batch = Calculation.evaluate_batch
+
+    def record(calculations):
+        evaluated.extend(calculation.inputs for calculation in calculations)
+        return batch(calculations)
+    monkeypatch.setattr(Calculation, "evaluate_batch", staticmethod(record))
+    res = client.post("/calculations/batch", headers=headers, json=[
+        {"type": "subtraction", "inputs": [seed, 1]},
+        {"type": "subtraction", "inputs": [seed, 2]},
+        {"type": "subtraction", "inputs": [seed, 2]},
+    ])
+    assert res.status_code == 200, res.text
+    created = [item["calculation"] for item in res.json()["results"]]
+    assert [calculation["result"] for calculation in created] == [seed - 1, seed - 2, seed - 2]
+    assert evaluated == [[seed, 2], [seed, 2]]
+    assert bytes(stored_row(created[1]["id"]).payload_hash) == content_hash("subtraction", [seed, 2])
+
+def test_migrate_recompute_and_collect_garbage(register, db_session):
+    headers = register("payloadjob")
+    inline = create(headers, "division", [12, 4])
+    assert stored_row(inline["id"]).payload_hash is None
+
+    lines = []
+    totals = migrate_payloads(batch_size=7, report=lines.append)
+    assert totals["migrated"] >= 1 and lines
+    assert bytes(stored_row(inline["id"]).payload_hash) == content_hash("division", [12, 4])
+    assert migrate_payloads(report=lines.append)["migrated"] == 0
+    assert client.get(f"/calculations/{inline['id']}", headers=headers).json()["result"] == 3
+
+    with SessionLocal() as db:
+        payload = db.get(CalculationPayload, content_hash("division", [12, 4]))
+        payload.result = 0.0
+        db.commit()
+    assert recompute_results(workers=0, report=lambda line: None)["changed"] >= 1
+    assert client.get(f"/calculations/{inline['id']}", headers=headers).json()["result"] == 3
+
+    assert client.delete(f"/calculations/{inline['id']}", headers=headers).status_code == 204
+    assert collect_garbage(min_age=timedelta(0)) >= 1
+    with SessionLocal() as db:
+        assert db.get(CalculationPayload, content_hash("division", [12, 4])) is None
+
+def test_garbage_collection_skips_payloads_being_stored(register, content_addressed):
+    headers = register("payloadrace")
+    created = create(headers, "multiplication", [uuid.uuid4().int % 1000, 0.125])
+    key = content_hash("multiplication", created["inputs"])
+    assert client.delete(f"/calculations/{created['id']}", headers=headers).status_code == 204
+
+    with SessionLocal() as writer:
+        payload = writer.get(CalculationPayload, key)
+        row = {column.key: getattr(payload, column.key) for column in CalculationPayload.__mapper__.column_attrs}
+        # A writer storing the same content holds the payload until it commits
+        CalculationPayload.store(writer.connection(), [row])
+        collect_garbage(min_age=timedelta(0))
+        assert _exists(key)
+        writer.rollback()
+    collect_garbage(min_age=timedelta(0))
+    assert not _exists(key)
+
+def _exists(key):
+    with SessionLocal() as db:
+        return db.get(CalculationPayload, key) is not None
@@ -4,30 +4,6 @@ from app.main import app
 
 client = TestClient(app)
 
-@pytest.fixture
-def user_token(db_session):
-    import uuid
-    unique_id = str(uuid.uuid4())[:8]
-    username = f"reportuser_{unique_id}"
-    email = f"reportuser_{unique_id}@example.com"
-    
-    reg_data = {
-        "first_name": "Report",
-        "last_name": "User",
-        "email": email,
-        "username": username,
-        "password": "ReportPass123!",
-        "confirm_password": "ReportPass123!"
-    }
-    reg_response = client.post("/auth/register", json=reg_data)
-    if reg_response.status_code != 201:
-        raise Exception(f"Registration failed with status {reg_response.status_code}: {reg_response.json()}")
-        
-    login = client.post("/auth/login", json={"username": username, "password": "ReportPass123!"})
-    if login.status_code != 200:
-        raise Exception(f"Login failed with status {login.status_code}: {login.json()}")
-    return login.json()["access_token"]
-
 def test_report_empty(user_token):
     res = client.get("/calculations/report", headers={"Authorization": f"Bearer {user_token}"})
     assert res.status_code == 200
@@ -49,3 +25,89 @@ def test_report_with_calculations(user_token):
     assert abs(data["average_operands"] - 2.0) < 1e-6
     assert data["most_common_type"] == "addition"
     assert data["last_calculation_at"] is not None
+
+def test_report_average_operands_varies_by_length(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    client.post("/calculations", json={"type": "addition", "inputs": [1, 2, 3, 4]}, headers=headers)
+    client.post("/calculations", json={"type": "division", "inputs": [8, 2]}, headers=headers)
+    client.post("/calculations", json={"type": "division", "inputs": [9, 3, 3]}, headers=headers)
+    last = client.post("/calculations", json={"type": "division", "inputs": [6, 2]}, headers=headers)
+    res = client.get("/calculations/report", headers=headers)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["total_calculations"] == 4
+    assert abs(data["average_operands"] - 2.75) < 1e-6
+    assert data["most_common_type"] == "division"
+    assert data["last_calculation_at"] == last.json()["created_at"]
+
+def test_report_tracks_update_and_delete(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    first = client.post("/calculations", json={"type": "addition", "inputs": [1, 2]}, headers=headers).json()
+    second = client.post("/calculations", json={"type": "multiplication", "inputs": [2, 3]}, headers=headers).json()
+
+    # Growing the inputs of one calculation moves the average
+    res = client.put(f"/calculations/{first['id']}", json={"inputs": [1, 2, 3, 4]}, headers=headers)
+    assert res.status_code == 200
+    data = client.get("/calculations/report", headers=headers).json()
+    assert data["total_calculations"] == 2
+    assert abs(data["average_operands"] - 3.0) < 1e-6
+
+    # Deleting the newest calculation falls back to the previous timestamp
+    res = client.delete(f"/calculations/{second['id']}", headers=headers)
+    assert res.status_code == 204
+    data = client.get("/calculations/report", headers=headers).json()
+    assert data["total_calculations"] == 1
+    assert abs(data["average_operands"] - 4.0) < 1e-6
+    assert data["most_common_type"] == "addition"
+    assert data["last_calculation_at"] == first["created_at"]
+
+    client.delete(f"/calculations/{first['id']}", headers=headers)
+    data = client.get("/calculations/report", headers=headers).json()
+    assert data["total_calculations"] == 0
+    assert data["most_common_type"] == "N/A"
+    assert data["last_calculation_at"] is None
+
+def test_stats_rebuild_matches_calculations(db_session, test_user):
+    from app.models.calculation import Calculation
+    from app.models.calculation_stats import UserCalculationStats
+
+    for calc_type, inputs in [("addition", [1, 2, 3]), ("division", [4, 2]), ("division", [9, 3])]:
+        calc = Calculation.create(calc_type, test_user.id, inputs)
+        calc.result = calc.get_result()
+        db_session.add(calc)
+    db_session.commit()
+
+    assert UserCalculationStats.rebuild(db_session) >= 1
+    db_session.commit()
+
+    stats = db_session.get(UserCalculationStats, test_user.id)
+    assert stats.total_count == 3
+    assert stats.operand_sum == 7
+    assert stats.type_counts == {"addition": 1, "division": 2}
+    assert stats.most_common_type == "division"
+    assert stats.last_calculation_at is not None
+
+@pytest.mark.parametrize("seed_users", [2], indirect=True)
+def test_stats_rebuild_of_selected_users(db_session, seed_users):
+    from app.models.calculation import Calculation
+    from app.models.calculation_stats import UserCalculationStats
+
+    first, second = seed_users
+    for user in seed_users:
+        calc = Calculation.create("multiplication", user.id, [2, 3])
+        calc.result = calc.get_result()
+        db_session.add(calc)
+    db_session.commit()
+    # Corrupt both rows, then repair only the first user
+    for user in seed_users:
+        stats = db_session.get(UserCalculationStats, user.id) or UserCalculationStats(user_id=user.id)
+        stats.total_count, stats.operand_sum, stats.type_counts = 99, 99, {"addition": 99}
+        db_session.add(stats)
+    db_session.commit()
+
+    assert UserCalculationStats.rebuild(db_session, [first.id]) == 1
+    db_session.commit()
+    repaired = db_session.get(UserCalculationStats, first.id)
+    assert (repaired.total_count, repaired.operand_sum, repaired.type_counts) == (1, 2, {"multiplication": 1})
+    assert db_session.get(UserCalculationStats, second.id).total_count == 99
+    assert UserCalculationStats.rebuild(db_session, []) == 0
@@ -0,0 +1,58 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import _stream_scan, app
+from app.models.calculation import Calculation
+
+client = TestClient(app)
+
+def test_scan_streams_running_values_in_chunks(user_token, monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_SCAN_CHUNK_SIZE", 7)
+    headers = {"Authorization": f"Bearer {user_token}"}
+    inputs = list(range(1, 101))
+    with client.stream("POST", "/calculations/scan", json={"type": "addition", "inputs": inputs}, headers=headers) as res:
+        assert res.status_code == 200
+        assert res.headers["content-type"] == "application/json"
+        chunks = list(res.iter_raw())
+        body = b"".join(chunks)
+    data = json.loads(body)
+    assert data["type"] == "addition"
+    assert data["count"] == 100
+    assert data["values"][:4] == [1, 3, 6, 10]
+    assert data["values"][-1] == 5050
+
+def test_scan_is_serialized_chunk_by_chunk(monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_SCAN_CHUNK_SIZE", 3)
+    response = _stream_scan(Calculation.create("multiplication", None, [1, 2, 3, 4, 5, 6, 7]))
+
+    async def collect():
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(collect())
+    assert chunks[1:] == ["1.0, 2.0, 6.0", ",24.0, 120.0, 720.0", ",5040.0", "]}"]
+    assert json.loads("".join(chunks))["values"] == [1, 2, 6, 24, 120, 720, 5040]
+
+def test_scan_a_stored_calculation(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations", json={"type": "division", "inputs": [120, 2, 3, 4]}, headers=headers)
+    calc_id = res.json()["id"]
+    res = client.get(f"/calculations/{calc_id}/scan", headers=headers)
+    assert res.status_code == 200
+    assert res.json()["values"] == [120, 60, 20, 5]
+    assert res.json()["values"][-1] == client.get(f"/calculations/{calc_id}", headers=headers).json()["result"]
+
+    assert client.get("/calculations/not-a-uuid/scan", headers=headers).status_code == 400
+    assert client.get(f"/calculations/{uuid.uuid4()}/scan", headers=headers).status_code == 404
+
+def test_scan_errors_are_bad_requests(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations/scan", json={"type": "division", "inputs": [1, 0]}, headers=headers)
+    assert res.status_code == 400
+    assert "divide by zero" in res.json()["detail"]
+    res = client.post("/calculations/scan", json={"type": "exponentiation", "inputs": [2, 3]}, headers=headers)
+    assert res.status_code == 400
+    assert "do not support scan" in res.json()["detail"]
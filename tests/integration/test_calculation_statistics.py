@@ -0,0 +1,30 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_summarize_a_large_sensor_batch(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    readings = [float(i % 1000) for i in range(200000)]
+    res = client.post("/calculations", json={"type": "mean", "inputs": readings}, headers=headers)
+    assert res.status_code == 201, res.text
+    assert res.json()["result"] == pytest.approx(499.5)
+
+    res = client.post("/calculations", json={"type": "percentile", "inputs": [99] + readings}, headers=headers)
+    assert res.status_code == 201
+    assert res.json()["result"] == pytest.approx(989.0, abs=1)
+
+def test_statistics_in_batch_requests(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    payload = [
+        {"type": "median", "inputs": [3, 1, 2]},
+        {"type": "stddev", "inputs": [1]},
+        {"type": "max", "inputs": [3, 1, 2]},
+    ]
+    res = client.post("/calculations/batch", json=payload, headers=headers)
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert results[0]["calculation"]["result"] == 2
+    assert "at least two numbers" in results[1]["error"]
+    assert results[2]["calculation"]["result"] == 3
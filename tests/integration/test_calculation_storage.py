@@ -0,0 +1,128 @@
+import math
+from uuid import UUID
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.main import app
+from app.migrate_inputs import migrate_inputs
+from app.models.calculation import Calculation
+from app.models.calculation_stats import UserCalculationStats
+from app.recompute import recompute_results
+
+client = TestClient(app)
+
+@pytest.fixture(params=["json", "array", "packed"])
+def storage(request, monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_INPUTS_STORAGE", request.param)
+    return request.param
+
+STORAGE_COLUMNS = {"json": "inputs_json", "array": "inputs_array", "packed": "inputs_packed"}
+
+def stored_columns(db_session, calc_id):
+    db_session.expire_all()
+    calculation = db_session.get(Calculation, UUID(str(calc_id)))
+    return {
+        name: getattr(calculation, name) is not None
+        for name in ("inputs_json", "inputs_array", "inputs_packed")
+    }, calculation
+
+def test_flat_inputs_use_the_configured_column(db_session, user_token, storage):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations", json={"type": "division", "inputs": [100, 4, 5]}, headers=headers)
+    assert res.status_code == 201, res.text
+    assert res.json()["inputs"] == [100, 4, 5]
+
+    present, calculation = stored_columns(db_session, res.json()["id"])
+    assert present == {name: name == STORAGE_COLUMNS[storage] for name in present}
+    assert calculation.inputs == [100, 4, 5]
+    assert calculation.operand_count == 3
+    assert client.get(f"/calculations/{calculation.id}", headers=headers).json()["inputs"] == [100, 4, 5]
+
+def test_nested_inputs_stay_json(db_session, user_token, storage):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations", json={"type": "vector_add", "inputs": [[1, 2], 3]}, headers=headers)
+    assert res.status_code == 201, res.text
+    present, calculation = stored_columns(db_session, res.json()["id"])
+    assert present == {"inputs_json": True, "inputs_array": False, "inputs_packed": False}
+    assert calculation.inputs == [[1, 2], 3]
+    assert calculation.operand_count == 2
+
+def test_batch_insert_and_update(db_session, user_token, storage):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations/batch", json=[
+        {"type": "addition", "inputs": [1, 2, 3]},
+        {"type": "multiplication", "inputs": [-0.0, 2]},
+    ], headers=headers)
+    assert res.status_code == 200, res.text
+    ids = [item["calculation"]["id"] for item in res.json()["results"]]
+    _, calculation = stored_columns(db_session, ids[1])
+    # psycopg2 sends float8[] values as numeric literals, which have no -0
+    signs = [1, 1] if storage == "array" else [-1, 1]
+    assert [math.copysign(1, v) for v in calculation.inputs] == signs
+
+    res = client.put(f"/calculations/{ids[0]}", json={"inputs": [5, 7]}, headers=headers)
+    assert res.status_code == 200, res.text
+    _, calculation = stored_columns(db_session, ids[0])
+    assert (calculation.inputs, calculation.operand_count, calculation.result) == ([5, 7], 2, 12)
+
+    report = client.get("/calculations/report", headers=headers).json()
+    assert report["total_calculations"] == 2
+    assert report["average_operands"] == 2.0
+
+def test_list_filters_on_operand_count(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    for inputs in ([1, 2], [1, 2, 3], [1, 2, 3, 4]):
+        client.post("/calculations", json={"type": "addition", "inputs": inputs}, headers=headers)
+
+    res = client.get("/calculations?min_operands=3", headers=headers)
+    assert sorted(len(item["inputs"]) for item in res.json()) == [3, 4]
+    res = client.get("/calculations?min_operands=2&max_operands=3", headers=headers)
+    assert sorted(len(item["inputs"]) for item in res.json()) == [2, 3]
+    assert client.get("/calculations?max_operands=-1", headers=headers).status_code == 422
+
+def test_migrate_between_layouts(db_session, test_user):
+    calculations = [
+        Calculation.create("addition", test_user.id, [1, 2.5]),
+        Calculation.create("vector_add", test_user.id, [[1, 2], [3, 4]]),
+    ]
+    db_session.add_all(calculations)
+    db_session.commit()
+    # Rows written before operand_count existed
+    db_session.execute(update(Calculation).where(Calculation.id == calculations[0].id).values(operand_count=None))
+    db_session.commit()
+
+    totals = migrate_inputs(storage="packed", batch_size=2, dry_run=True, report=lambda line: None)
+    assert totals["changed"] >= 1
+    assert stored_columns(db_session, calculations[0].id)[1].inputs_packed is None
+
+    lines = []
+    migrate_inputs(storage="packed", batch_size=2, report=lines.append)
+    assert lines and "rows/s" in lines[-1]
+    present, flat = stored_columns(db_session, calculations[0].id)
+    assert present == {"inputs_json": False, "inputs_array": False, "inputs_packed": True}
+    assert (flat.inputs, flat.operand_count) == ([1, 2.5], 2)
+    # The JSON column is SQL NULL, so later runs do not select the row again
+    assert db_session.query(Calculation).filter(
+        Calculation.id == flat.id, Calculation.inputs_json.is_(None)
+    ).count() == 1
+    present, nested = stored_columns(db_session, calculations[1].id)
+    assert present["inputs_json"] and nested.inputs == [[1, 2], [3, 4]]
+
+    # Recompute reads the packed layout
+    assert recompute_results(workers=0, report=lambda line: None)["errors"] == 0
+
+    migrate_inputs(storage="json", report=lambda line: None)
+    present, flat = stored_columns(db_session, calculations[0].id)
+    assert present == {"inputs_json": True, "inputs_array": False, "inputs_packed": False}
+    assert flat.inputs == [1, 2.5]
+
+def test_rebuild_counts_operands_without_decoding(db_session, test_user):
+    db_session.add(Calculation.create("addition", test_user.id, [1, 2, 3, 4]))
+    db_session.commit()
+    UserCalculationStats.rebuild(db_session)
+    db_session.commit()
+    stats = db_session.get(UserCalculationStats, test_user.id)
+    assert (stats.total_count, stats.operand_sum) == (1, 4)
@@ -0,0 +1,59 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_sweep_a_range_without_storing(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    before = client.get("/calculations", headers=headers).json()
+    payload = {"type": "exponentiation", "inputs": [2, None], "range": {"start": 0, "stop": 1001}}
+    res = client.post("/calculations/sweep", json=payload, headers=headers)
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["values"][:3] == [0, 1, 2]
+    assert body["results"][10] == 1024
+    assert len(body["results"]) == 1001
+    assert body["calculation_id"] is None
+    assert client.get("/calculations", headers=headers).json() == before
+
+def test_save_a_sweep_as_one_calculation(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    payload = {"type": "division", "inputs": [100, None], "values": [1, 4, 8], "save": True}
+    res = client.post("/calculations/sweep", json=payload, headers=headers)
+    assert res.status_code == 200, res.text
+    assert res.json()["results"] == [100, 25, 12.5]
+
+    stored = client.get(f"/calculations/{res.json()['calculation_id']}", headers=headers).json()
+    assert stored["type"] == "sweep"
+    assert stored["operation"] == "division"
+    assert stored["inputs"] == [100, [1, 4, 8]]
+    assert stored["result_array"] == [100, 25, 12.5]
+
+    res = client.put(f"/calculations/{stored['id']}", json={"inputs": [50, [1, 2]]}, headers=headers)
+    assert res.status_code == 200, res.text
+    assert res.json()["result_array"] == [50, 25]
+
+def test_sweep_expression_and_errors(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    payload = {"type": "expression", "expression": "a / b", "inputs": [None, 4], "values": [1, 2]}
+    res = client.post("/calculations/sweep", json=payload, headers=headers)
+    assert res.json()["results"] == [0.25, 0.5]
+
+    payload = {"type": "division", "inputs": [1, None], "values": [1, 0]}
+    res = client.post("/calculations/sweep", json=payload, headers=headers)
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Point 1 (0): Cannot divide by zero."
+
+    payload = {"type": "addition", "inputs": [1, 2], "values": [1]}
+    assert client.post("/calculations/sweep", json=payload, headers=headers).status_code == 422
+
+def test_create_sweep_directly(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    payload = {"type": "sweep", "operation": "multiplication", "inputs": [[1, 2, 3], 3]}
+    res = client.post("/calculations", json=payload, headers=headers)
+    assert res.status_code == 201, res.text
+    assert res.json()["result_array"] == [3, 6, 9]
+
+    payload = {"type": "addition", "operation": "multiplication", "inputs": [1, 2]}
+    assert client.post("/calculations", json=payload, headers=headers).status_code == 422
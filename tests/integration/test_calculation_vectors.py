@@ -0,0 +1,63 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_vector_and_matrix_results_round_trip(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations", json={"type": "vector_add", "inputs": [[1, 2, 3], [4, 5, 6], 0.5]}, headers=headers)
+    assert res.status_code == 201, res.text
+    body = res.json()
+    assert body["result"] is None
+    assert body["result_array"] == [5.5, 7.5, 9.5]
+
+    res = client.post("/calculations", json={"type": "matmul", "inputs": [[[1, 2], [3, 4]], [[5, 6], [7, 8]]]}, headers=headers)
+    assert res.status_code == 201, res.text
+    matrix_id = res.json()["id"]
+    res = client.get(f"/calculations/{matrix_id}", headers=headers)
+    assert res.json()["result_array"] == [[19, 22], [43, 50]]
+    assert res.json()["inputs"] == [[[1, 2], [3, 4]], [[5, 6], [7, 8]]]
+
+    res = client.post("/calculations", json={"type": "dot", "inputs": [[1, 2], [3, 4]]}, headers=headers)
+    assert res.json()["result"] == 11
+    assert res.json()["result_array"] is None
+
+def test_array_errors_are_bad_requests(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations", json={"type": "vector_divide", "inputs": [[1, 2], [0, 1]]}, headers=headers)
+    assert res.status_code == 400
+    assert "divide by zero" in res.json()["detail"]
+    res = client.post("/calculations", json={"type": "matmul", "inputs": [[[1, 2]], [[1, 2]]]}, headers=headers)
+    assert res.status_code == 400
+    assert "not aligned" in res.json()["detail"]
+
+def test_vector_results_feed_references(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    res = client.post("/calculations", json={"type": "vector_multiply", "inputs": [[1, 2], 3]}, headers=headers)
+    source_id = res.json()["id"]
+    res = client.post("/calculations", json={"type": "dot", "inputs": [[1, 1], [1, 1]]}, headers=headers)
+    dot_id = res.json()["id"]
+
+    res = client.put(f"/calculations/{dot_id}", json={"inputs": [{"calculation_id": source_id}, [1, 1]]}, headers=headers)
+    assert res.status_code == 200, res.text
+    assert res.json()["result"] == 9
+
+    res = client.put(f"/calculations/{source_id}", json={"inputs": [[1, 2], 10]}, headers=headers)
+    assert res.status_code == 200
+    assert res.json()["result_array"] == [10, 20]
+    assert client.get(f"/calculations/{dot_id}", headers=headers).json()["result"] == 30
+
+def test_vectors_in_batch_requests(user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    payload = [
+        {"type": "vector_subtract", "inputs": [[5, 5], [1, 2]]},
+        {"type": "addition", "inputs": [[1, 2], 3]},
+        {"type": "addition", "inputs": [1, 2]},
+    ]
+    res = client.post("/calculations/batch", json=payload, headers=headers)
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert results[0]["calculation"]["result_array"] == [4, 3]
+    assert "list of numbers" in results[1]["error"]
+    assert results[2]["calculation"]["result"] == 3
@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import text
+
+from app.database import engine
+from app.index_audit import audit_indexes, findings_sql, format_report, has_findings, main
+
+@pytest.fixture
+def narrow_index_created_last():
+    """
+    On the empty test tables (user_id, id) and (user_id, created_at DESC, id)
+    cost the same for a lookup by id and owner, and PostgreSQL picks the
+    index created last. create_all creates a table's indexes in set order, so
+    recreate the narrow one, which wins on a populated table, last.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_calculations_user_id_id"))
+        conn.execute(text("CREATE INDEX ix_calculations_user_id_id ON calculations (user_id, id)"))
+
+def test_model_indexes_are_minimal(narrow_index_created_last):
+    report = audit_indexes()
+    assert not has_findings(report), "\n".join(format_report(report))
+    indexes = {index.name: index for index in report["indexes"]}
+    assert "ix_users_id" not in indexes
+    assert "ix_calculations_type" not in indexes
+    used_by = indexes["ix_calculations_user_id_id"].used_by
+    assert "get/update/delete calculation: by id and owner" in used_by
+
+@pytest.fixture
+def legacy_indexes():
+    """The index set of databases created before the audit."""
+    legacy = [
+        "CREATE UNIQUE INDEX ix_users_id ON users (id)",
+        "CREATE INDEX ix_calculations_user_id ON calculations (user_id)",
+        "CREATE INDEX ix_calculations_type ON calculations (type)",
+        "DROP INDEX ix_calculations_user_id_id",
+    ]
+    with engine.begin() as conn:
+        for statement in legacy:
+            conn.execute(text(statement))
+    yield
+    with engine.begin() as conn:
+        for name in ("ix_users_id", "ix_calculations_user_id", "ix_calculations_type"):
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_calculations_user_id_id ON calculations (user_id, id)"))
+
+def test_legacy_indexes_are_reported(legacy_indexes, capsys):
+    report = audit_indexes()
+    indexes = {index.name: index for index in report["indexes"]}
+    assert indexes["ix_users_id"].duplicate_of == "users_pkey"
+    assert indexes["ix_calculations_user_id"].duplicate_of == "ix_calculations_user_created_id"
+    assert indexes["ix_calculations_type"].unused
+    assert [index.name for index in report["missing"]] == ["ix_calculations_user_id_id"]
+
+    statements = findings_sql(report)
+    assert "DROP INDEX CONCURRENTLY IF EXISTS ix_users_id;" in statements
+    assert "DROP INDEX CONCURRENTLY IF EXISTS ix_calculations_type;" in statements
+    assert any(s.startswith("CREATE INDEX CONCURRENTLY ix_calculations_user_id_id") for s in statements)
+
+    assert main(["--sql"]) == 1
+    output = capsys.readouterr().out
+    assert "ix_calculations_type (type)" in output and "UNUSED" in output
+    assert "MISSING" in output
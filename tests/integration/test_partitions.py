@@ -0,0 +1,202 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database import Base
+from app.index_audit import audit_indexes, findings_sql
+from app.models.calculation import Calculation
+from app.models.calculation_dependency import CalculationDependency
+from app.models.calculation_stats import UserCalculationStats
+from app.models.user import User
+from app.partitions import create_partitioned_table, list_partitions, maintain_partitions, partition_strategy
+
+SCHEMA = "partition_test"
+
+@pytest.fixture
+def scratch_engine():
+    """An engine whose unqualified tables live in a throwaway schema."""
+    admin = create_engine(settings.DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    bind = create_engine(settings.DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    yield bind
+    bind.dispose()
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    admin.dispose()
+
+def add_calculation(db, user, inputs, created_at):
+    calculation = Calculation.create("addition", user.id, inputs)
+    calculation.set_result(calculation.get_result())
+    calculation.created_at = created_at
+    db.add(calculation)
+    db.flush()
+    return calculation
+
+def explain(bind, statement):
+    compiled = statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    with bind.connect() as conn:
+        return "\n".join(conn.exec_driver_sql(f"EXPLAIN {compiled}").scalars())
+
+@pytest.fixture
+def month_partitioned(scratch_engine, monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_PARTITIONING", "month")
+    assert create_partitioned_table(scratch_engine, mode="month", months_ahead=1, today=date(2026, 9, 5))
+    Base.metadata.create_all(scratch_engine)
+    return scratch_engine
+
+def test_month_partitions_are_created(month_partitioned):
+    assert partition_strategy(month_partitioned) == "month"
+    assert list_partitions(month_partitioned) == [
+        "calculations_default", "calculations_y2026m09", "calculations_y2026m10",
+    ]
+    # Already exists: nothing to do
+    assert not create_partitioned_table(month_partitioned, mode="month")
+
+def test_lookups_prune_to_one_partition(month_partitioned):
+    with Session(month_partitioned) as db:
+        user = User(first_name="P", last_name="T", email="pt@example.com", username="pt", password="x" * 60)
+        db.add(user)
+        db.flush()
+        calculation = add_calculation(db, user, [1, 2], datetime.utcnow())
+        db.commit()
+        by_id = explain(month_partitioned, select(Calculation).where(
+            *Calculation.id_criteria(calculation.id), Calculation.user_id == user.id
+        ))
+        page = explain(month_partitioned, select(Calculation).where(
+            Calculation.user_id == user.id,
+            Calculation.created_at >= datetime(2026, 9, 1),
+            Calculation.created_at < datetime(2026, 10, 1),
+        ))
+    assert by_id.count("on calculations_") == 1
+    assert "calculations_y2026m09" in page and "calculations_y2026m10" not in page
+    assert "calculations_default" not in page
+
+def test_partitioned_indexes_are_credited_to_the_parent(month_partitioned):
+    report = audit_indexes(month_partitioned)
+    names = {index.name for index in report["indexes"]}
+    planned = set().union(*report["queries"].values())
+    assert planned <= names
+    assert "ix_calculations_user_created_id" in planned
+    assert not report["missing"]
+
+def test_index_findings_on_a_partitioned_table_run_without_concurrently(month_partitioned):
+    with month_partitioned.begin() as conn:
+        conn.execute(text("CREATE INDEX ix_calculations_user_id ON calculations (user_id)"))
+        conn.execute(text("DROP INDEX ix_calculations_user_id_id"))
+    report = audit_indexes(month_partitioned)
+    statements = findings_sql(report, month_partitioned)
+    assert "DROP INDEX IF EXISTS ix_calculations_user_id;" in statements
+    assert any(s.startswith("CREATE INDEX ix_calculations_user_id_id ON calculations") for s in statements)
+    assert not any("CONCURRENTLY" in s for s in statements)
+
+    # PostgreSQL accepts them, and the partition indexes follow the parent's
+    with month_partitioned.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+    report = audit_indexes(month_partitioned)
+    assert not report["missing"]
+    assert "ix_calculations_user_id" not in {index.name for index in report["indexes"]}
+
+def test_retention_drops_and_detaches_whole_months(month_partitioned):
+    with Session(month_partitioned) as db:
+        user = User(first_name="R", last_name="T", email="rt@example.com", username="rt", password="x" * 60)
+        db.add(user)
+        db.flush()
+        old = add_calculation(db, user, [1, 2], datetime(2026, 9, 10))
+        new = add_calculation(db, user, [3, 4], datetime(2026, 10, 10))
+        db.add(CalculationDependency(calculation_id=new.id, position=0, source_id=old.id))
+        # Before the first monthly partition: lands in the default partition
+        add_calculation(db, user, [7, 8], datetime(2026, 7, 20))
+        # A user without expired rows, whose stats maintenance must not touch
+        other = User(first_name="O", last_name="T", email="ot@example.com", username="ot", password="x" * 60)
+        db.add(other)
+        db.flush()
+        add_calculation(db, other, [5, 6], datetime(2026, 10, 11))
+        # Also in the default partition, but not expired
+        add_calculation(db, other, [9, 10], datetime(2030, 1, 1))
+        UserCalculationStats.rebuild(db)
+        db.get(UserCalculationStats, other.id).total_count = 42
+        new_id, user_id, other_id = new.id, user.id, other.id
+        db.commit()
+
+    planned = maintain_partitions(month_partitioned, months_ahead=2, retention_months=1,
+                                  dry_run=True, today=date(2026, 11, 2), report=lambda line: None)
+    assert planned == {
+        "created": ["calculations_y2026m11", "calculations_y2026m12", "calculations_y2027m01"],
+        "dropped": ["calculations_y2026m09"],
+        "detached": [],
+        "purged": ["calculations_default"],
+    }
+    assert "calculations_y2026m11" not in list_partitions(month_partitioned)
+
+    lines = []
+    maintain_partitions(month_partitioned, months_ahead=2, retention_months=1, detach=True,
+                        today=date(2026, 11, 2), report=lines.append)
+    assert "detached: calculations_y2026m09" in lines
+    assert list_partitions(month_partitioned) == [
+        "calculations_default", "calculations_y2026m10", "calculations_y2026m11",
+        "calculations_y2026m12", "calculations_y2027m01",
+    ]
+    assert "moved to calculations_default_expired: 1 expired rows of calculations_default" in lines
+    assert "removed 1 dependency edges, rebuilt stats for 1 users" in lines
+    with Session(month_partitioned) as db:
+        assert db.scalars(select(Calculation.id).where(Calculation.user_id == user_id)).all() == [new_id]
+        assert db.query(CalculationDependency).count() == 0
+        assert db.get(UserCalculationStats, user_id).total_count == 1
+        assert db.get(UserCalculationStats, other_id).total_count == 42
+        # The detached month is kept as a standalone table
+        assert db.execute(text("SELECT count(*) FROM calculations_y2026m09")).scalar() == 1
+        # So are the expired rows of the default partition; the rest stay
+        assert db.execute(text("SELECT count(*) FROM calculations_default_expired")).scalar() == 1
+        assert db.execute(text("SELECT count(*) FROM calculations_default")).scalar() == 1
+
+def test_retention_deletes_expired_rows_of_the_default_partition(month_partitioned):
+    with Session(month_partitioned) as db:
+        user = User(first_name="D", last_name="P", email="dp@example.com", username="dp", password="x" * 60)
+        db.add(user)
+        db.flush()
+        add_calculation(db, user, [1, 2], datetime(2026, 7, 20))
+        kept = add_calculation(db, user, [3, 4], datetime(2026, 9, 10))
+        UserCalculationStats.rebuild(db)
+        kept_id, user_id = kept.id, user.id
+        db.commit()
+
+    lines = []
+    actions = maintain_partitions(month_partitioned, months_ahead=0, retention_months=1,
+                                  today=date(2026, 9, 20), report=lines.append)
+    assert actions["purged"] == ["calculations_default"]
+    assert "deleted: 1 expired rows of calculations_default" in lines
+    assert "removed 0 dependency edges, rebuilt stats for 1 users" in lines
+    with Session(month_partitioned) as db:
+        assert db.scalars(select(Calculation.id).where(Calculation.user_id == user_id)).all() == [kept_id]
+        assert db.get(UserCalculationStats, user_id).total_count == 1
+    # Nothing left to purge
+    assert maintain_partitions(month_partitioned, months_ahead=0, retention_months=1,
+                               dry_run=True, today=date(2026, 9, 20), report=lambda line: None)["purged"] == []
+
+def test_retention_needs_month_partitioning(scratch_engine):
+    Base.metadata.create_all(scratch_engine)
+    with pytest.raises(ValueError, match="not partitioned by month"):
+        maintain_partitions(scratch_engine, report=lambda line: None)
+
+def test_hash_partitions_prune_on_user(scratch_engine, monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_PARTITIONING", "hash")
+    assert create_partitioned_table(scratch_engine, mode="hash", hash_partitions=4)
+    Base.metadata.create_all(scratch_engine)
+    assert partition_strategy(scratch_engine) == "hash"
+    assert list_partitions(scratch_engine) == [f"calculations_p0{i}" for i in range(4)]
+
+    with Session(scratch_engine) as db:
+        user = User(first_name="H", last_name="T", email="ht@example.com", username="ht", password="x" * 60)
+        db.add(user)
+        db.flush()
+        add_calculation(db, user, [5, 6], datetime.utcnow())
+        db.commit()
+        plan = explain(scratch_engine, select(Calculation).where(Calculation.user_id == user.id))
+        assert db.scalars(select(Calculation.result)).all() == [11.0]
+    assert plan.count("on calculations_p0") == 1
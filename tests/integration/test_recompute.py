@@ -0,0 +1,75 @@
+import pytest
+
+from app.models.calculation import Calculation
+from app.models.calculation_dependency import CalculationDependency
+from app.recompute import recompute_chunk, recompute_results
+
+@pytest.fixture
+def stale_calculations(db_session, test_user):
+    """Store calculations whose results are out of date."""
+    calculations = [
+        Calculation.create("addition", test_user.id, [1, 2, 3]),
+        Calculation.create("division", test_user.id, [10, 4]),
+        Calculation.create("multiplication", test_user.id, [3, 3]),
+    ]
+    stale = [0.0, 2.0, 9.0]  # the last one is already correct
+    for calculation, result in zip(calculations, stale):
+        calculation.result = result
+    db_session.add_all(calculations)
+    db_session.commit()
+    return calculations
+
+def test_recompute_chunk_reports_changes_and_errors():
+    rows = [
+        ("a", "addition", [1, 2], None, None, 3.0, None),
+        ("b", "subtraction", [5, 1], None, None, 0.0, None),
+        ("c", "division", [1, 0], None, None, None, None),
+        ("d", "expression", [1, 2], "a * b + 1", None, 2.0, None),
+        ("e", "vector_add", [[1, 2], [3, 4]], None, None, None, [4.0, 6.0]),
+        ("f", "vector_add", [[1, 2], [3, 5]], None, None, None, [4.0, 6.0]),
+        ("g", "sweep", [2, [1, 2]], None, "exponentiation", None, [2.0, 4.0]),
+    ]
+    updates, errors = recompute_chunk(rows)
+    assert updates == [
+        {"id": "b", "result": 4.0, "result_array": None},
+        {"id": "d", "result": 3.0, "result_array": None},
+        {"id": "f", "result": None, "result_array": [4.0, 7.0]},
+    ]
+    assert errors == 1
+
+@pytest.mark.parametrize("workers", [0, 2], ids=["in_process", "process_pool"])
+def test_recompute_results_fixes_stale_rows(db_session, stale_calculations, workers):
+    lines = []
+    totals = recompute_results(batch_size=2, workers=workers, report=lines.append)
+    assert totals["changed"] >= 2
+    assert totals["processed"] >= 3
+    assert lines and "rows/s" in lines[-1]
+
+    db_session.expire_all()
+    assert [db_session.get(Calculation, c.id).result for c in stale_calculations] == [6.0, 2.5, 9.0]
+
+def test_recompute_results_dry_run_writes_nothing(db_session, stale_calculations):
+    totals = recompute_results(batch_size=100, workers=0, dry_run=True, report=lambda line: None)
+    assert totals["changed"] >= 2
+
+    db_session.expire_all()
+    assert [db_session.get(Calculation, c.id).result for c in stale_calculations] == [0.0, 2.0, 9.0]
+
+def test_recompute_results_propagates_to_dependents(db_session, test_user):
+    source = Calculation.create("addition", test_user.id, [1, 2])
+    source.result = 0.0  # stale
+    dependent = Calculation.create("addition", test_user.id, [0.0, 10])
+    dependent.result = 10.0  # correct for the stale copy of the source
+    db_session.add_all([source, dependent])
+    db_session.flush()
+    CalculationDependency.link(db_session, dependent, {0: source.id}, replace=False)
+    db_session.commit()
+
+    totals = recompute_results(batch_size=100, workers=0, report=lambda line: None)
+    assert totals["propagated"] >= 1
+
+    db_session.expire_all()
+    assert db_session.get(Calculation, source.id).result == 3.0
+    dependent = db_session.get(Calculation, dependent.id)
+    assert dependent.inputs == [3.0, 10]
+    assert dependent.result == 13.0
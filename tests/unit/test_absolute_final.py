@@ -26,7 +26,9 @@ def test_calculation_enum_coverage():
     assert "multiplication" in values
     assert "division" in values
     assert "exponentiation" in values
-    assert len(values) == 5
+    assert "expression" in values
+    assert "percentile" in values
+    assert len(values) == 20
 
 def test_final_edge_cases():
     """Test final edge cases to reach 90%."""
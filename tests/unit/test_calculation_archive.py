@@ -0,0 +1,43 @@
+import uuid
+import zlib
+from datetime import datetime
+
+from app.models.user import User  # noqa: F401 - configures the Calculation mappers
+import app.models  # noqa: F401 - registers every calculation type
+from app.models.calculation import Calculation
+from app.models.calculation_archive import ArchivedCalculation
+
+def archived(calculation):
+    calculation.id = uuid.uuid4()
+    calculation.created_at = datetime(2020, 1, 1)
+    calculation.updated_at = datetime(2020, 1, 2, 3, 4, 5)
+    return ArchivedCalculation(**ArchivedCalculation.from_calculation(calculation))
+
+def test_round_trip_keeps_type_inputs_and_result():
+    calculation = Calculation.create("division", uuid.uuid4(), [9.0, 3.0])
+    calculation.set_result(3.0)
+    row = archived(calculation)
+    assert row.type == "division" and row.operand_count == 2
+    restored = row.to_calculation()
+    assert type(restored).__name__ == "Division"
+    assert (restored.id, restored.user_id, restored.inputs, restored.value) == (
+        calculation.id, calculation.user_id, [9.0, 3.0], 3.0
+    )
+    assert restored.created_at == datetime(2020, 1, 1)
+    assert restored.updated_at == datetime(2020, 1, 2, 3, 4, 5)
+
+def test_round_trip_keeps_attributes_and_array_results():
+    expression = Calculation.create("expression", uuid.uuid4(), [2, 3], expression="x0 * x1")
+    expression.set_result(6.0)
+    assert archived(expression).to_calculation().expression == "x0 * x1"
+
+    vector = Calculation.create("vector_add", uuid.uuid4(), [[1, 2], [3, 4]])
+    vector.set_result([4.0, 6.0])
+    restored = archived(vector).to_calculation()
+    assert restored.inputs == [[1, 2], [3, 4]] and restored.value == [4.0, 6.0]
+
+def test_payload_is_compressed():
+    calculation = Calculation.create("addition", uuid.uuid4(), [1.5] * 1000)
+    calculation.set_result(1500.0)
+    row = archived(calculation)
+    assert len(row.payload) < len(zlib.decompress(row.payload)) / 10
@@ -0,0 +1,58 @@
+import math
+import random
+
+import pytest
+
+from app.models.calculation import Calculation
+from app.operations.batch import pack, add_rows, divide_rows, power_rows
+
+TYPES = ["addition", "subtraction", "multiplication", "division", "exponentiation"]
+
+def test_pack_pads_ragged_rows():
+    assert pack([[1, 2, 3], [4]], 1.0).tolist() == [[1.0, 2.0, 3.0], [4.0, 1.0, 1.0]]
+
+def test_add_rows_is_sequential_not_pairwise():
+    # Pairwise summation would round this differently from a left-to-right loop
+    row = [0.1] * 10
+    expected = 0
+    for value in row:
+        expected += value
+    assert add_rows([row])[0] == expected
+
+def test_kernels_flag_invalid_items_as_non_finite():
+    assert divide_rows([[1, 0]])[0] == float("inf")
+    assert math.isnan(power_rows([[10.0, 1000.0]])[0])
+    assert math.isnan(power_rows([[-8.0, 0.5]])[0])
+
+def test_evaluate_batch_matches_get_result():
+    rng = random.Random(601)
+    calculations = []
+    for _ in range(500):
+        calc_type = rng.choice(TYPES)
+        if calc_type == "exponentiation":
+            inputs = [rng.uniform(0.1, 10), rng.uniform(-5, 5)]
+        else:
+            inputs = [rng.uniform(-1000, 1000) for _ in range(rng.randint(2, 12))]
+        calculations.append(Calculation.create(calc_type, None, inputs))
+
+    results = Calculation.evaluate_batch(calculations)
+    assert results == [c.get_result() for c in calculations]
+
+def test_evaluate_batch_reports_per_item_errors():
+    calculations = [
+        Calculation.create("division", None, [10, 2]),
+        Calculation.create("division", None, [10, 0, 2]),
+        Calculation.create("addition", None, [1]),
+        Calculation.create("exponentiation", None, [2, 3, 4]),
+        Calculation.create("multiplication", None, [2, 3]),
+    ]
+    results = Calculation.evaluate_batch(calculations)
+    assert results[0] == 5
+    assert str(results[1]) == "Cannot divide by zero."
+    assert isinstance(results[2], ValueError)
+    assert "at least two numbers" in str(results[2])
+    assert "exactly two numbers" in str(results[3])
+    assert results[4] == 6
+
+def test_evaluate_batch_empty():
+    assert Calculation.evaluate_batch([]) == []
@@ -0,0 +1,14 @@
+import pytest
+
+from app.models.calculation_dependency import topological_order
+
+def test_topological_order_puts_dependencies_first():
+    order = topological_order({"total": ["subtotal", "tax"], "tax": ["subtotal"], "subtotal": []})
+    assert order == ["subtotal", "tax", "total"]
+
+def test_topological_order_counts_repeated_parents_once():
+    assert topological_order({"b": ["a", "a"], "a": []}) == ["a", "b"]
+
+def test_topological_order_rejects_cycles():
+    with pytest.raises(ValueError, match="cycle"):
+        topological_order({"a": ["b"], "b": ["a"], "c": []})
@@ -0,0 +1,75 @@
+import pytest
+
+from app.core.config import settings
+from app.models.calculation import Calculation, Exponentiation, Multiplication, Division
+from app.schemas.calculation import CalculationBase, CalculationUpdate
+
+def test_exponentiation_overflow_is_rejected_before_computing():
+    calc = Exponentiation(user_id=None, inputs=[10, 400])
+    assert calc.estimated_magnitude() == pytest.approx(400)
+    with pytest.raises(ValueError, match="too large"):
+        calc.get_result()
+
+def test_exponentiation_huge_integer_exponent():
+    calc = Exponentiation(user_id=None, inputs=[2, 10 ** 400])
+    with pytest.raises(ValueError, match="too large"):
+        calc.get_result()
+
+def test_exponentiation_zero_to_negative_power():
+    with pytest.raises(ValueError, match="Cannot raise zero to a negative power."):
+        Exponentiation(user_id=None, inputs=[0, -1]).get_result()
+
+def test_exponentiation_complex_result():
+    with pytest.raises(ValueError, match="not a real number"):
+        Exponentiation(user_id=None, inputs=[-8, 0.5]).get_result()
+
+def test_exponentiation_near_limit_still_computes():
+    assert Exponentiation(user_id=None, inputs=[10, 300]).get_result() == 10 ** 300
+    assert Exponentiation(user_id=None, inputs=[0.5, 2000]).get_result() == 0.5 ** 2000
+
+def test_multiplication_and_division_overflow():
+    with pytest.raises(ValueError, match="too large"):
+        Multiplication(user_id=None, inputs=[1e200, 1e200]).get_result()
+    with pytest.raises(ValueError, match="too large"):
+        Division(user_id=None, inputs=[1e300, 1e-300]).get_result()
+    # A zero factor makes the magnitude unknowable up front, but the result is fine
+    assert Multiplication(user_id=None, inputs=[0, 1e200, 1e200]).get_result() == 0
+
+def test_existing_error_messages_are_unchanged():
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        Division(user_id=None, inputs=[1, 0]).get_result()
+    with pytest.raises(ValueError, match="at least two numbers"):
+        Multiplication(user_id=None, inputs=[1]).get_result()
+
+def test_operand_limit(monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_MAX_OPERANDS", 3)
+    with pytest.raises(ValueError, match="at most 3 numbers"):
+        Calculation.create("addition", None, [1, 2, 3, 4]).get_result()
+    assert Calculation.create("addition", None, [1, 2, 3]).get_result() == 6
+
+def test_guards_apply_to_cached_results(monkeypatch):
+    assert Calculation.create("addition", None, [1, 2, 3, 4]).get_result() == 10
+    monkeypatch.setattr(settings, "CALCULATION_MAX_OPERANDS", 3)
+    with pytest.raises(ValueError, match="at most 3 numbers"):
+        Calculation.create("addition", None, [1, 2, 3, 4]).get_result()
+    assert isinstance(Calculation.evaluate_batch([Calculation.create("addition", None, [1, 2, 3, 4])])[0], ValueError)
+
+def test_evaluate_batch_applies_guards(monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_MAX_OPERANDS", 3)
+    results = Calculation.evaluate_batch([
+        Calculation.create("addition", None, [1, 2, 3, 4]),
+        Calculation.create("exponentiation", None, [10, 400]),
+        Calculation.create("multiplication", None, [2, 3]),
+    ])
+    assert isinstance(results[0], ValueError)
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 6
+
+def test_schema_rejects_oversized_inputs(monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_MAX_OPERANDS", 3)
+    monkeypatch.setattr(settings, "CALCULATION_STATISTICS_MAX_OPERANDS", 3)
+    with pytest.raises(ValueError):
+        CalculationBase(type="addition", inputs=[1, 2, 3, 4])
+    with pytest.raises(ValueError):
+        CalculationUpdate(inputs=[1, 2, 3, 4])
+    assert CalculationBase(type="addition", inputs=[1, 2, 3]).inputs == [1, 2, 3]
@@ -0,0 +1,45 @@
+import uuid
+
+from sqlalchemy import select
+
+from app.models.user import User  # noqa: F401 - configures the Calculation mappers
+import app.models  # noqa: F401 - registers every calculation type
+from app.core.config import settings
+from app.models.calculation import Calculation
+from app.models.calculation_payload import PAYLOAD_COLUMNS, CalculationPayload, content_hash
+
+def test_hash_ignores_int_float_and_type_case():
+    assert content_hash("addition", [1, 2]) == content_hash("Addition", [1.0, 2.0])
+    assert len(content_hash("addition", [1, 2])) == 32
+    assert content_hash("vector_add", [[1, 2], [3, 4]]) == content_hash("vector_add", [[1.0, 2.0], [3.0, 4.0]])
+
+def test_hash_covers_type_inputs_and_attributes():
+    keys = {
+        content_hash("addition", [1, 2]),
+        content_hash("subtraction", [1, 2]),
+        content_hash("addition", [2, 1]),
+        content_hash("expression", [1, 2], expression="x0 + x1"),
+        content_hash("expression", [1, 2], expression="x0 * x1"),
+        content_hash("vector_add", [[1, 2], [3, 4]]),
+        content_hash("vector_add", [[1, 2, 3, 4]]),
+    }
+    assert len(keys) == 7
+
+def test_key_of_matches_the_owner_free_hash():
+    first = Calculation.create("multiplication", uuid.uuid4(), [2, 3])
+    second = Calculation.create("multiplication", uuid.uuid4(), [2.0, 3.0])
+    assert CalculationPayload.key_of(first) == CalculationPayload.key_of(second)
+
+def test_fill_values_restores_the_content():
+    calculation = Calculation.create("vector_add", uuid.uuid4(), [[1, 2], [3, 4]])
+    calculation.set_result([4.0, 6.0])
+    content = {name: getattr(calculation, name) for name in PAYLOAD_COLUMNS}
+    empty = Calculation.create("vector_add", uuid.uuid4(), [[0, 0], [0, 0]])
+    CalculationPayload.fill_values(empty, content)
+    assert empty.inputs == [[1, 2], [3, 4]] and empty.value == [4.0, 6.0]
+
+def test_payloads_are_joined_only_in_content_addressed_mode(monkeypatch):
+    assert "JOIN" not in str(select(Calculation))
+    assert "JOIN" not in str(select(Calculation).options(*Calculation.payload_loading()))
+    monkeypatch.setattr(settings, "CALCULATION_CONTENT_ADDRESSED", True)
+    assert "JOIN calculation_payloads" in str(select(Calculation).options(*Calculation.payload_loading()))
@@ -25,3 +25,13 @@ def test_report_typical():
     assert abs(report.average_operands - 2.4) < 1e-6
     assert report.most_common_type == "addition"
     assert report.last_calculation_at == now
+
+def test_stats_derived_fields():
+    from app.models.calculation_stats import UserCalculationStats
+    empty = UserCalculationStats(total_count=0, operand_sum=0, type_counts={})
+    assert empty.average_operands == 0.0
+    assert empty.most_common_type is None
+
+    stats = UserCalculationStats(total_count=4, operand_sum=10, type_counts={"addition": 1, "division": 3})
+    assert stats.average_operands == 2.5
+    assert stats.most_common_type == "division"
@@ -0,0 +1,75 @@
+import pytest
+
+from app.core import evaluation
+from app.core.cache import result_cache
+from app.core.config import settings
+from app.core.evaluation import EvaluationTimeoutError, evaluate, should_offload, shutdown_executor
+from app.models.calculation import Calculation
+
+@pytest.fixture
+def process_mode(monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_EXECUTOR", "process")
+    monkeypatch.setattr(settings, "CALCULATION_PROCESS_MIN_COST", 3)
+    monkeypatch.setattr(settings, "CALCULATION_PROCESS_TIMEOUT_SECONDS", 30.0)
+    result_cache.clear()
+    yield
+    shutdown_executor()
+    result_cache.clear()
+
+def test_inline_by_default():
+    calc = Calculation.create("addition", None, list(range(100000)))
+    assert not should_offload(calc)
+    assert evaluate(calc) == calc.get_result()
+    assert evaluation._pool is None
+
+def test_small_calculations_stay_inline(process_mode):
+    calc = Calculation.create("addition", None, [1, 2])
+    assert not should_offload(calc)
+    assert evaluate(calc) == 3
+    assert evaluation._pool is None
+
+def test_large_calculations_are_offloaded(process_mode):
+    calc = Calculation.create("multiplication", None, [1.5, 2, 3, 4])
+    assert should_offload(calc)
+    assert evaluate(calc) == 36
+    assert evaluation._pool is not None
+    # The result was cached in this process
+    assert evaluate(calc) == 36
+    assert result_cache.stats()["hits"] == 1
+
+def test_offloaded_errors_propagate(process_mode):
+    calc = Calculation.create("division", None, [1, 2, 0])
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        evaluate(calc)
+
+def test_offloaded_timeout(process_mode, monkeypatch):
+    # A freshly spawned pool cannot answer within a microsecond
+    monkeypatch.setattr(settings, "CALCULATION_PROCESS_TIMEOUT_SECONDS", 1e-6)
+    calc = Calculation.create("subtraction", None, [10, 1, 2, 3])
+    with pytest.raises(EvaluationTimeoutError):
+        evaluate(calc)
+
+def test_timeout_recycles_the_pool(process_mode, monkeypatch):
+    assert evaluate(Calculation.create("addition", None, [1, 2, 3])) == 6
+    pool = evaluation._pool
+    workers = list(pool._processes.values())
+    monkeypatch.setattr(settings, "CALCULATION_PROCESS_TIMEOUT_SECONDS", 1e-6)
+    with pytest.raises(EvaluationTimeoutError):
+        evaluate(Calculation.create("addition", None, [4, 5, 6]))
+    assert evaluation._pool is None
+    for process in workers:
+        process.join(timeout=10)
+        assert not process.is_alive()
+    # The next offload starts a fresh pool
+    monkeypatch.setattr(settings, "CALCULATION_PROCESS_TIMEOUT_SECONDS", 30.0)
+    assert evaluate(Calculation.create("addition", None, [7, 8, 9])) == 24
+    assert evaluation._pool is not pool
+
+def test_exponentiation_cost_grows_with_the_exponent(process_mode, monkeypatch):
+    small = Calculation.create("exponentiation", None, [7, 2])
+    large = Calculation.create("exponentiation", None, [7, 300])
+    assert large.estimated_cost() > 100 * small.estimated_cost()
+    assert Calculation.create("exponentiation", None, [7.5, 300]).estimated_cost() == 2
+    monkeypatch.setattr(settings, "CALCULATION_PROCESS_MIN_COST", 1000)
+    assert should_offload(large) and not should_offload(small)
+    assert evaluate(large) == 7 ** 300
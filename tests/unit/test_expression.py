@@ -0,0 +1,85 @@
+import pytest
+
+from app.models.calculation import Calculation, Expression
+from app.operations.expression import compile_expression
+
+def test_named_operands_bind_in_order_of_appearance():
+    plan = compile_expression("(a + b) / c ** 2")
+    assert plan.operands == ("a", "b", "c")
+    assert plan.evaluate([1, 2, 3]) == pytest.approx(1 / 3)
+    assert compile_expression("b - a").evaluate([5, 3]) == 2
+
+def test_positional_operands():
+    plan = compile_expression("x[1] - x[0]")
+    assert plan.arity == 2
+    assert plan.evaluate([10, 4]) == -6
+
+def test_large_positional_index_compiles_to_one_sequence_parameter():
+    plan = compile_expression("x[99999] - x[3]")
+    assert plan.arity == 100000
+    assert plan.operands == ("x[3]", "x[99999]")
+    assert plan.function.__code__.co_argcount == 1
+    with pytest.raises(ValueError, match="100000 operand"):
+        plan.evaluate([1, 2, 3, 4])
+    assert plan.evaluate([0] * 3 + [1] + [0] * 99995 + [5]) == 4
+
+def test_expression_is_not_compiled_before_the_cost_guard():
+    compile_expression.cache_clear()
+    calc = Calculation.create("expression", None, [1] * 10**6, expression="x[999999] + 1")
+    with pytest.raises(ValueError, match="Too many inputs"):
+        calc.get_result()
+    assert calc.estimated_cost() > 10**6
+    assert compile_expression.cache_info().currsize == 0
+
+def test_plans_are_cached_by_text():
+    compile_expression.cache_clear()
+    first = compile_expression("a * 2 + b")
+    assert compile_expression("a * 2 + b") is first
+    assert compile_expression.cache_info().hits == 1
+
+@pytest.mark.parametrize("text", [
+    "__import__('os').system('true')",
+    "a.real",
+    "abs(a)",
+    "a if b else c",
+    "a < b",
+    "[a, b]",
+    "'text' * 2",
+    "_a + 1",
+    "x + 1",
+    "x[a]",
+    "a + x[0]",
+    "a +",
+    "",
+    "(" * 500 + "a" + ")" * 500,
+])
+def test_rejected_expressions(text):
+    with pytest.raises(ValueError):
+        compile_expression(text)
+
+def test_arity_and_arithmetic_errors():
+    plan = compile_expression("a / b")
+    with pytest.raises(ValueError, match="2 operand"):
+        plan.evaluate([1])
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        plan.evaluate([1, 0])
+
+def test_integer_constants_do_not_build_big_integers():
+    with pytest.raises(ValueError, match="too large"):
+        Calculation.create("expression", None, [9], expression="a ** 9 ** 9").get_result()
+
+def test_expression_model():
+    calc = Calculation.create("expression", None, [1, 2, 3], expression="(a + b) / c ** 2")
+    assert isinstance(calc, Expression)
+    assert calc.get_result() == pytest.approx(1 / 3)
+    assert calc.estimated_cost() > 3
+    with pytest.raises(ValueError, match="require an expression"):
+        Calculation.create("expression", None, [1, 2]).get_result()
+
+def test_result_cache_distinguishes_expressions():
+    first = Calculation.create("expression", None, [6, 3], expression="a - b")
+    second = Calculation.create("expression", None, [6, 3], expression="a / b")
+    assert first.cache_key() != second.cache_key()
+    assert first.get_result() == 3
+    assert second.get_result() == 2
+    assert Calculation.evaluate_batch([first, second]) == [3, 2]
@@ -0,0 +1,47 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.core import ids
+from app.core.ids import uuid7, uuid7_time
+from app.models.calculation import Calculation
+from app.models.user import User
+
+def test_version_variant_and_timestamp():
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    assert abs(uuid7_time(value) - datetime.now(timezone.utc)) < timedelta(seconds=5)
+
+def test_ids_are_strictly_increasing():
+    values = [uuid7() for _ in range(20000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+def test_sequence_overflow_and_clock_going_back(monkeypatch):
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_000_000_000_000_000)
+    values = [uuid7() for _ in range(5000)]
+    assert values == sorted(values)
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 999_000_000_000_000)
+    assert uuid7() > values[-1]
+
+def test_ids_from_many_threads_are_unique():
+    results = []
+    def worker():
+        results.extend(uuid7() for _ in range(2000))
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(results)) == 8000
+
+def test_uuid7_time_rejects_other_versions():
+    with pytest.raises(ValueError, match="Not a version 7 UUID."):
+        uuid7_time(uuid4())
+
+def test_models_default_to_uuid7():
+    for model in (Calculation, User):
+        assert model.__table__.c.id.default.arg(None).version == 7
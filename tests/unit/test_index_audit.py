@@ -0,0 +1,44 @@
+from app.index_audit import IndexInfo, find_duplicates, plan_index_names
+
+def index(name, *columns, table="t", **flags):
+    return IndexInfo(table=table, name=name, columns=columns, **flags)
+
+def test_prefix_of_another_index_is_a_duplicate():
+    indexes = [
+        index("ix_user", "user_id"),
+        index("ix_user_created", "user_id", "created_at DESC", "id"),
+        index("ix_created", "created_at DESC"),
+    ]
+    assert find_duplicates(indexes) == {"ix_user": "ix_user_created"}
+
+def test_unique_index_on_the_primary_key_is_a_duplicate():
+    indexes = [index("t_pkey", "id", is_primary=True, is_unique=True), index("ix_id", "id", is_unique=True)]
+    assert find_duplicates(indexes) == {"ix_id": "t_pkey"}
+
+def test_unique_index_is_not_covered_by_a_longer_index():
+    indexes = [index("ix_email", "email", is_unique=True), index("ix_email_name", "email", "name")]
+    assert find_duplicates(indexes) == {}
+
+def test_identical_indexes_keep_one():
+    indexes = [index("ix_b", "a"), index("ix_a", "a")]
+    assert find_duplicates(indexes) == {"ix_b": "ix_a"}
+
+def test_other_tables_and_partial_indexes_are_separate():
+    indexes = [
+        index("ix_one", "a", table="one"),
+        index("ix_two", "a", "b", table="two"),
+        index("ix_partial", "a", "b", table="one", predicate="(a > 0)"),
+    ]
+    assert find_duplicates(indexes) == {}
+
+def test_constraints_are_never_unused():
+    assert not index("t_pkey", "id", is_primary=True, is_unique=True).unused
+    assert index("ix_type", "type").unused
+    assert not index("ix_type", "type", used_by=["query"]).unused
+
+def test_plan_index_names_walks_nested_plans():
+    plan = [{"Plan": {"Node Type": "BitmapOr", "Plans": [
+        {"Node Type": "Bitmap Index Scan", "Index Name": "ix_users_username"},
+        {"Node Type": "Bitmap Index Scan", "Index Name": "ix_users_email"},
+    ]}}]
+    assert plan_index_names(plan) == {"ix_users_username", "ix_users_email"}
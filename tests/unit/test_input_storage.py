@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.core.packed import pack_floats
+from app.models.calculation import Calculation
+
+def test_input_columns_by_storage():
+    assert Calculation.input_columns([1, 2.5], "json") == {
+        "inputs_json": [1, 2.5], "inputs_array": None, "inputs_packed": None, "operand_count": 2,
+    }
+    assert Calculation.input_columns([1, 2.5], "array")["inputs_array"] == [1.0, 2.5]
+    assert Calculation.input_columns([1, 2.5], "packed")["inputs_packed"] == pack_floats([1, 2.5])
+
+@pytest.mark.parametrize("inputs", [[[1, 2], 3], [True, 1], "abc"])
+def test_inputs_that_are_not_flat_numbers_stay_json(inputs):
+    columns = Calculation.input_columns(inputs, "packed")
+    assert columns["inputs_json"] == inputs
+    assert columns["inputs_packed"] is None
+
+def test_decode_prefers_the_typed_columns():
+    assert Calculation.decode_inputs(None, None, memoryview(pack_floats([-0.0, 3]))) == [-0.0, 3.0]
+    assert Calculation.decode_inputs(None, [1.0, 2.0], None) == [1.0, 2.0]
+    assert Calculation.decode_inputs([[1], 2], None, None) == [[1], 2]
+
+@pytest.mark.parametrize("storage", ["json", "array", "packed"])
+def test_inputs_property_round_trips(monkeypatch, storage):
+    monkeypatch.setattr(settings, "CALCULATION_INPUTS_STORAGE", storage)
+    calculation = Calculation.create("division", None, [100, 4, 5])
+    assert calculation.inputs == [100, 4, 5]
+    assert calculation.count_operands() == 3
+    assert calculation.get_result() == 5.0
+
+def test_decoded_inputs_are_reused_until_the_column_changes(monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_INPUTS_STORAGE", "packed")
+    calculation = Calculation.create("addition", None, [1, 2])
+    calculation.inputs_packed = pack_floats([3, 4])  # as if reloaded from the database
+    first = calculation.inputs
+    assert first == [3.0, 4.0]
+    assert calculation.inputs is first
+
+def test_count_operands_falls_back_to_inputs():
+    calculation = Calculation.create("addition", None, [1, 2, 3])
+    calculation.operand_count = None
+    assert calculation.count_operands() == 3
+
+@pytest.mark.parametrize("calculation_type, values, expected", [
+    ("addition", [1, 2, 3.5], 6.5),
+    ("mean", [2, 4, 9], 5.0),
+    ("division", [100, 4, 5], 5.0),
+])
+def test_packed_rows_evaluate_without_building_a_list(monkeypatch, calculation_type, values, expected):
+    monkeypatch.setattr(settings, "CALCULATION_INPUTS_STORAGE", "packed")
+    stored = Calculation.create(calculation_type, None, values)
+    calculation = Calculation.create(calculation_type, None, [0])
+    calculation.inputs_packed = stored.inputs_packed  # as if reloaded from the database
+    operands = calculation.operands()
+    assert isinstance(operands, np.ndarray) and np.shares_memory(operands, np.frombuffer(stored.inputs_packed))
+    if calculation_type != "division":  # its magnitude guard reads the list
+        monkeypatch.setattr(Calculation, "decode_inputs", lambda *args: pytest.fail("inputs were decoded"))
+    assert calculation.get_result() == expected
+    assert Calculation.evaluate_batch([calculation]) == [expected]
+
+def test_decoded_operands_are_kept_packed():
+    view = Calculation.decode_operands(None, None, pack_floats([1, 2]))
+    assert view.tolist() == [1.0, 2.0]
+    assert Calculation.decode_operands([[1], 2], None, None) == [[1], 2]
+    columns = Calculation.input_columns(view, "json")
+    assert columns["inputs_packed"] == pack_floats([1, 2]) and columns["inputs_json"] is None
+    assert columns["operand_count"] == 2
@@ -0,0 +1,45 @@
+import pytest
+
+from app.models.calculation import Addition, Calculation, Division, Exponentiation
+from app.operations.registry import OperationRegistry, operation_registry
+from app.schemas.calculation import CalculationBase, CalculationType
+
+def test_builtin_operations_are_registered():
+    assert operation_registry.names == {
+        "addition", "subtraction", "multiplication", "division", "exponentiation",
+        "expression", "mean", "median", "variance", "stddev", "min", "max", "percentile",
+        "vector_add", "vector_subtract", "vector_multiply", "vector_divide", "dot", "matmul", "sweep",
+    }
+    assert operation_registry.get("addition") is Addition
+    assert operation_registry.get("DIVISION") is Division
+    assert "Exponentiation" in operation_registry
+    assert "calculation" not in operation_registry
+
+def test_table_is_frozen():
+    with pytest.raises(TypeError):
+        operation_registry.table["modulo"] = Addition
+    with pytest.raises(RuntimeError):
+        operation_registry.register("modulo", Addition)
+
+def test_registry_lifecycle():
+    registry = OperationRegistry()
+    registry.register("Modulo", object)
+    registry.register("modulo", object)  # re-registering the same implementation is a no-op
+    with pytest.raises(ValueError):
+        registry.register("modulo", int)
+    assert registry.get("MODULO") is object
+    assert registry.names == {"modulo"}
+    assert registry.get("missing") is None
+
+def test_schema_types_come_from_registry():
+    assert {e.value for e in CalculationType} == operation_registry.names
+    with pytest.raises(ValueError, match="Type must be one of"):
+        CalculationBase(type="modulo", inputs=[1, 2])
+
+def test_validation_rules_come_from_operand_range():
+    with pytest.raises(ValueError, match="exactly two numbers"):
+        Exponentiation(user_id=None, inputs=[2, 3, 4]).get_result()
+    with pytest.raises(ValueError, match="at least two numbers"):
+        Calculation.create("addition", None, [1]).get_result()
+    with pytest.raises(ValueError, match="list of numbers"):
+        Addition(user_id=None, inputs="1,2").get_result()
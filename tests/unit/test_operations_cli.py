@@ -0,0 +1,150 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from app.operations import catalog, cli
+
+NDJSON = "\n".join([
+    '{"type": "addition", "inputs": [1, 2, 3]}',
+    '{"type": "division", "inputs": [1, 0]}',
+    '',
+    'not json',
+    '{"type": "expression", "inputs": [2, 3], "expression": "a * b"}',
+    '{"type": "vector_add", "inputs": [[1, 2], 1]}',
+    '{"type": "sweep", "operation": "exponentiation", "inputs": [2, [0, 1, 2]]}',
+    '{"type": "nope", "inputs": [1]}',
+    '[1, 2]',
+]) + "\n"
+
+EXPECTED = [
+    {"line": 1, "result": 6.0},
+    {"line": 2, "error": "Cannot divide by zero."},
+    {"line": 4, "error": "Invalid JSON: Expecting value"},
+    {"line": 5, "result": 6.0},
+    {"line": 6, "result": [2.0, 3.0]},
+    {"line": 7, "result": [1.0, 2.0, 4.0]},
+    {"line": 8, "error": "Unsupported calculation type: nope"},
+    {"line": 9, "error": 'Each line must be an object with a "type" and "inputs".'},
+]
+
+def run(tmp_path, text, *args, name="in.ndjson"):
+    source = tmp_path / name
+    source.write_text(text)
+    target = tmp_path / "out"
+    code = cli.main([str(source), "-o", str(target), "-q", *args])
+    return code, target.read_text()
+
+def test_ndjson_in_process(tmp_path):
+    code, output = run(tmp_path, NDJSON, "-w", "0", "--chunk-size", "3")
+    assert code == 1
+    assert [json.loads(line) for line in output.splitlines()] == EXPECTED
+
+def test_process_pool_keeps_input_order(tmp_path):
+    lines = [json.dumps({"type": "multiplication", "inputs": [i, 2]}) for i in range(1, 501)]
+    code, output = run(tmp_path, "\n".join(lines), "-w", "2", "--chunk-size", "7")
+    assert code == 0
+    assert [json.loads(line) for line in output.splitlines()] == [
+        {"line": i, "result": 2.0 * i} for i in range(1, 501)
+    ]
+
+def test_csv_detected_from_extension(tmp_path):
+    text = "type,a,b\naddition,1,2\nmultiplication,2,x\nexponentiation,0,-1\nsubtraction,10,4,1\n"
+    code, output = run(tmp_path, text, "-w", "0", "--output-format", "csv", name="in.csv")
+    assert code == 1
+    assert output.splitlines() == [
+        "line,result,error",
+        "2,3.0,",
+        "3,,Operands must be numbers.",
+        "4,,Cannot raise zero to a negative power.",
+        "5,5.0,",
+    ]
+
+def test_stdin_and_summary(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO('{"type": "addition", "inputs": [1, 1]}\n'))
+    assert cli.main(["-w", "0"]) == 0
+    out, err = capsys.readouterr()
+    assert json.loads(out) == {"line": 1, "result": 2.0}
+    assert err.strip() == "1 succeeded, 0 failed"
+
+@pytest.mark.parametrize("args", [["--workers", "-1"], ["--chunk-size", "0"]])
+def test_invalid_arguments(args):
+    with pytest.raises(SystemExit):
+        cli.main(args)
+
+def test_cli_does_not_import_the_orm(tmp_path):
+    source = tmp_path / "in.ndjson"
+    source.write_text(NDJSON)
+    script = (
+        "import sys\n"
+        "from app.operations import cli\n"
+        f"cli.main([{str(source)!r}, '-o', {str(tmp_path / 'out')!r}, '-w', '0', '-q'])\n"
+        "assert 'sqlalchemy' not in sys.modules and 'app.models' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+    assert [json.loads(line) for line in (tmp_path / "out").read_text().splitlines()] == EXPECTED
+
+# At least one valid and one failing case for every calculation type
+SAMPLES = {
+    "addition": [([1, 2.5, -3], {}), ([1, "x"], {}), ([1], {})],
+    "subtraction": [([10, 4, 1], {}), ([1], {})],
+    "multiplication": [([2, 3, 4], {}), ([1e200, 1e200], {})],
+    "division": [([10, 4], {}), ([10, 0], {})],
+    "exponentiation": [([2, 10], {}), ([0, -1], {}), ([-8, 0.5], {}), ([10.0, 400], {}), ([2, 3, 4], {})],
+    "expression": [([1, 2, 3], {"expression": "(a + b) / c ** 2"}), ([1], {}), ([1, 0], {"expression": "a / b"})],
+    "mean": [([2, 4, 9], {}), ([], {})],
+    "median": [([7, 1, 3, 5], {}), (["x"], {})],
+    "variance": [([2, 4, 4, 4, 5, 5, 7, 9], {}), ([1], {})],
+    "stddev": [([2, 4, 4, 4, 5, 5, 7, 9], {}), ([1], {})],
+    "min": [([3, -1, 2], {}), ([], {})],
+    "max": [([3, -1, 2], {}), ([], {})],
+    "percentile": [([50, 1, 2, 3, 4], {}), ([150, 1, 2], {})],
+    "vector_add": [([[1, 2], [3, 4], 10], {}), ([[1, 2], [3]], {})],
+    "vector_subtract": [([[10, 20], [1, 2]], {}), ([1, 2], {})],
+    "vector_multiply": [([[1, 2], [3, 4], 2], {}), ([[1, 2]], {})],
+    "vector_divide": [([[10, 20], [2, 4]], {}), ([[1, 2], [1, 0]], {})],
+    "dot": [([[1, 2, 3], [4, 5, 6]], {}), ([[1, 2], [3]], {})],
+    "matmul": [([[[1, 2], [3, 4]], [[5], [6]]], {}), ([[[1, 2]], [[3, 4]]], {})],
+    "sweep": [
+        ([[8, 4, 0], 2], {"operation": "division"}),
+        ([2, [0, 1, 2]], {"operation": "exponentiation"}),
+        ([2, [10, 2000]], {"operation": "exponentiation"}),
+        ([[1, 2]], {"operation": "mean"}),
+        ([[1, 2], 3], {"operation": "dot"}),
+        ([1, 2], {"operation": "addition"}),
+    ],
+}
+
+def outcome(evaluate):
+    try:
+        value = evaluate()
+    except ValueError as e:
+        return ("error", str(e))
+    return ("result", value.tolist() if hasattr(value, "tolist") else value)
+
+def batch_outcome(value):
+    return ("error", str(value)) if isinstance(value, ValueError) else ("result", value)
+
+def test_catalog_and_models_define_the_same_types():
+    import app.models  # noqa: F401 - registers every calculation type
+    from app.models.calculation import operation_registry
+
+    assert operation_registry.names == catalog.catalog.names == set(SAMPLES)
+
+@pytest.mark.parametrize("calculation_type, inputs, attributes", [
+    (name, inputs, attributes) for name, cases in SAMPLES.items() for inputs, attributes in cases
+])
+def test_catalog_matches_the_models(calculation_type, inputs, attributes):
+    from app.models.user import User  # noqa: F401 - configures the Calculation mappers
+    import app.models  # noqa: F401 - registers every calculation type
+    from app.models.calculation import Calculation
+
+    def model():
+        return Calculation.create(calculation_type, None, inputs, **attributes)
+
+    expected = outcome(lambda: catalog.evaluate(calculation_type, inputs, **attributes))
+    assert outcome(model().get_result) == expected
+    assert batch_outcome(Calculation.evaluate_batch([model()])[0]) == expected
+    assert batch_outcome(catalog.evaluate_batch([(calculation_type, inputs, attributes)])[0]) == expected
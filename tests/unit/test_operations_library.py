@@ -0,0 +1,50 @@
+import math
+import random
+
+import pytest
+
+from app.models.calculation import Calculation
+from app.operations import add, divide, multiply, power, subtract
+
+@pytest.mark.parametrize("func, operands, expected", [
+    (add, (1, 2, 3, 4), 10),
+    (subtract, (10, 3, 2), 5),
+    (multiply, (2, 3, 4), 24),
+    (divide, (100, 4, 5), 5.0),
+    (add, (7,), 7),
+    (subtract, (7,), 7),
+    (divide, (7,), 7),
+])
+def test_n_ary_operations(func, operands, expected):
+    assert func(*operands) == expected
+
+def test_divide_checks_every_divisor():
+    with pytest.raises(ValueError, match="Cannot divide by zero!"):
+        divide(1, 2, 0)
+
+def test_power():
+    assert power(2, 10) == 1024
+    assert power(9, 0.5) == 3.0
+    with pytest.raises(ValueError, match="Cannot raise zero to a negative power."):
+        power(0, -1)
+
+@pytest.mark.parametrize("calc_type, func", [
+    ("addition", add),
+    ("subtraction", subtract),
+    ("multiplication", multiply),
+    ("division", divide),
+])
+def test_models_match_library_bit_for_bit(calc_type, func):
+    rng = random.Random(calc_type)
+    for _ in range(50):
+        inputs = [rng.choice([-0.0, 1e-300, rng.uniform(-1e6, 1e6)]) for _ in range(rng.randint(2, 20))]
+        if calc_type == "division":
+            inputs = [inputs[0]] + [x or 3.0 for x in inputs[1:]]
+        result = Calculation.create(calc_type, None, inputs).compute()
+        expected = func(*inputs)
+        assert (result, math.copysign(1, result)) == (expected, math.copysign(1, expected))
+
+def test_array_kernels_are_reexported():
+    from app.operations import add_rows, add_scan
+    assert add_rows([[1, 2], [3, 4, 5]]).tolist() == [3, 12]
+    assert add_scan([1, 2, 3]).tolist() == [1, 3, 6]
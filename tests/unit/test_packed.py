@@ -0,0 +1,71 @@
+import struct
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.packed import decode_base64_floats, encode_base64_floats, pack_floats, unpack_array, unpack_floats
+from app.operations import catalog
+from app.schemas.calculation import CalculationBase
+
+def test_round_trip_is_little_endian_float64():
+    values = [1.0, -2.5, 1e-300, -0.0]
+    packed = pack_floats(values)
+    assert packed == struct.pack("<4d", *values)
+    assert unpack_floats(packed) == values
+    assert unpack_floats(bytearray(packed)) == values
+    assert decode_base64_floats(encode_base64_floats(values)) == values
+
+@pytest.mark.parametrize("data, message", [
+    (b"\x00" * 12, "whole number of 8-byte"),
+    (struct.pack("<2d", 1.0, float("inf")), "finite"),
+    (struct.pack("<d", float("nan")), "finite"),
+])
+def test_invalid_packed_bytes(data, message):
+    with pytest.raises(ValueError, match=message):
+        unpack_floats(data)
+
+def test_invalid_base64():
+    with pytest.raises(ValueError, match="base64 string"):
+        decode_base64_floats("not base64!")
+
+def test_schema_accepts_packed_inputs():
+    assert CalculationBase(type="addition", inputs=encode_base64_floats([1, 2])).inputs == [1.0, 2.0]
+    assert CalculationBase(type="addition", inputs=pack_floats([3, 4])).inputs == [3.0, 4.0]
+    with pytest.raises(ValidationError, match="finite"):
+        CalculationBase(type="addition", inputs=encode_base64_floats([float("nan")]))
+    with pytest.raises(ValidationError, match="At least one number"):
+        CalculationBase(type="addition", inputs="")
+
+def test_packed_inputs_respect_the_type_limit(monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_MAX_OPERANDS", 3)
+    monkeypatch.setattr(settings, "CALCULATION_STATISTICS_MAX_OPERANDS", 5)
+    assert len(CalculationBase(type="mean", inputs=pack_floats(range(5))).inputs) == 5
+    with pytest.raises(ValidationError, match="At most 3"):
+        CalculationBase(type="addition", inputs=pack_floats(range(4)))
+
+def test_unpacked_array_is_a_view():
+    packed = pack_floats([1.5, 2.0, -3.0])
+    values = unpack_array(packed)
+    assert values.dtype == np.float64 and not values.flags.writeable
+    assert values.base is not None and bytes(values.base) == packed
+
+@pytest.mark.parametrize("calculation_type, values", [
+    ("addition", [1.5, 2.0, -3.0]),
+    ("division", [10.0, 4.0]),
+    ("division", [1.0, 0.0]),
+    ("exponentiation", [2.0, 10.0]),
+    ("mean", [2.0, 4.0, 9.0]),
+    ("percentile", [50.0, 1.0, 2.0, 3.0, 4.0]),
+    ("expression", [1.0, 2.0]),
+])
+def test_catalog_evaluates_the_unpacked_array(calculation_type, values):
+    array = unpack_array(pack_floats(values))
+    attributes = {"expression": "a * b"} if calculation_type == "expression" else {}
+
+    def outcome(value):
+        return ("error", str(value)) if isinstance(value, ValueError) else ("result", value)
+
+    expected = outcome(catalog.evaluate_batch([(calculation_type, values, attributes)])[0])
+    assert outcome(catalog.evaluate_batch([(calculation_type, array, attributes)])[0]) == expected
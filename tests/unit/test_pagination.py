@@ -0,0 +1,18 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.core.pagination import encode_cursor, decode_cursor
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678901)
+    row_id = uuid.uuid4()
+    cursor = encode_cursor(created_at, row_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, row_id)
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "e30", "eyJjIjoxfQ"])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(ValueError, match="Invalid pagination cursor."):
+        decode_cursor(cursor)
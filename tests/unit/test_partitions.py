@@ -0,0 +1,59 @@
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.core.config import settings
+from app.core.ids import uuid7
+from app.models.calculation import Calculation
+from app.models.calculation_dependency import CalculationDependency
+from app.partitions import add_months, month_partition_name, month_start, parse_month_partition, partitioned_table
+
+def ddl(table):
+    return str(CreateTable(table).compile(dialect=postgresql.dialect()))
+
+def test_month_arithmetic():
+    assert month_start(date(2026, 10, 18)) == date(2026, 10, 1)
+    assert add_months(date(2026, 10, 18), 3) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 31), -1) == date(2025, 12, 1)
+    assert add_months(date(2026, 12, 1), 0) == date(2026, 12, 1)
+
+def test_month_partition_names_round_trip():
+    assert month_partition_name(date(2026, 3, 1)) == "calculations_y2026m03"
+    assert parse_month_partition("calculations_y2026m03") == date(2026, 3, 1)
+    assert parse_month_partition("calculations_default") is None
+    assert parse_month_partition("calculations_p03") is None
+
+@pytest.mark.parametrize("mode, clause, key", [
+    ("month", "PARTITION BY RANGE (created_at)", "PRIMARY KEY (id, created_at)"),
+    ("hash", "PARTITION BY HASH (user_id)", "PRIMARY KEY (id, user_id)"),
+])
+def test_partitioned_table_ddl(mode, clause, key):
+    table = partitioned_table(mode)
+    statement = ddl(table)
+    assert clause in statement and key in statement
+    assert {index.name for index in table.indexes} == {index.name for index in Calculation.__table__.indexes}
+    # The model's own table is unchanged
+    assert list(Calculation.__table__.primary_key.columns.keys()) == ["id"]
+    assert "PARTITION BY" not in ddl(Calculation.__table__)
+
+def test_unknown_partitioning_mode():
+    with pytest.raises(ValueError, match="Unknown partitioning mode"):
+        partitioned_table("none")
+
+def test_dependency_foreign_keys_only_without_partitioning(monkeypatch):
+    assert ddl(CalculationDependency.__table__).count("REFERENCES calculations") == 2
+    monkeypatch.setattr(settings, "CALCULATION_PARTITIONING", "month")
+    assert "REFERENCES" not in ddl(CalculationDependency.__table__)
+
+def test_id_criteria_bounds_created_at_for_time_ordered_ids(monkeypatch):
+    calc_id = uuid7()
+    assert len(Calculation.id_criteria(calc_id)) == 1
+    monkeypatch.setattr(settings, "CALCULATION_PARTITIONING", "month")
+    criteria = Calculation.id_criteria(calc_id)
+    assert len(criteria) == 2 and "created_at BETWEEN" in str(criteria[1])
+    assert len(Calculation.id_criteria(uuid.uuid4())) == 1
+    monkeypatch.setattr(settings, "CALCULATION_PARTITIONING", "hash")
+    assert len(Calculation.id_criteria(calc_id)) == 1
@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import ResultCache, result_cache
+from app.models.calculation import Calculation
+
+def test_make_key_normalizes_type_and_keeps_signed_zero():
+    assert ResultCache.make_key("Addition", [1, 2]) == ResultCache.make_key("addition", [1.0, 2.0])
+    assert ResultCache.make_key("subtraction", [-0.0, 0.0]) != ResultCache.make_key("subtraction", [0.0, 0.0])
+    assert ResultCache.make_key("addition", "not a list") is None
+    assert ResultCache.make_key("addition", [1, "x"]) is None
+
+def test_lru_eviction():
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)  # "a" is now most recently used
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2}
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = ResultCache(max_entries=10, ttl_seconds=5)
+    cache.put("a", 1)
+    now[0] += 4
+    assert cache.get("a") == (True, 1)
+    now[0] += 2
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["size"] == 0
+
+def test_disabled_cache_stores_nothing():
+    cache = ResultCache(max_entries=0, ttl_seconds=60)
+    cache.put("a", 1)
+    assert cache.get("a") == (False, None)
+    assert cache.stats() == {"hits": 0, "misses": 0, "size": 0}
+
+def test_disabled_cache_is_not_consulted(monkeypatch):
+    monkeypatch.setattr(result_cache, "max_entries", 0)
+    monkeypatch.setattr(result_cache, "get", lambda key: pytest.fail("disabled cache was consulted"))
+    calculations = [Calculation.create("addition", None, [1, 2]), Calculation.create("division", None, [1, 4])]
+    assert Calculation.evaluate_batch(calculations) == [3, 0.25]
+    assert calculations[0].get_result() == 3
+    assert result_cache.stats() == {"hits": 0, "misses": 0, "size": 0}
+
+def test_get_result_is_memoized():
+    first = Calculation.create("multiplication", None, [2.54, 12])
+    second = Calculation.create("Multiplication", None, [2.54, 12])
+    assert first.get_result() == second.get_result()
+    assert result_cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+def test_errors_are_not_cached():
+    calc = Calculation.create("division", None, [1, 0])
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Cannot divide by zero."):
+            calc.get_result()
+    assert result_cache.stats()["size"] == 0
+
+def test_evaluate_batch_uses_cache():
+    Calculation.create("addition", None, [1, 2]).get_result()
+    results = Calculation.evaluate_batch([
+        Calculation.create("addition", None, [1, 2]),
+        Calculation.create("addition", None, [3, 4]),
+    ])
+    assert results == [3, 7]
+    stats = result_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["size"] == 2
+
+def test_concurrent_access():
+    cache = ResultCache(max_entries=50, ttl_seconds=60)
+
+    def worker(offset):
+        for i in range(500):
+            cache.put((offset, i % 80), i)
+            cache.get((offset, (i * 7) % 80))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = cache.stats()
+    assert stats["size"] == 50
+    assert stats["hits"] + stats["misses"] == 8 * 500
@@ -0,0 +1,41 @@
+import math
+import random
+
+import pytest
+
+from app.models.calculation import Calculation
+
+def prefixes(calc_type, inputs):
+    """Running values computed the slow way: one calculation per prefix."""
+    first = Calculation.create(calc_type, None, inputs[:1])
+    return [first.compute()] + [
+        Calculation.create(calc_type, None, inputs[:k]).compute() for k in range(2, len(inputs) + 1)
+    ]
+
+@pytest.mark.parametrize("calc_type", ["addition", "subtraction", "multiplication", "division"])
+def test_scan_matches_every_prefix_bit_for_bit(calc_type):
+    rng = random.Random(calc_type)
+    for _ in range(50):
+        inputs = [rng.choice([-0.0, 0.5, rng.uniform(-10, 10)]) for _ in range(rng.randint(2, 40))]
+        if calc_type == "division":
+            inputs = [inputs[0]] + [x or 3.0 for x in inputs[1:]]
+        running = Calculation.create(calc_type, None, inputs).scan().tolist()
+        expected = prefixes(calc_type, inputs)
+        assert [(v, math.copysign(1, v)) for v in running] == [(v, math.copysign(1, v)) for v in expected]
+
+def test_last_running_value_is_the_result():
+    calc = Calculation.create("division", None, [100, 4, 5])
+    assert calc.scan().tolist() == [100, 25, 5]
+    assert calc.scan()[-1] == calc.get_result()
+    assert Calculation.create("addition", None, [-0.0, -0.0]).scan().tolist() == [0.0, 0.0]
+
+@pytest.mark.parametrize("calc_type, inputs, message", [
+    ("division", [1, 2, 0, 4], "divide by zero"),
+    ("multiplication", [1e200, 1e200, 1e-200], "too large"),
+    ("subtraction", [1], "at least two numbers"),
+    ("exponentiation", [2, 3], "do not support scan"),
+    ("mean", [1, 2], "do not support scan"),
+])
+def test_scan_errors_match_get_result(calc_type, inputs, message):
+    with pytest.raises(ValueError, match=message):
+        Calculation.create(calc_type, None, inputs).scan()
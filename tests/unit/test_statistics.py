@@ -0,0 +1,58 @@
+import statistics
+
+import pytest
+
+from app.core.cache import ResultCache
+from app.core.config import settings
+from app.models.calculation import Calculation
+from app.models.statistics import Mean, Percentile
+from app.schemas.calculation import CalculationBase
+
+DATA = [2, 4, 4, 4, 5, 5, 7, 9]
+
+@pytest.mark.parametrize("calc_type, expected", [
+    ("mean", statistics.mean(DATA)),
+    ("median", statistics.median(DATA)),
+    ("variance", statistics.variance(DATA)),
+    ("stddev", statistics.stdev(DATA)),
+    ("min", 2),
+    ("max", 9),
+])
+def test_statistics_match_the_standard_library(calc_type, expected):
+    assert Calculation.create(calc_type, None, DATA).get_result() == pytest.approx(expected)
+
+def test_percentile_uses_linear_interpolation():
+    assert Calculation.create("percentile", None, [50, 1, 2, 3, 4]).get_result() == 2.5
+    assert Calculation.create("percentile", None, [90] + list(range(1, 11))).get_result() == pytest.approx(9.1)
+    with pytest.raises(ValueError, match="between 0 and 100"):
+        Percentile(user_id=None, inputs=[101, 1, 2]).get_result()
+    with pytest.raises(ValueError, match="at least one value"):
+        Percentile(user_id=None, inputs=[50]).get_result()
+
+def test_operand_counts():
+    assert Mean(user_id=None, inputs=[3]).get_result() == 3
+    with pytest.raises(ValueError, match="at least two numbers"):
+        Calculation.create("variance", None, [1]).get_result()
+    with pytest.raises(ValueError, match="list of numbers"):
+        Mean(user_id=None, inputs=[1, "a"]).get_result()
+
+def test_statistics_have_a_higher_operand_cap(monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_MAX_OPERANDS", 10)
+    monkeypatch.setattr(settings, "CALCULATION_STATISTICS_MAX_OPERANDS", 100)
+    values = list(range(50))
+    assert Calculation.create("mean", None, values).get_result() == 24.5
+    with pytest.raises(ValueError, match="at most 10"):
+        Calculation.create("addition", None, values).get_result()
+    with pytest.raises(ValueError, match="at most 100"):
+        Calculation.create("mean", None, list(range(101))).get_result()
+
+    assert len(CalculationBase(type="median", inputs=values).inputs) == 50
+    with pytest.raises(ValueError):
+        CalculationBase(type="addition", inputs=values)
+
+def test_long_inputs_are_keyed_by_digest():
+    values = [float(i) for i in range(10000)]
+    key = ResultCache.make_key("mean", values)
+    assert len(key[1]) == 16
+    assert key == ResultCache.make_key("mean", list(values))
+    assert key != ResultCache.make_key("mean", values[:-1] + [0.0])
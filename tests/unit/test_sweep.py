@@ -0,0 +1,80 @@
+import pytest
+
+from app.core.cache import result_cache
+from app.core.config import settings
+from app.models.calculation import Calculation
+from app.models.sweep import Sweep
+from app.schemas.calculation import CalculationSweepRequest
+
+def sweep(operation, inputs, expression=None):
+    return Calculation.create("sweep", None, inputs, operation=operation, expression=expression)
+
+@pytest.mark.parametrize("operation, inputs, expression", [
+    ("exponentiation", [2, [0, 1, 2, 10]], None),
+    ("division", [[1, 2, -4], 8, 2], None),
+    ("subtraction", [10, [0.1, 0.2, -0.0]], None),
+    ("addition", [[-0.0, 1.5], -0.0], None),
+    ("expression", [[1, 2, 3], 2], "a ** b / 3"),
+    ("percentile", [[0, 50, 90], 1, 2, 3, 4], None),
+])
+def test_points_match_single_calculations(operation, inputs, expression):
+    position = next(i for i, operand in enumerate(inputs) if isinstance(operand, list))
+    expected = []
+    for value in inputs[position]:
+        point = list(inputs)
+        point[position] = value
+        expected.append(Calculation.create(operation, None, point, expression=expression).get_result())
+    assert sweep(operation, inputs, expression).get_result() == expected
+
+@pytest.mark.parametrize("operation, inputs, message", [
+    (None, [[1, 2], 3], "needs an operation"),
+    ("modulo", [[1, 2], 3], "Unsupported calculation type"),
+    ("dot", [[1, 2], [3, 4]], "cannot be swept"),
+    ("addition", [1, 2], "Exactly one input"),
+    ("addition", [[1], [2]], "Exactly one input"),
+    ("addition", [[], 2], "must not be empty"),
+    ("exponentiation", [2, [1, 2], 3], "exactly two numbers"),
+    ("division", [8, [2, 0, 4]], r"Point 1 \(0\): Cannot divide by zero"),
+    ("exponentiation", [2, [10, 2000]], r"Point 1 \(2000\): Result is too large"),
+])
+def test_sweep_errors(operation, inputs, message):
+    with pytest.raises(ValueError, match=message):
+        sweep(operation, inputs).get_result()
+
+def test_sweep_limits(monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_SWEEP_MAX_POINTS", 10)
+    monkeypatch.setattr(settings, "CALCULATION_ARRAY_MAX_ELEMENTS", 25)
+    assert len(sweep("addition", [1, list(range(10))]).get_result()) == 10
+    with pytest.raises(ValueError, match="Too many points"):
+        sweep("addition", [1, list(range(11))]).get_result()
+    with pytest.raises(ValueError, match="Too many elements"):
+        sweep("addition", [1, 2, list(range(10))]).get_result()
+
+def test_points_do_not_fill_the_result_cache():
+    result_cache.clear()
+    assert sweep("expression", [list(range(100))], "a * 2").get_result()[-1] == 198
+    assert result_cache.stats()["size"] == 0
+
+def test_request_builds_sweep_inputs():
+    request = CalculationSweepRequest(type="Division", inputs=[1, None], range={"start": 1, "stop": 2, "step": 0.25})
+    assert request.type == "division"
+    assert request.sweep_inputs() == [1, [1.0, 1.25, 1.5, 1.75]]
+    assert CalculationSweepRequest(type="addition", inputs=[None, 1], values=[3]).sweep_inputs() == [[3.0], 1]
+
+@pytest.mark.parametrize("payload", [
+    {"type": "addition", "inputs": [1, 2], "values": [1]},
+    {"type": "addition", "inputs": [None, None], "values": [1]},
+    {"type": "addition", "inputs": [None, 1]},
+    {"type": "addition", "inputs": [None, 1], "values": [1], "range": {"start": 0, "stop": 1}},
+    {"type": "addition", "inputs": [None, 1], "range": {"start": 0, "stop": 1, "step": 0}},
+    {"type": "addition", "inputs": [None, 1], "range": {"start": 1, "stop": 0}},
+    {"type": "addition", "inputs": [None, 1], "range": {"start": 0, "stop": 1e9}},
+])
+def test_invalid_requests(payload):
+    with pytest.raises(ValueError):
+        CalculationSweepRequest(**payload)
+
+def test_sweep_is_not_sweepable():
+    assert not Sweep.sweepable
+    with pytest.raises(ValueError, match="cannot be swept"):
+        sweep("sweep", [[1], 2]).get_result()
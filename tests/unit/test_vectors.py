@@ -0,0 +1,60 @@
+import pytest
+
+from app.core.config import settings
+from app.models.calculation import Calculation
+from app.models.vectors import DotProduct, MatrixMultiplication, VectorDivision
+from app.schemas.calculation import CalculationBase
+
+@pytest.mark.parametrize("calc_type, inputs, expected", [
+    ("vector_add", [[1, 2], [3, 4], 10], [14, 16]),
+    ("vector_subtract", [[10, 20], [1, 2]], [9, 18]),
+    ("vector_subtract", [100, [1, 2]], [99, 98]),
+    ("vector_multiply", [[1, 2], [3, 4], 2], [6, 16]),
+    ("vector_divide", [[10, 20], [2, 4]], [5, 5]),
+    ("dot", [[1, 2, 3], [4, 5, 6]], 32),
+    ("matmul", [[[1, 2], [3, 4]], [[5], [6]]], [[17], [39]]),
+    ("matmul", [[[1, 2]], [[3], [4]], [[2, 0]]], [[22, 0]]),
+])
+def test_array_operations(calc_type, inputs, expected):
+    assert Calculation.create(calc_type, None, inputs).get_result() == expected
+
+@pytest.mark.parametrize("calc_type, inputs, message", [
+    ("vector_add", [1, 2], "at least one vector"),
+    ("vector_add", [[1, 2], [1, 2, 3]], "same length"),
+    ("vector_add", [[1, 2], []], "vectors of numbers"),
+    ("vector_add", [[[1]], [1]], "vectors of numbers"),
+    ("vector_divide", [[1, 2], [1, 0]], "divide by zero"),
+    ("vector_multiply", [[1e200], [1e200]], "too large"),
+    ("dot", [[1, 2]], "exactly two vectors"),
+    ("dot", [[1, 2], 3], "must be vectors"),
+    ("matmul", [[[1, 2], [3]], [[1]]], "rectangular"),
+    ("matmul", [[[1, 2]], [[1, 2]]], "not aligned"),
+    ("addition", [[1, 2], 3], "list of numbers"),
+    ("mean", [[1, 2]], "list of numbers"),
+])
+def test_array_errors(calc_type, inputs, message):
+    with pytest.raises(ValueError, match=message):
+        Calculation.create(calc_type, None, inputs).get_result()
+
+def test_element_cap(monkeypatch):
+    monkeypatch.setattr(settings, "CALCULATION_ARRAY_MAX_ELEMENTS", 10)
+    assert DotProduct(user_id=None, inputs=[[1] * 5, [1] * 5]).get_result() == 5
+    with pytest.raises(ValueError, match="Too many elements"):
+        DotProduct(user_id=None, inputs=[[1] * 6, [1] * 5]).get_result()
+    # Small operands, but the product would be 4 x 4
+    with pytest.raises(ValueError, match="result may hold at most 10"):
+        MatrixMultiplication(user_id=None, inputs=[[[1]] * 4, [[1] * 4]]).get_result()
+
+def test_result_columns():
+    calc = VectorDivision(user_id=None, inputs=[[1, 2], 2])
+    calc.set_result(calc.get_result())
+    assert (calc.result, calc.result_array) == (None, [0.5, 1.0])
+    assert calc.value == [0.5, 1.0]
+    calc.set_result(3.0)
+    assert (calc.result, calc.result_array, calc.value) == (3.0, None, 3.0)
+
+def test_schema_accepts_vectors_and_matrices():
+    assert CalculationBase(type="vector_add", inputs=[[1, 2], 3]).inputs == [[1.0, 2.0], 3.0]
+    assert CalculationBase(type="matmul", inputs=[[[1, 2]], [[3], [4]]]).inputs == [[[1.0, 2.0]], [[3.0], [4.0]]]
+    with pytest.raises(ValueError):
+        CalculationBase(type="vector_add", inputs=[[1, "a"]])